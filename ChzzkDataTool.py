@@ -0,0 +1,944 @@
+"""치지직 포인트봇 데이터 도구
+
+데이터 파일을 한 번에 모두 읽지 않고 조금씩 읽어서 처리합니다.
+봇 설정의 저장 방식(json, sqlite, binary)에 맞는 파일에서 유저/인벤토리를 읽습니다.
+    python ChzzkDataTool.py validate <데이터 폴더>
+    python ChzzkDataTool.py export <데이터 폴더> <출력 폴더> --format csv
+    python ChzzkDataTool.py migrate <데이터 폴더> <출력 폴더>
+    python ChzzkDataTool.py merge <폴더 A> <폴더 B> <출력 폴더> --points sum
+"""
+
+import argparse
+import csv
+import json
+import mmap
+import os
+import sqlite3
+import struct
+import sys
+import tempfile
+from datetime import datetime
+from pathlib import Path
+
+USER_DATA_FILE = "chzzk_user_data.json"
+USER_INVENTORY_FILE = "chzzk_user_inventory.json"
+SHOP_ITEMS_FILE = "chzzk_shop_items.json"
+BETTING_HISTORY_FILE = "chzzk_betting_history.json"
+BETTING_HISTORY_DIR = "betting_history"
+POINT_LEDGER_FILE = "chzzk_point_ledger.ndjson"
+SETTINGS_FILE = "chzzk_bot_settings.json"
+SQLITE_FILE = "chzzk_bot_data.db"
+SNAPSHOT_FILE = "chzzk_snapshot.bin"
+
+TIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+DEFAULT_DATA_DIR = os.path.join(Path.home(), ".chzzk_points_bot")
+
+# 1: 배팅 이력이 하나의 JSON 배열, 2: 월별 세그먼트 + 색인, 원장 순번 기록
+SCHEMA_VERSION = 2
+
+
+class JsonStream:
+    """큰 JSON 파일을 일정 크기씩 읽으며 값 단위로 파싱
+
+    객체/배열은 iter_object, iter_array로 한 단계씩 내려가고,
+    각 값은 read_value로 읽습니다. 메모리에는 가장 큰 값 하나 정도만 올라갑니다.
+    """
+
+    WHITESPACE = " \t\n\r"
+
+    def __init__(self, f, chunk_size=1 << 16):
+        self.f = f
+        self.chunk_size = chunk_size
+        self.buffer = ""
+        self.pos = 0
+        self.eof = False
+        self.decoder = json.JSONDecoder()
+
+    def _fill(self, size=None):
+        if self.eof:
+            return False
+
+        # 이미 처리한 앞부분은 버려서 버퍼가 커지지 않도록 함
+        if self.pos:
+            self.buffer = self.buffer[self.pos :]
+            self.pos = 0
+
+        chunk = self.f.read(size or self.chunk_size)
+        if not chunk:
+            self.eof = True
+            return False
+        self.buffer += chunk
+        return True
+
+    def _peek(self):
+        while True:
+            while (
+                self.pos < len(self.buffer) and self.buffer[self.pos] in self.WHITESPACE
+            ):
+                self.pos += 1
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self._fill():
+                return ""
+
+    def _expect(self, char):
+        found = self._peek()
+        if found != char:
+            raise ValueError(f"'{char}'이(가) 필요하지만 '{found}'이(가) 있습니다.")
+        self.pos += 1
+
+    def read_value(self):
+        self._peek()
+        size = self.chunk_size
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buffer, self.pos)
+                # 숫자가 버퍼 끝에서 잘렸을 수 있으므로 더 읽어서 확인
+                if end < len(self.buffer) or self.eof:
+                    self.pos = end
+                    return value
+            except json.JSONDecodeError:
+                if self.eof:
+                    raise
+            self._fill(size)
+            size *= 2
+
+    def iter_array(self):
+        self._expect("[")
+        if self._peek() == "]":
+            self.pos += 1
+            return
+
+        while True:
+            yield
+            separator = self._peek()
+            self.pos += 1
+            if separator == "]":
+                return
+            if separator != ",":
+                raise ValueError(f"배열 구분자가 올바르지 않습니다: '{separator}'")
+
+    def iter_object(self):
+        self._expect("{")
+        if self._peek() == "}":
+            self.pos += 1
+            return
+
+        while True:
+            key = self.read_value()
+            self._expect(":")
+            yield key
+            separator = self._peek()
+            self.pos += 1
+            if separator == "}":
+                return
+            if separator != ",":
+                raise ValueError(f"객체 구분자가 올바르지 않습니다: '{separator}'")
+
+
+class Report:
+    """검증 결과 모음 (오류는 일부만 보관)"""
+
+    def __init__(self, max_errors=20):
+        self.max_errors = max_errors
+        self.counts = {}
+        self.errors = []
+        self.error_count = 0
+
+    def count(self, name, amount=1):
+        self.counts[name] = self.counts.get(name, 0) + amount
+
+    def error(self, message):
+        self.error_count += 1
+        if len(self.errors) < self.max_errors:
+            self.errors.append(message)
+
+    def print(self):
+        for name, value in self.counts.items():
+            print(f"  {name}: {value}")
+        for message in self.errors:
+            print(f"  [오류] {message}")
+        if self.error_count > len(self.errors):
+            print(f"  ... 외 오류 {self.error_count - len(self.errors)}개")
+
+
+def is_int(value):
+    return isinstance(value, int) and not isinstance(value, bool)
+
+
+def is_time(value):
+    try:
+        datetime.strptime(value, TIME_FORMAT)
+        return True
+    except (TypeError, ValueError):
+        return False
+
+
+# 데이터 읽기
+def iter_user_data(path):
+    """유저 데이터 파일에서 (구분, 유저, 값) 순서대로 반환"""
+    with open(path, "r", encoding="utf-8") as f:
+        stream = JsonStream(f)
+        for section in stream.iter_object():
+            if section in ("points", "last_reward"):
+                for user_id in stream.iter_object():
+                    yield section, user_id, stream.read_value()
+            else:
+                yield section, None, stream.read_value()
+
+
+def iter_inventory(path):
+    """인벤토리 파일에서 (유저, 아이템 ID, 아이템 정보) 반환"""
+    with open(path, "r", encoding="utf-8") as f:
+        stream = JsonStream(f)
+        for user_id in stream.iter_object():
+            for item_id in stream.iter_object():
+                yield user_id, item_id, stream.read_value()
+
+
+def iter_json_object(path):
+    with open(path, "r", encoding="utf-8") as f:
+        stream = JsonStream(f)
+        for key in stream.iter_object():
+            yield key, stream.read_value()
+
+
+def iter_ndjson(path):
+    """한 줄에 하나씩 기록된 JSON 읽기 (잘린 줄은 건너뜀)"""
+    with open(path, "r", encoding="utf-8") as f:
+        for line_number, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            try:
+                yield line_number, json.loads(line)
+            except ValueError:
+                yield line_number, None
+
+
+def detect_backend(data_dir):
+    """봇 설정의 저장 방식 (해당 파일이 아직 없으면 봇처럼 JSON 파일을 읽음)"""
+    backend = "json"
+    settings_path = os.path.join(data_dir, SETTINGS_FILE)
+    if os.path.exists(settings_path):
+        with open(settings_path, "r", encoding="utf-8") as f:
+            backend = json.load(f).get("storage_backend", "json")
+
+    if backend == "sqlite" and os.path.exists(os.path.join(data_dir, SQLITE_FILE)):
+        return "sqlite"
+    if backend == "binary" and os.path.exists(os.path.join(data_dir, SNAPSHOT_FILE)):
+        return "binary"
+    return "json"
+
+
+def iter_sqlite(data_dir, query):
+    """봇의 SQLite 저장소를 읽기 전용으로 열어 행을 하나씩 반환"""
+    uri = Path(data_dir, SQLITE_FILE).absolute().as_uri() + "?mode=ro"
+    conn = sqlite3.connect(uri, uri=True)
+    try:
+        yield from conn.execute(query)
+    finally:
+        conn.close()
+
+
+class SnapshotReader:
+    """봇의 바이너리 스냅샷 읽기 (형식은 봇의 BinarySnapshot과 같음)"""
+
+    MAGIC = b"CZPS"
+    VERSION = 1
+    HEADER = struct.Struct("<4sHHqIIII")
+    NO_TIME = -(2**63)
+
+    def __init__(self, path):
+        self.f = open(path, "rb")
+        self.buffer = mmap.mmap(self.f.fileno(), 0, access=mmap.ACCESS_READ)
+        (
+            magic,
+            version,
+            _,
+            self.ledger_seq,
+            self.user_count,
+            name_count,
+            self.inventory_count,
+            names_size,
+        ) = self.HEADER.unpack_from(self.buffer, 0)
+        if magic != self.MAGIC or version != self.VERSION:
+            self.close()
+            raise ValueError(f"지원하지 않는 스냅샷 형식입니다: {path}")
+
+        offset = self.HEADER.size
+        self.names = (
+            self.buffer[offset : offset + names_size].decode("utf-8").split("\0")
+            if name_count
+            else []
+        )
+        self.points_offset = (offset + names_size + 7) & ~7
+        self.rewards_offset = self.points_offset + self.user_count * 8
+        self.inventory_offset = self.rewards_offset + self.user_count * 8
+
+    def close(self):
+        self.buffer.close()
+        self.f.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _values(self, offset, count):
+        for (value,) in struct.iter_unpack(
+            "<q", self.buffer[offset : offset + count * 8]
+        ):
+            yield value
+
+    def iter_users(self):
+        """(구분, 유저, 값) 순서대로 반환 (iter_user_data와 같은 형식)"""
+        user_ids = self.names[: self.user_count]
+        for user_id, points in zip(
+            user_ids, self._values(self.points_offset, self.user_count)
+        ):
+            yield "points", user_id, points
+        for user_id, reward in zip(
+            user_ids, self._values(self.rewards_offset, self.user_count)
+        ):
+            if reward != self.NO_TIME:
+                yield "last_reward", user_id, datetime.fromtimestamp(reward).strftime(
+                    TIME_FORMAT
+                )
+        yield "ledger_seq", None, self.ledger_seq
+
+    def iter_inventory(self):
+        values = self._values(self.inventory_offset, self.inventory_count * 4)
+        names = self.names
+        # 같은 반복자를 네 번 넘겨 (유저, 아이템, 수량, 구매 일시)씩 묶음
+        for user_idx, item_idx, quantity, date_idx in zip(
+            values, values, values, values
+        ):
+            yield names[user_idx], names[item_idx], {
+                "quantity": quantity,
+                "purchase_date": names[date_idx] if date_idx >= 0 else None,
+            }
+
+
+def iter_user_records(data_dir, backend=None):
+    """저장 방식에 맞는 유저 데이터를 (구분, 유저, 값) 순서대로 반환"""
+    backend = backend or detect_backend(data_dir)
+    if backend == "sqlite":
+        rows = iter_sqlite(data_dir, "SELECT user_id, points FROM users")
+        for user_id, points in rows:
+            yield "points", user_id, points
+        rows = iter_sqlite(
+            data_dir,
+            "SELECT user_id, last_reward FROM users WHERE last_reward IS NOT NULL",
+        )
+        for user_id, last_reward in rows:
+            yield "last_reward", user_id, last_reward
+        for (value,) in iter_sqlite(
+            data_dir, "SELECT value FROM meta WHERE key = 'ledger_seq'"
+        ):
+            yield "ledger_seq", None, int(value)
+    elif backend == "binary":
+        with SnapshotReader(os.path.join(data_dir, SNAPSHOT_FILE)) as snapshot:
+            yield from snapshot.iter_users()
+    else:
+        path = os.path.join(data_dir, USER_DATA_FILE)
+        if os.path.exists(path):
+            yield from iter_user_data(path)
+
+
+def iter_inventory_records(data_dir, backend=None):
+    """저장 방식에 맞는 인벤토리를 (유저, 아이템 ID, 아이템 정보)로 반환"""
+    backend = backend or detect_backend(data_dir)
+    if backend == "sqlite":
+        for user_id, item_id, quantity, purchase_date in iter_sqlite(
+            data_dir, "SELECT user_id, item_id, quantity, purchase_date FROM inventory"
+        ):
+            yield user_id, item_id, {
+                "quantity": quantity,
+                "purchase_date": purchase_date,
+            }
+    elif backend == "binary":
+        with SnapshotReader(os.path.join(data_dir, SNAPSHOT_FILE)) as snapshot:
+            yield from snapshot.iter_inventory()
+    else:
+        path = os.path.join(data_dir, USER_INVENTORY_FILE)
+        if os.path.exists(path):
+            yield from iter_inventory(path)
+
+
+def iter_shop_items(data_dir, backend=None):
+    """상점 아이템을 (아이템 ID, 아이템 정보)로 반환 (SQLite 외에는 JSON 파일)"""
+    backend = backend or detect_backend(data_dir)
+    if backend == "sqlite":
+        for item_id, name, price, description in iter_sqlite(
+            data_dir,
+            "SELECT item_id, name, price, description FROM shop_items ORDER BY rowid",
+        ):
+            yield item_id, {"name": name, "price": price, "description": description}
+        return
+
+    path = os.path.join(data_dir, SHOP_ITEMS_FILE)
+    if os.path.exists(path):
+        yield from iter_json_object(path)
+
+
+def iter_betting_rounds(data_dir, backend=None):
+    """배팅 이력을 한 건씩 반환 (SQLite 저장소, 세그먼트 보관소, 기존 JSON 배열 순)"""
+    backend = backend or detect_backend(data_dir)
+    if backend == "sqlite":
+        for (data,) in iter_sqlite(
+            data_dir, "SELECT data FROM betting_history ORDER BY id"
+        ):
+            yield json.loads(data)
+        return
+
+    index_path = os.path.join(data_dir, BETTING_HISTORY_DIR, "index.ndjson")
+    if os.path.exists(index_path):
+        for _, summary in iter_ndjson(index_path):
+            if summary is None:
+                continue
+            segment = os.path.join(data_dir, BETTING_HISTORY_DIR, summary["segment"])
+            with open(segment, "rb") as f:
+                f.seek(summary["offset"])
+                yield json.loads(f.read(summary["length"]).decode("utf-8"))
+        return
+
+    path = os.path.join(data_dir, BETTING_HISTORY_FILE)
+    if os.path.exists(path):
+        with open(path, "r", encoding="utf-8") as f:
+            stream = JsonStream(f)
+            for _ in stream.iter_array():
+                yield stream.read_value()
+
+
+def detect_schema_version(data_dir):
+    if detect_backend(data_dir) == "sqlite":
+        return SCHEMA_VERSION
+    if os.path.exists(os.path.join(data_dir, BETTING_HISTORY_DIR, "index.ndjson")):
+        return 2
+    if os.path.exists(os.path.join(data_dir, BETTING_HISTORY_FILE)):
+        return 1
+    return SCHEMA_VERSION
+
+
+class Scratch:
+    """유저/인벤토리를 메모리 대신 임시 SQLite 파일에 모아 두는 작업 공간"""
+
+    def __init__(self):
+        fd, self.path = tempfile.mkstemp(suffix=".db", prefix="chzzk_data_tool_")
+        os.close(fd)
+        self.conn = sqlite3.connect(self.path)
+        self.conn.executescript("""
+            PRAGMA journal_mode=OFF;
+            PRAGMA synchronous=OFF;
+            CREATE TABLE users (
+                user_id TEXT PRIMARY KEY,
+                points INTEGER NOT NULL DEFAULT 0,
+                last_reward TEXT
+            );
+            CREATE TABLE inventory (
+                user_id TEXT NOT NULL,
+                item_id TEXT NOT NULL,
+                quantity INTEGER NOT NULL,
+                purchase_date TEXT,
+                PRIMARY KEY (user_id, item_id)
+            );
+            """)
+        self.ledger_seq = 0
+
+    def close(self):
+        self.conn.close()
+        os.remove(self.path)
+
+    def load(self, data_dir):
+        """데이터 폴더의 유저/인벤토리를 읽고 스냅샷 이후 원장 기록까지 적용"""
+        backend = detect_backend(data_dir)
+        snapshot_seq = 0
+        for section, user_id, value in iter_user_records(data_dir, backend):
+            if section == "points":
+                self.conn.execute(
+                    "INSERT INTO users (user_id, points) VALUES (?, ?) "
+                    "ON CONFLICT(user_id) DO UPDATE SET points = excluded.points",
+                    (user_id, value),
+                )
+            elif section == "last_reward":
+                self.conn.execute(
+                    "INSERT INTO users (user_id, last_reward) VALUES (?, ?) "
+                    "ON CONFLICT(user_id) DO UPDATE "
+                    "SET last_reward = excluded.last_reward",
+                    (user_id, value),
+                )
+            elif section == "ledger_seq":
+                snapshot_seq = value
+
+        self.ledger_seq = snapshot_seq
+        ledger_path = os.path.join(data_dir, POINT_LEDGER_FILE)
+        if os.path.exists(ledger_path):
+            for _, record in iter_ndjson(ledger_path):
+                if not record or record.get("seq", 0) <= snapshot_seq:
+                    continue
+                self.apply_ledger_record(record)
+                self.ledger_seq = max(self.ledger_seq, record["seq"])
+
+        self.conn.executemany(
+            "INSERT OR REPLACE INTO inventory "
+            "(user_id, item_id, quantity, purchase_date) VALUES (?, ?, ?, ?)",
+            (
+                (
+                    user_id,
+                    item_id,
+                    item.get("quantity", 0),
+                    item.get("purchase_date"),
+                )
+                for user_id, item_id, item in iter_inventory_records(data_dir, backend)
+            ),
+        )
+        self.conn.commit()
+
+    def apply_ledger_record(self, record):
+        reason = record.get("reason")
+        if reason == "reset":
+            self.conn.execute("DELETE FROM users")
+        elif reason == "delete_user":
+            self.conn.execute("DELETE FROM users WHERE user_id = ?", (record["user"],))
+        else:
+            self.conn.execute(
+                "INSERT INTO users (user_id, points) VALUES (?, ?) "
+                "ON CONFLICT(user_id) DO UPDATE SET points = points + excluded.points",
+                (record["user"], record["delta"]),
+            )
+
+    def merge_from(self, other, points_mode):
+        """다른 작업 공간의 유저/인벤토리를 합침"""
+        if points_mode == "max":
+            points_sql = "MAX(points, excluded.points)"
+        else:
+            points_sql = "points + excluded.points"
+
+        self.conn.executemany(
+            "INSERT INTO users (user_id, points, last_reward) VALUES (?, ?, ?) "
+            f"ON CONFLICT(user_id) DO UPDATE SET points = {points_sql}, "
+            "last_reward = MAX(COALESCE(last_reward, ''), "
+            "COALESCE(excluded.last_reward, ''))",
+            other.conn.execute("SELECT user_id, points, last_reward FROM users"),
+        )
+        self.conn.executemany(
+            "INSERT INTO inventory (user_id, item_id, quantity, purchase_date) "
+            "VALUES (?, ?, ?, ?) "
+            "ON CONFLICT(user_id, item_id) DO UPDATE SET "
+            "quantity = quantity + excluded.quantity, "
+            "purchase_date = MIN(COALESCE(purchase_date, excluded.purchase_date), "
+            "COALESCE(excluded.purchase_date, purchase_date))",
+            other.conn.execute(
+                "SELECT user_id, item_id, quantity, purchase_date FROM inventory"
+            ),
+        )
+        self.conn.commit()
+
+    def users(self):
+        return self.conn.execute(
+            "SELECT user_id, points, last_reward FROM users ORDER BY user_id"
+        )
+
+    def inventory(self):
+        return self.conn.execute(
+            "SELECT user_id, item_id, quantity, purchase_date FROM inventory "
+            "ORDER BY user_id, item_id"
+        )
+
+
+# 데이터 쓰기
+def dump(value):
+    return json.dumps(value, ensure_ascii=False)
+
+
+def write_json_atomic(path, write_func):
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        write_func(f)
+    os.replace(tmp_path, path)
+
+
+def write_user_data(path, scratch):
+    def write(f):
+        f.write('{\n    "points": {')
+        first = True
+        for user_id, points, _ in scratch.users():
+            f.write(("\n" if first else ",\n") + f"        {dump(user_id)}: {points}")
+            first = False
+        f.write('\n    },\n    "last_reward": {')
+        first = True
+        for user_id, _, last_reward in scratch.users():
+            if not last_reward:
+                continue
+            f.write(
+                ("\n" if first else ",\n")
+                + f"        {dump(user_id)}: {dump(last_reward)}"
+            )
+            first = False
+        f.write(f'\n    }},\n    "ledger_seq": {scratch.ledger_seq}\n}}\n')
+
+    write_json_atomic(path, write)
+
+
+def write_inventory(path, scratch):
+    def write(f):
+        f.write("{")
+        current_user = None
+        for user_id, item_id, quantity, purchase_date in scratch.inventory():
+            if user_id != current_user:
+                if current_user is not None:
+                    f.write("\n    },")
+                f.write(f"\n    {dump(user_id)}: {{")
+                current_user = user_id
+                first = True
+            item = {"quantity": quantity, "purchase_date": purchase_date}
+            f.write(
+                ("\n" if first else ",\n") + f"        {dump(item_id)}: {dump(item)}"
+            )
+            first = False
+        if current_user is not None:
+            f.write("\n    }")
+        f.write("\n}\n")
+
+    write_json_atomic(path, write)
+
+
+def summarize_betting_round(round_id, entry):
+    """봇의 배팅 이력 색인과 같은 요약 정보"""
+    return {
+        "id": round_id,
+        "topic": entry.get("topic", ""),
+        "options": entry.get("options", []),
+        "start_time": entry.get("start_time"),
+        "end_time": entry.get("end_time"),
+        "winning_option": entry.get("winning_option"),
+        "winning_option_idx": entry.get("winning_option_idx"),
+        "total_points": entry.get("total_points", 0),
+        "odds": entry.get("odds", 1.0),
+        "winner_count": len(entry.get("winners", [])),
+        "bet_count": len(entry.get("user_bets", {})),
+    }
+
+
+def write_betting_archive(directory, rounds):
+    """배팅 이력을 월별 세그먼트와 색인으로 기록 (기록한 개수 반환)"""
+    os.makedirs(directory, exist_ok=True)
+    count = 0
+    segments = {}
+    try:
+        with open(
+            os.path.join(directory, "index.ndjson"), "w", encoding="utf-8"
+        ) as index:
+            for entry in rounds:
+                count += 1
+                end_time = entry.get("end_time") or datetime.now().strftime(TIME_FORMAT)
+                segment = f"{end_time[:7]}.ndjson"
+                if segment not in segments:
+                    segments[segment] = open(os.path.join(directory, segment), "ab")
+                f = segments[segment]
+
+                data = (dump(entry) + "\n").encode("utf-8")
+                offset = f.tell()
+                f.write(data)
+
+                summary = summarize_betting_round(count, entry)
+                summary.update(segment=segment, offset=offset, length=len(data))
+                index.write(dump(summary) + "\n")
+    finally:
+        for f in segments.values():
+            f.close()
+    return count
+
+
+def write_data_dir(out_dir, scratch, shop_items, rounds):
+    os.makedirs(out_dir, exist_ok=True)
+    if os.path.exists(os.path.join(out_dir, BETTING_HISTORY_DIR, "index.ndjson")):
+        raise ValueError(f"출력 폴더에 이미 배팅 이력이 있습니다: {out_dir}")
+
+    write_user_data(os.path.join(out_dir, USER_DATA_FILE), scratch)
+    write_inventory(os.path.join(out_dir, USER_INVENTORY_FILE), scratch)
+    write_json_atomic(
+        os.path.join(out_dir, SHOP_ITEMS_FILE),
+        lambda f: json.dump(shop_items, f, ensure_ascii=False, indent=4),
+    )
+    return write_betting_archive(os.path.join(out_dir, BETTING_HISTORY_DIR), rounds)
+
+
+def load_shop_items(data_dir):
+    return dict(iter_shop_items(data_dir))
+
+
+# 명령어
+def validate(data_dir):
+    """데이터 파일 형식 검증 (오류가 없으면 True)"""
+    report = Report()
+    backend = detect_backend(data_dir)
+    print(
+        f"데이터 폴더: {data_dir} "
+        f"(저장 방식 {backend}, 스키마 버전 {detect_schema_version(data_dir)})"
+    )
+
+    for section, user_id, value in iter_user_records(data_dir, backend):
+        if section == "points":
+            report.count("유저 포인트")
+            if not is_int(value):
+                report.error(f"{user_id}: 포인트가 정수가 아닙니다 ({value!r})")
+        elif section == "last_reward":
+            report.count("마지막 보상 시간")
+            if not is_time(value):
+                report.error(f"{user_id}: 보상 시간 형식 오류 ({value!r})")
+        elif section == "ledger_seq" and not is_int(value):
+            report.error(f"ledger_seq가 정수가 아닙니다 ({value!r})")
+
+    ledger_path = os.path.join(data_dir, POINT_LEDGER_FILE)
+    if os.path.exists(ledger_path):
+        last_seq = 0
+        for line_number, record in iter_ndjson(ledger_path):
+            report.count("포인트 원장 기록")
+            if record is None:
+                report.error(f"원장 {line_number}번째 줄을 읽을 수 없습니다.")
+                continue
+            if not is_int(record.get("seq")) or record["seq"] <= last_seq:
+                report.error(f"원장 {line_number}번째 줄: 순번이 올바르지 않습니다.")
+            elif not is_int(record.get("delta")):
+                report.error(f"원장 {line_number}번째 줄: 변동량이 정수가 아닙니다.")
+            last_seq = max(last_seq, record.get("seq") or 0)
+
+    for user_id, item_id, item in iter_inventory_records(data_dir, backend):
+        report.count("인벤토리 아이템")
+        if not isinstance(item, dict) or not is_int(item.get("quantity")):
+            report.error(f"{user_id}/{item_id}: 수량이 올바르지 않습니다.")
+        elif item["quantity"] < 1:
+            report.error(f"{user_id}/{item_id}: 수량이 1보다 작습니다.")
+
+    for item_id, item in iter_shop_items(data_dir, backend):
+        report.count("상점 아이템")
+        if not isinstance(item, dict) or not isinstance(item.get("name"), str):
+            report.error(f"상점 {item_id}: 이름이 없습니다.")
+        elif not is_int(item.get("price")) or item["price"] < 0:
+            report.error(f"상점 {item_id}: 가격이 올바르지 않습니다.")
+
+    for index, entry in enumerate(iter_betting_rounds(data_dir, backend), 1):
+        report.count("배팅 이력")
+        options = entry.get("options", [])
+        for user_id, bet in entry.get("user_bets", {}).items():
+            report.count("배팅 기록")
+            if not is_int(bet.get("amount")) or bet["amount"] < 0:
+                report.error(f"배팅 {index} {user_id}: 배팅 금액이 올바르지 않습니다.")
+            if not is_int(bet.get("option")) or not 0 <= bet["option"] < len(options):
+                report.error(f"배팅 {index} {user_id}: 선택지가 올바르지 않습니다.")
+
+    report.print()
+    if report.error_count:
+        print(f"검증 실패: 오류 {report.error_count}개")
+        return False
+    print("검증 완료: 오류 없음")
+    return True
+
+
+def export(data_dir, out_dir, fmt):
+    """유저/인벤토리/상점/배팅 이력을 CSV 또는 NDJSON으로 내보내기"""
+    os.makedirs(out_dir, exist_ok=True)
+    scratch = Scratch()
+    try:
+        scratch.load(data_dir)
+
+        tables = [
+            ("users", ("user_id", "points", "last_reward"), scratch.users()),
+            (
+                "inventory",
+                ("user_id", "item_id", "quantity", "purchase_date"),
+                scratch.inventory(),
+            ),
+            (
+                "shop_items",
+                ("item_id", "name", "price", "description"),
+                (
+                    (
+                        item_id,
+                        item.get("name"),
+                        item.get("price"),
+                        item.get("description", ""),
+                    )
+                    for item_id, item in load_shop_items(data_dir).items()
+                ),
+            ),
+        ]
+        for name, columns, rows in tables:
+            count = write_rows(os.path.join(out_dir, name), fmt, columns, rows)
+            print(f"{name}: {count}개")
+
+        if fmt == "ndjson":
+            # 배팅 이력은 원본 구조 그대로 한 줄씩 기록
+            count = 0
+            with open(
+                os.path.join(out_dir, "betting_rounds.ndjson"), "w", encoding="utf-8"
+            ) as f:
+                for entry in iter_betting_rounds(data_dir):
+                    f.write(dump(entry) + "\n")
+                    count += 1
+        else:
+            count = export_betting_csv(data_dir, out_dir)
+        print(f"betting_rounds: {count}개")
+    finally:
+        scratch.close()
+
+
+def write_rows(path, fmt, columns, rows):
+    count = 0
+    with open(f"{path}.{fmt}", "w", encoding="utf-8", newline="") as f:
+        if fmt == "csv":
+            writer = csv.writer(f)
+            writer.writerow(columns)
+            for row in rows:
+                writer.writerow(row)
+                count += 1
+        else:
+            for row in rows:
+                f.write(dump(dict(zip(columns, row))) + "\n")
+                count += 1
+    return count
+
+
+def export_betting_csv(data_dir, out_dir):
+    round_columns = (
+        "round",
+        "topic",
+        "start_time",
+        "end_time",
+        "winning_option",
+        "total_points",
+        "odds",
+        "bet_count",
+        "winner_count",
+    )
+    bet_columns = ("round", "user_id", "option", "amount", "win_amount")
+    count = 0
+    with open(
+        os.path.join(out_dir, "betting_rounds.csv"), "w", encoding="utf-8", newline=""
+    ) as rounds_file, open(
+        os.path.join(out_dir, "betting_bets.csv"), "w", encoding="utf-8", newline=""
+    ) as bets_file:
+        rounds_writer = csv.writer(rounds_file)
+        bets_writer = csv.writer(bets_file)
+        rounds_writer.writerow(round_columns)
+        bets_writer.writerow(bet_columns)
+
+        for entry in iter_betting_rounds(data_dir):
+            count += 1
+            summary = summarize_betting_round(count, entry)
+            rounds_writer.writerow(
+                [summary[column] for column in ("id",) + round_columns[1:]]
+            )
+
+            options = entry.get("options", [])
+            win_amounts = {
+                winner["user_id"]: winner["win_amount"]
+                for winner in entry.get("winners", [])
+            }
+            for user_id, bet in entry.get("user_bets", {}).items():
+                option_idx = bet.get("option", -1)
+                bets_writer.writerow(
+                    [
+                        count,
+                        user_id,
+                        options[option_idx] if 0 <= option_idx < len(options) else "",
+                        bet.get("amount", 0),
+                        win_amounts.get(user_id, 0),
+                    ]
+                )
+    return count
+
+
+def migrate(data_dir, out_dir):
+    """최신 스키마로 변환해 새 데이터 폴더에 기록"""
+    if os.path.abspath(data_dir) == os.path.abspath(out_dir):
+        raise ValueError("출력 폴더는 원본 데이터 폴더와 달라야 합니다.")
+
+    print(f"스키마 버전 {detect_schema_version(data_dir)} -> {SCHEMA_VERSION}")
+    scratch = Scratch()
+    try:
+        scratch.load(data_dir)
+        count = write_data_dir(
+            out_dir, scratch, load_shop_items(data_dir), iter_betting_rounds(data_dir)
+        )
+        print(f"변환 완료: {out_dir} (배팅 이력 {count}개)")
+    finally:
+        scratch.close()
+
+
+def merge(dir_a, dir_b, out_dir, points_mode):
+    """두 데이터 폴더 합치기 (상점 아이템은 A 우선, 배팅 이력은 A 다음 B 순서)"""
+    for data_dir in (dir_a, dir_b):
+        if os.path.abspath(data_dir) == os.path.abspath(out_dir):
+            raise ValueError("출력 폴더는 원본 데이터 폴더와 달라야 합니다.")
+
+    scratch = Scratch()
+    other = Scratch()
+    try:
+        scratch.load(dir_a)
+        other.load(dir_b)
+        scratch.merge_from(other, points_mode)
+        # 합친 스냅샷에는 원장 기록이 모두 반영되어 있으므로 순번을 새로 시작
+        scratch.ledger_seq = 0
+
+        shop_items = load_shop_items(dir_b)
+        shop_items.update(load_shop_items(dir_a))
+
+        def rounds():
+            yield from iter_betting_rounds(dir_a)
+            yield from iter_betting_rounds(dir_b)
+
+        count = write_data_dir(out_dir, scratch, shop_items, rounds())
+        print(f"합치기 완료: {out_dir} (배팅 이력 {count}개)")
+    finally:
+        scratch.close()
+        other.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="치지직 포인트봇 데이터 도구")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    validate_parser = commands.add_parser("validate", help="데이터 파일 검증")
+    validate_parser.add_argument("data_dir", nargs="?", default=DEFAULT_DATA_DIR)
+
+    export_parser = commands.add_parser("export", help="CSV/NDJSON으로 내보내기")
+    export_parser.add_argument("data_dir")
+    export_parser.add_argument("out_dir")
+    export_parser.add_argument("--format", choices=["csv", "ndjson"], default="csv")
+
+    migrate_parser = commands.add_parser("migrate", help="최신 스키마로 변환")
+    migrate_parser.add_argument("data_dir")
+    migrate_parser.add_argument("out_dir")
+
+    merge_parser = commands.add_parser("merge", help="두 데이터 폴더 합치기")
+    merge_parser.add_argument("dir_a")
+    merge_parser.add_argument("dir_b")
+    merge_parser.add_argument("out_dir")
+    merge_parser.add_argument(
+        "--points",
+        choices=["sum", "max"],
+        default="sum",
+        help="같은 유저의 포인트 처리 방식 (기본값: 합산)",
+    )
+
+    args = parser.parse_args(argv)
+    try:
+        if args.command == "validate":
+            return 0 if validate(args.data_dir) else 1
+        if args.command == "export":
+            export(args.data_dir, args.out_dir, args.format)
+        elif args.command == "migrate":
+            migrate(args.data_dir, args.out_dir)
+        elif args.command == "merge":
+            merge(args.dir_a, args.dir_b, args.out_dir, args.points)
+        return 0
+    except Exception as e:
+        print(f"오류: {str(e)}", file=sys.stderr)
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,4 +1,5 @@
 import sys
+import abc
 import json
 import random
 import time
@@ -8,6 +9,19 @@ import requests
 import tkinter as tk
 import os
 import tempfile
+import shutil
+import sqlite3
+import queue
+import collections
+import collections.abc
+import contextlib
+import hashlib
+import string
+import unicodedata
+from concurrent.futures import ThreadPoolExecutor
+import mmap
+import struct
+from array import array
 from pathlib import Path
 from tkinter import ttk, scrolledtext, messagebox, simpledialog
 from datetime import datetime, timedelta
@@ -20,6 +34,2748 @@ from flask import (
     Response,
 )
 import webbrowser
+import heapq
+
+try:
+    import numpy
+except ImportError:  # 없으면 array 모듈로 정산
+    numpy = None
+
+# 치지직 채팅 메시지 최대 길이 및 페이지당 메시지 수
+CHAT_MESSAGE_MAX_LENGTH = 100
+CHAT_PAGE_MESSAGES = 3
+
+# 채팅 전송 우선순위 (숫자가 작을수록 먼저 전송)
+CHAT_PRIORITY_DEADLINE = 0  # 배팅 마감 안내
+CHAT_PRIORITY_TRANSACTION = 1  # 배팅/구매 등 처리 결과
+CHAT_PRIORITY_INFO = 2  # 일반 안내
+CHAT_PRIORITY_COSMETIC = 3  # 포인트 획득 등 생략 가능한 메시지
+CHAT_PRIORITY_NAMES = ("마감", "처리", "안내", "일반")
+
+# 배팅 정산 후 로그에 남길 상위 당첨자 수
+SETTLEMENT_TOP_WINNERS = 10
+# 배팅 정산 결과를 나눠 저장할 유저 수 (SQLite 저장 시)
+SETTLEMENT_CHUNK_SIZE = 2000
+# 배팅 마감 전 채팅으로 알릴 남은 시간 (초)
+BETTING_COUNTDOWN_SECONDS = (60, 30, 10)
+
+
+def group_chat_lines(lines, max_length=CHAT_MESSAGE_MAX_LENGTH, separator=" | "):
+    """길이 제한 안에서 한 메시지로 보낼 줄 묶음 목록 반환"""
+    groups = []
+    current = []
+    length = 0
+
+    for line in lines:
+        # 한 줄이 제한보다 길면 잘라서 처리
+        chunks = [
+            line[i : i + max_length] for i in range(0, len(line), max_length)
+        ] or [""]
+        for chunk in chunks:
+            added = len(chunk) + (len(separator) if current else 0)
+            if current and length + added > max_length:
+                groups.append(current)
+                current = []
+                length = 0
+                added = len(chunk)
+            current.append(chunk)
+            length += added
+
+    if current:
+        groups.append(current)
+    return groups
+
+
+def pack_chat_lines(lines, max_length=CHAT_MESSAGE_MAX_LENGTH, separator=" | "):
+    """여러 줄을 길이 제한 안에서 최소 개수의 메시지로 묶음"""
+    return [
+        separator.join(group)
+        for group in group_chat_lines(lines, max_length, separator)
+    ]
+
+
+def paginate_chat_lines(
+    lines,
+    page,
+    per_page=CHAT_PAGE_MESSAGES,
+    max_length=CHAT_MESSAGE_MAX_LENGTH,
+    separator=" | ",
+):
+    """묶은 메시지 per_page개 단위로 페이지 분할 후 (줄 목록, 페이지, 전체 페이지) 반환"""
+    groups = group_chat_lines(lines, max_length, separator)
+    total_pages = max(1, (len(groups) + per_page - 1) // per_page)
+    page = min(max(1, page), total_pages)
+
+    page_lines = []
+    for group in groups[(page - 1) * per_page : page * per_page]:
+        page_lines.extend(group)
+    return page_lines, page, total_pages
+
+
+class PointDigest:
+    """포인트 획득 내역을 모아 주기적으로 요약 메시지 생성"""
+
+    def __init__(self, max_names=5):
+        self.max_names = max_names
+        self.awards = []
+        self.lock = threading.Lock()
+
+    def add(self, username, points, jackpot=False):
+        with self.lock:
+            self.awards.append((username, points, jackpot))
+
+    def pending(self):
+        return len(self.awards)
+
+    def flush(self, window_seconds):
+        """모인 내역으로 요약 메시지를 만들고 비움 (내역이 없으면 None)"""
+        with self.lock:
+            awards = self.awards
+            self.awards = []
+
+        if not awards:
+            return None
+
+        users = {username for username, _, _ in awards}
+        jackpot_users = []
+        for username, _, jackpot in awards:
+            if jackpot and username not in jackpot_users:
+                jackpot_users.append(username)
+
+        if window_seconds % 60 == 0:
+            window_text = f"{window_seconds // 60}분"
+        else:
+            window_text = f"{window_seconds}초"
+
+        message = f"✨ 이번 {window_text}간 {len(users)}명 포인트 획득"
+        if jackpot_users:
+            names = ", ".join(jackpot_users[: self.max_names])
+            if len(jackpot_users) > self.max_names:
+                names += f" 외 {len(jackpot_users) - self.max_names}명"
+            message += f", 잭팟 {len(jackpot_users)}명: {names}"
+        return message
+
+
+def summarize_betting_round(round_id, entry):
+    """배팅 이력 목록에 필요한 요약 정보만 추출"""
+    return {
+        "id": round_id,
+        "topic": entry.get("topic", ""),
+        "options": entry.get("options", []),
+        "start_time": entry.get("start_time"),
+        "end_time": entry.get("end_time"),
+        "winning_option": entry.get("winning_option"),
+        "winning_option_idx": entry.get("winning_option_idx"),
+        "total_points": entry.get("total_points", 0),
+        "odds": entry.get("odds", 1.0),
+        "winner_count": len(entry.get("winners", [])),
+        "bet_count": len(entry.get("user_bets", {})),
+    }
+
+
+class BettingHistoryArchive:
+    """배팅 이력 보관소 (월별 세그먼트 파일 + 요약 색인)"""
+
+    def __init__(self, directory):
+        self.directory = directory
+        self.index_path = os.path.join(directory, "index.ndjson")
+        self.lock = threading.Lock()
+        self.summaries = []
+        os.makedirs(directory, exist_ok=True)
+
+    def exists(self):
+        return os.path.exists(self.index_path)
+
+    def load_index(self):
+        """색인(요약)만 읽음"""
+        summaries = []
+        if os.path.exists(self.index_path):
+            with open(self.index_path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        summaries.append(json.loads(line))
+                    except ValueError:
+                        continue
+        with self.lock:
+            self.summaries = summaries
+        return list(summaries)
+
+    def append(self, entry):
+        """배팅 결과를 세그먼트에 추가하고 색인에 요약 기록 (요약 반환)"""
+        with self.lock:
+            round_id = self.summaries[-1]["id"] + 1 if self.summaries else 1
+            end_time = entry.get("end_time") or datetime.now().strftime(
+                "%Y-%m-%d %H:%M:%S"
+            )
+            segment = f"{end_time[:7]}.ndjson"
+            data = (json.dumps(entry, ensure_ascii=False) + "\n").encode("utf-8")
+
+            # 세그먼트를 먼저 기록해 색인이 없는 위치를 가리키지 않도록 함
+            with open(os.path.join(self.directory, segment), "ab") as f:
+                offset = f.tell()
+                f.write(data)
+                f.flush()
+                os.fsync(f.fileno())
+
+            summary = summarize_betting_round(round_id, entry)
+            summary.update(segment=segment, offset=offset, length=len(data))
+            with open(self.index_path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(summary, ensure_ascii=False) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+
+            self.summaries.append(summary)
+            return summary
+
+    def import_entries(self, entries):
+        """기존 이력을 임시 폴더에 모두 옮겨 적은 뒤 폴더 이름을 바꿔 한 번에 교체
+
+        도중에 종료되면 색인 없는 보관소가 그대로 남아 다음 실행에서 처음부터 다시 옮깁니다.
+        """
+        staging = self.directory + ".migrating"
+        if os.path.exists(staging):
+            shutil.rmtree(staging)
+        archive = BettingHistoryArchive(staging)
+        for entry in entries:
+            archive.append(entry)
+
+        with self.lock:
+            # 색인이 없는 보관소의 세그먼트는 어디서도 가리키지 않으므로 지우고 교체
+            shutil.rmtree(self.directory)
+            os.rename(staging, self.directory)
+        return self.load_index()
+
+    def load_round(self, summary):
+        """요약의 세그먼트/오프셋으로 배팅 상세 정보 읽기"""
+        with open(os.path.join(self.directory, summary["segment"]), "rb") as f:
+            f.seek(summary["offset"])
+            data = f.read(summary["length"])
+        return json.loads(data.decode("utf-8"))
+
+    def iter_rounds(self):
+        with self.lock:
+            summaries = list(self.summaries)
+        for summary in summaries:
+            yield self.load_round(summary)
+
+
+class ItemNameIndex:
+    """아이템 이름 검색 색인 (정확히 일치 -> 접두어 -> 부분 문자열 순서로 찾음)"""
+
+    GRAM = 2
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.names = {}
+        self.exact = {}
+        self.trie = {}
+        self.grams = {}
+
+    @staticmethod
+    def normalize(name):
+        """대소문자, 전각/반각, 연속 공백 차이를 없앤 이름"""
+        return " ".join(unicodedata.normalize("NFKC", name).casefold().split())
+
+    @classmethod
+    def ngrams(cls, text):
+        if len(text) < cls.GRAM:
+            return {text} if text else set()
+        return {text[i : i + cls.GRAM] for i in range(len(text) - cls.GRAM + 1)}
+
+    def rebuild(self, items):
+        """아이템 ID -> {"name", ...} 사전으로 색인 다시 만들기"""
+        with self.lock:
+            self.names = {}
+            self.exact = {}
+            self.trie = {}
+            self.grams = {}
+            for item_id, item_data in items.items():
+                self._add(item_id, item_data["name"])
+
+    def add(self, item_id, name):
+        with self.lock:
+            self._remove(item_id)
+            self._add(item_id, name)
+
+    def remove(self, item_id):
+        with self.lock:
+            self._remove(item_id)
+
+    def _add(self, item_id, name):
+        key = self.normalize(name)
+        self.names[item_id] = key
+        self.exact.setdefault(key, set()).add(item_id)
+
+        # 접두어 트라이: 각 노드의 "" 칸에 그 접두어로 시작하는 아이템 ID 보관
+        node = self.trie
+        for char in key:
+            node = node.setdefault(char, {})
+            node.setdefault("", set()).add(item_id)
+
+        # 한 글자짜리 검색어도 찾을 수 있도록 한 글자 색인도 함께 보관
+        for gram in self.ngrams(key) | set(key):
+            self.grams.setdefault(gram, set()).add(item_id)
+
+    def _remove(self, item_id):
+        key = self.names.pop(item_id, None)
+        if key is None:
+            return
+
+        self._discard(self.exact, key, item_id)
+        for gram in self.ngrams(key) | set(key):
+            self._discard(self.grams, gram, item_id)
+
+        path = [self.trie]
+        for char in key:
+            path.append(path[-1][char])
+        for depth in range(len(key), 0, -1):
+            node = path[depth]
+            node[""].discard(item_id)
+            if not node[""]:
+                del path[depth - 1][key[depth - 1]]
+
+    @staticmethod
+    def _discard(index, key, item_id):
+        ids = index.get(key)
+        if ids is not None:
+            ids.discard(item_id)
+            if not ids:
+                del index[key]
+
+    def find(self, query):
+        """검색어와 맞는 아이템 ID 목록 (여러 개면 애매한 검색어)
+
+        정확히 일치하는 이름이 있으면 그것만, 없으면 접두어 일치,
+        그것도 없으면 부분 문자열 일치 결과를 반환합니다.
+        """
+        key = self.normalize(query)
+        if not key:
+            return []
+
+        with self.lock:
+            ids = self.exact.get(key)
+            if ids:
+                return sorted(ids)
+
+            node = self.trie
+            for char in key:
+                node = node.get(char)
+                if node is None:
+                    break
+            else:
+                return sorted(node[""])
+
+            grams = self.ngrams(key) if len(key) >= self.GRAM else set(key)
+            candidates = None
+            for gram in grams:
+                ids = self.grams.get(gram)
+                if not ids:
+                    return []
+                candidates = set(ids) if candidates is None else candidates & ids
+                if not candidates:
+                    return []
+            return sorted(
+                item_id for item_id in candidates if key in self.names[item_id]
+            )
+
+
+class InventoryNameIndex:
+    """유저별 보유 아이템 이름 색인 (이름/접두어 -> 아이템 ID)
+
+    아이템 ID -> 보유 유저 목록도 함께 두어 이름이 바뀌면 해당 유저 색인만 고칩니다.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.users = {}
+        self.holders = {}
+
+    def rebuild(self, inventory, shop_items):
+        """유저 ID -> 인벤토리 사전과 상점 아이템으로 전체 색인 다시 만들기"""
+        with self.lock:
+            self.users = {}
+            self.holders = {}
+            for user_id, items in inventory.items():
+                for item_id in list(items):
+                    if item_id in shop_items:
+                        self._add(user_id, item_id, shop_items[item_id]["name"])
+
+    def add(self, user_id, item_id, name):
+        with self.lock:
+            self._remove(user_id, item_id)
+            self._add(user_id, item_id, name)
+
+    def remove(self, user_id, item_id):
+        with self.lock:
+            self._remove(user_id, item_id)
+
+    def drop_user(self, user_id):
+        with self.lock:
+            entry = self.users.pop(user_id, None)
+            for item_id in entry["names"] if entry else ():
+                self._discard(self.holders, item_id, user_id)
+
+    def rename(self, item_id, name):
+        """아이템 이름 변경을 보유 유저 색인에 반영"""
+        with self.lock:
+            for user_id in list(self.holders.get(item_id, ())):
+                self._remove(user_id, item_id)
+                self._add(user_id, item_id, name)
+
+    def remove_item(self, item_id):
+        with self.lock:
+            for user_id in list(self.holders.get(item_id, ())):
+                self._remove(user_id, item_id)
+
+    def _add(self, user_id, item_id, name):
+        key = ItemNameIndex.normalize(name)
+        entry = self.users.setdefault(user_id, {"names": {}, "prefixes": {}})
+        entry["names"][item_id] = key
+        for end in range(1, len(key) + 1):
+            entry["prefixes"].setdefault(key[:end], set()).add(item_id)
+        self.holders.setdefault(item_id, set()).add(user_id)
+
+    def _remove(self, user_id, item_id):
+        entry = self.users.get(user_id)
+        key = entry["names"].pop(item_id, None) if entry else None
+        if key is None:
+            return
+        for end in range(1, len(key) + 1):
+            self._discard(entry["prefixes"], key[:end], item_id)
+        if not entry["names"]:
+            del self.users[user_id]
+        self._discard(self.holders, item_id, user_id)
+
+    _discard = staticmethod(ItemNameIndex._discard)
+
+    def find(self, user_id, query):
+        """유저가 보유한 아이템 중 검색어와 맞는 아이템 ID 목록
+
+        정확히 일치하는 이름 -> 접두어 -> 부분 문자열 순서로 찾습니다.
+        """
+        key = ItemNameIndex.normalize(query)
+        with self.lock:
+            entry = self.users.get(user_id)
+            if not entry or not key:
+                return []
+
+            exact = [
+                item_id
+                for item_id in entry["prefixes"].get(key, ())
+                if entry["names"][item_id] == key
+            ]
+            if exact:
+                return sorted(exact)
+
+            ids = entry["prefixes"].get(key)
+            if ids:
+                return sorted(ids)
+
+            return sorted(
+                item_id for item_id, name in entry["names"].items() if key in name
+            )
+
+
+class UserRecord:
+    """유저 한 명의 상태 핸들 (값은 UserTable의 열에 저장)"""
+
+    __slots__ = ("table", "user_id", "row")
+
+    def __init__(self, table, user_id, row):
+        self.table = table
+        self.user_id = user_id
+        self.row = row
+
+    @property
+    def points(self):
+        return self.table.points[self.row]
+
+    @points.setter
+    def points(self, value):
+        self.table.points[self.row] = value
+
+    @property
+    def last_reward_epoch(self):
+        """마지막 보상 시간 (epoch 초, 없으면 None)"""
+        value = self.table.last_rewards[self.row]
+        return None if value == UserTable.NO_TIME else value
+
+    @last_reward_epoch.setter
+    def last_reward_epoch(self, value):
+        self.table.last_rewards[self.row] = (
+            UserTable.NO_TIME if value is None else int(value)
+        )
+
+    @property
+    def inventory(self):
+        """아이템 ID -> {"quantity", "purchase_date"} (없으면 None)"""
+        return self.table.inventory.get(self.row)
+
+    @inventory.setter
+    def inventory(self, value):
+        if value is None:
+            self.table.inventory.pop(self.row, None)
+        else:
+            self.table.inventory[self.row] = value
+
+
+class UserTable:
+    """유저 상태 테이블 (유저 ID -> 행 번호, 포인트/보상 시간은 int64 열로 저장)
+
+    인벤토리는 가진 유저만 행 번호로 따로 보관합니다.
+    """
+
+    NO_TIME = -(2**63)
+
+    def __init__(self):
+        self.lock = threading.RLock()
+        self.rows = {}
+        self.user_ids = []
+        self.points = array("q")
+        self.last_rewards = array("q")
+        self.inventory = {}
+        self.free_rows = []
+
+        # 기존 코드에서 사전처럼 쓰기 위한 뷰
+        self.points_map = UserPointsView(self)
+        self.last_reward_map = UserRewardTimeView(self)
+        self.inventory_map = UserSparseView(self, "inventory")
+
+    def __len__(self):
+        return len(self.rows)
+
+    def __contains__(self, user_id):
+        return user_id in self.rows
+
+    def total_points(self):
+        """살아 있는 유저의 포인트 합계 (삭제된 행은 포인트가 0이므로 열 전체를 더함)"""
+        with self.lock:
+            return sum(self.points)
+
+    def get(self, user_id):
+        row = self.rows.get(user_id)
+        return None if row is None else UserRecord(self, user_id, row)
+
+    def ensure(self, user_id):
+        return UserRecord(self, user_id, self.ensure_row(user_id))
+
+    def ensure_row(self, user_id):
+        row = self.rows.get(user_id)
+        if row is not None:
+            return row
+
+        with self.lock:
+            row = self.rows.get(user_id)
+            if row is None:
+                if self.free_rows:
+                    row = self.free_rows.pop()
+                    self.user_ids[row] = user_id
+                    self.points[row] = 0
+                    self.last_rewards[row] = self.NO_TIME
+                else:
+                    row = len(self.user_ids)
+                    self.user_ids.append(user_id)
+                    self.points.append(0)
+                    self.last_rewards.append(self.NO_TIME)
+                self.rows[user_id] = row
+            return row
+
+    def remove(self, user_id):
+        with self.lock:
+            row = self.rows.pop(user_id, None)
+            if row is None:
+                return False
+            self.user_ids[row] = None
+            self.points[row] = 0
+            self.last_rewards[row] = self.NO_TIME
+            self.inventory.pop(row, None)
+            self.free_rows.append(row)
+            return True
+
+    def reset_points(self):
+        """모든 포인트/보상 시간 초기화 (인벤토리가 있는 유저만 남김)"""
+        with self.lock:
+            for user_id, row in list(self.rows.items()):
+                if row in self.inventory:
+                    self.points[row] = 0
+                    self.last_rewards[row] = self.NO_TIME
+                else:
+                    self.remove(user_id)
+
+    def load_dicts(self, points, last_rewards):
+        """포인트 사전과 epoch 초 사전으로 채우기"""
+        for user_id, value in points.items():
+            self.points[self.ensure_row(user_id)] = value
+        for user_id, value in last_rewards.items():
+            self.last_rewards[self.ensure_row(user_id)] = value
+
+    def load_columns(self, user_ids, points, last_rewards):
+        """스냅샷의 열을 그대로 사용"""
+        with self.lock:
+            self.user_ids = list(user_ids)
+            self.rows = dict(zip(self.user_ids, range(len(self.user_ids))))
+            self.points = points
+            self.last_rewards = last_rewards
+            self.inventory = {}
+            self.free_rows = []
+
+    def adopt(self, other):
+        """다른 테이블의 유저 데이터로 교체 (인벤토리는 유지)"""
+        with self.lock:
+            kept = [
+                (user_id, self.inventory[row])
+                for user_id, row in self.rows.items()
+                if row in self.inventory
+            ]
+            self.rows = other.rows
+            self.user_ids = other.user_ids
+            self.points = other.points
+            self.last_rewards = other.last_rewards
+            self.free_rows = other.free_rows
+            self.inventory = dict(other.inventory)
+
+            for user_id, inventory in kept:
+                self.inventory[self.ensure_row(user_id)] = inventory
+
+
+class UserColumnView(collections.abc.MutableMapping):
+    """UserTable의 한 열을 유저 ID 사전처럼 다루는 뷰"""
+
+    def __init__(self, table):
+        self.table = table
+
+    @abc.abstractmethod
+    def _get(self, row):
+        """행의 값 (값이 없으면 None)"""
+
+    @abc.abstractmethod
+    def _set(self, row, value):
+        """행에 값 기록"""
+
+    @abc.abstractmethod
+    def _clear(self, user_id, row):
+        """유저의 값 지우기"""
+
+    def __getitem__(self, user_id):
+        row = self.table.rows.get(user_id)
+        value = None if row is None else self._get(row)
+        if value is None:
+            raise KeyError(user_id)
+        return value
+
+    def __setitem__(self, user_id, value):
+        self._set(self.table.ensure_row(user_id), value)
+
+    def __delitem__(self, user_id):
+        row = self.table.rows.get(user_id)
+        if row is None or self._get(row) is None:
+            raise KeyError(user_id)
+        self._clear(user_id, row)
+
+    def __iter__(self):
+        return iter([user_id for user_id, _ in self.items()])
+
+    def __len__(self):
+        return len(self.items())
+
+    def items(self):
+        result = []
+        for user_id, row in list(self.table.rows.items()):
+            value = self._get(row)
+            if value is not None:
+                result.append((user_id, value))
+        return result
+
+    def values(self):
+        return [value for _, value in self.items()]
+
+    def copy(self):
+        return dict(self.items())
+
+
+class UserPointsView(UserColumnView):
+    """유저 ID -> 포인트 (포인트를 지우면 유저 자체가 삭제됨)"""
+
+    def _get(self, row):
+        return self.table.points[row]
+
+    def _set(self, row, value):
+        self.table.points[row] = value
+
+    def _clear(self, user_id, row):
+        self.table.remove(user_id)
+
+    def __len__(self):
+        return len(self.table.rows)
+
+    def clear(self):
+        self.table.reset_points()
+
+
+class UserRewardTimeView(UserColumnView):
+    """유저 ID -> 마지막 보상 시간 (datetime으로 변환해 반환)"""
+
+    def _get(self, row):
+        value = self.table.last_rewards[row]
+        return None if value == UserTable.NO_TIME else datetime.fromtimestamp(value)
+
+    def _set(self, row, value):
+        if isinstance(value, datetime):
+            value = value.timestamp()
+        self.table.last_rewards[row] = int(value)
+
+    def _clear(self, user_id, row):
+        self.table.last_rewards[row] = UserTable.NO_TIME
+
+    def epochs(self):
+        """datetime으로 변환하지 않고 epoch 초 사전 반환"""
+        no_time = UserTable.NO_TIME
+        last_rewards = self.table.last_rewards
+        return {
+            user_id: last_rewards[row]
+            for user_id, row in list(self.table.rows.items())
+            if last_rewards[row] != no_time
+        }
+
+
+class UserSparseView(UserColumnView):
+    """일부 유저만 가진 값(인벤토리)을 유저 ID 사전처럼 다루는 뷰"""
+
+    def __init__(self, table, store):
+        super().__init__(table)
+        self.store = store
+
+    def _get(self, row):
+        return getattr(self.table, self.store).get(row)
+
+    def _set(self, row, value):
+        getattr(self.table, self.store)[row] = value
+
+    def _clear(self, user_id, row):
+        getattr(self.table, self.store).pop(row, None)
+
+    def items(self):
+        user_ids = self.table.user_ids
+        return [
+            (user_ids[row], value)
+            for row, value in list(getattr(self.table, self.store).items())
+        ]
+
+    def clear(self):
+        getattr(self.table, self.store).clear()
+
+
+class MonotonicClock:
+    """epoch 초와 같은 기준의 정수 시계 (시스템 시간이 바뀌어도 뒤로 가지 않음)"""
+
+    def __init__(self):
+        self.offset = time.time() - time.monotonic()
+
+    def now(self):
+        return int(time.monotonic() + self.offset)
+
+
+class RewardWheel:
+    """유저별 다음 보상 가능 시각을 분 단위 칸에 모아두는 타이밍 휠
+
+    칸 번호는 (보상 가능 시각 // tick_seconds)이며, 이미 지난 칸은 advance에서 비웁니다.
+    """
+
+    def __init__(self, tick_seconds=60):
+        self.tick_seconds = tick_seconds
+        self.lock = threading.Lock()
+        self.buckets = {}
+        self.user_ticks = {}
+        self.current_tick = None
+
+    def schedule(self, user_id, eligible_at):
+        tick = int(eligible_at) // self.tick_seconds
+        with self.lock:
+            self._discard(user_id)
+            if self.current_tick is not None and tick <= self.current_tick:
+                return
+            self.buckets.setdefault(tick, set()).add(user_id)
+            self.user_ticks[user_id] = tick
+
+    def discard(self, user_id):
+        with self.lock:
+            self._discard(user_id)
+
+    def _discard(self, user_id):
+        tick = self.user_ticks.pop(user_id, None)
+        if tick is None:
+            return
+        bucket = self.buckets[tick]
+        bucket.discard(user_id)
+        if not bucket:
+            del self.buckets[tick]
+
+    def clear(self):
+        with self.lock:
+            self.buckets.clear()
+            self.user_ticks.clear()
+
+    def rebuild(self, last_rewards, cooldown_seconds, now):
+        """마지막 보상 시각(epoch 초 사전)으로 휠 다시 구성"""
+        with self.lock:
+            self.buckets.clear()
+            self.user_ticks.clear()
+            self.current_tick = int(now) // self.tick_seconds
+            for user_id, last_reward in last_rewards.items():
+                tick = (last_reward + cooldown_seconds) // self.tick_seconds
+                if tick > self.current_tick:
+                    self.buckets.setdefault(tick, set()).add(user_id)
+                    self.user_ticks[user_id] = tick
+
+    def advance(self, now):
+        """지난 칸을 비우고 새로 보상 가능해진 유저 수 반환"""
+        now_tick = int(now) // self.tick_seconds
+        released = 0
+        with self.lock:
+            if self.current_tick is None:
+                self.current_tick = now_tick
+            if now_tick <= self.current_tick:
+                return 0
+
+            if now_tick - self.current_tick > len(self.buckets):
+                ticks = [tick for tick in self.buckets if tick <= now_tick]
+            else:
+                ticks = range(self.current_tick + 1, now_tick + 1)
+            for tick in ticks:
+                bucket = self.buckets.pop(tick, None)
+                if bucket:
+                    released += len(bucket)
+                    for user_id in bucket:
+                        del self.user_ticks[user_id]
+            self.current_tick = now_tick
+        return released
+
+    def pending(self):
+        """아직 쿨다운 중인 유저 수"""
+        return len(self.user_ticks)
+
+    def due_within(self, now, seconds):
+        """now부터 seconds 안에 보상 가능해지는 유저 수"""
+        first = int(now) // self.tick_seconds + 1
+        last = int(now + seconds) // self.tick_seconds
+        with self.lock:
+            return sum(
+                len(self.buckets.get(tick, ())) for tick in range(first, last + 1)
+            )
+
+
+def parse_reward_times(last_reward_data):
+    """'%Y-%m-%d %H:%M:%S' 문자열 사전을 epoch 초 사전으로 변환"""
+    now = int(time.time())
+    epochs = {}
+    for user_id, time_str in last_reward_data.items():
+        try:
+            epochs[user_id] = int(
+                time.mktime(time.strptime(time_str, "%Y-%m-%d %H:%M:%S"))
+            )
+        except (TypeError, ValueError):
+            epochs[user_id] = now
+    return epochs
+
+
+class BinarySnapshot:
+    """유저 포인트/보상 시간/인벤토리 바이너리 스냅샷
+
+    구조: 헤더 | 이름 테이블(NUL 구분 UTF-8) | 포인트 int64[] | 보상 시간 int64[]
+    | 인벤토리 (유저, 아이템, 수량, 구매 일시) int64[4][]
+    이름 테이블의 앞 user_count개는 유저 ID이며, 나머지는 인벤토리에서 쓰는 문자열
+
+    포인트/보상 시간 열은 한 번만 복사해 UserTable에 그대로 넘깁니다. 유저 조회용
+    사전을 만들어야 하므로 이름 테이블은 한 번에 디코딩하고, 인벤토리 사전은
+    read_inventory를 부를 때 만듭니다. 저장할 때마다 파일 전체를 다시 씁니다.
+    """
+
+    MAGIC = b"CZPS"
+    VERSION = 1
+    HEADER = struct.Struct("<4sHHqIIII")
+    NO_TIME = UserTable.NO_TIME
+
+    def __init__(self, path):
+        self.path = path
+        self.cache = None
+        self.lock = threading.Lock()
+
+    def exists(self):
+        return os.path.exists(self.path)
+
+    @staticmethod
+    def _aligned(offset):
+        return (offset + 7) & ~7
+
+    @staticmethod
+    def _to_bytes(values):
+        if sys.byteorder != "little":
+            values = array("q", values)
+            values.byteswap()
+        return values.tobytes()
+
+    @staticmethod
+    def _read_array(buffer, offset, count):
+        values = array("q")
+        values.frombytes(buffer[offset : offset + count * 8])
+        if sys.byteorder != "little":
+            values.byteswap()
+        return values
+
+    def write(self, points, last_rewards, inventory, ledger_seq=0):
+        """전체 스냅샷 기록 (last_rewards는 epoch 초 사전, 기록한 바이트 수 반환)"""
+        names = list(points)
+        user_count = len(names)
+        index = {name: idx for idx, name in enumerate(names)}
+
+        def intern(name):
+            idx = index.get(name)
+            if idx is None:
+                idx = len(names)
+                names.append(name)
+                index[name] = idx
+            return idx
+
+        inventory_values = array("q")
+        inventory_count = 0
+        for user_id, items in inventory.items():
+            user_idx = intern(user_id)
+            for item_id, item in items.items():
+                purchase_date = item.get("purchase_date")
+                inventory_values.extend(
+                    (
+                        user_idx,
+                        intern(item_id),
+                        item.get("quantity", 0),
+                        -1 if purchase_date is None else intern(purchase_date),
+                    )
+                )
+                inventory_count += 1
+
+        name_blob = "\0".join(names).encode("utf-8")
+        header = self.HEADER.pack(
+            self.MAGIC,
+            self.VERSION,
+            0,
+            ledger_seq,
+            user_count,
+            len(names),
+            inventory_count,
+            len(name_blob),
+        )
+        padding = self._aligned(len(header) + len(name_blob)) - (
+            len(header) + len(name_blob)
+        )
+        no_time = self.NO_TIME
+        chunks = [
+            header,
+            name_blob,
+            b"\0" * padding,
+            self._to_bytes(array("q", points.values())),
+            self._to_bytes(
+                array(
+                    "q",
+                    (last_rewards.get(name, no_time) for name in names[:user_count]),
+                )
+            ),
+            self._to_bytes(inventory_values),
+        ]
+
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            for chunk in chunks:
+                f.write(chunk)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+        self.cache = None
+        return sum(len(chunk) for chunk in chunks)
+
+    def read(self):
+        """스냅샷 읽기 (다음 기록 전까지 결과를 재사용)"""
+        with self.lock:
+            if self.cache is None:
+                self.cache = self._read()
+            return self.cache
+
+    def _read(self):
+        with open(self.path, "rb") as f:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+                (
+                    magic,
+                    version,
+                    _,
+                    ledger_seq,
+                    user_count,
+                    name_count,
+                    inventory_count,
+                    names_size,
+                ) = self.HEADER.unpack_from(buffer, 0)
+                if magic != self.MAGIC or version != self.VERSION:
+                    raise ValueError("지원하지 않는 스냅샷 형식입니다.")
+
+                offset = self.HEADER.size
+                names = (
+                    buffer[offset : offset + names_size].decode("utf-8").split("\0")
+                    if name_count
+                    else []
+                )
+                offset = self._aligned(offset + names_size)
+                points = self._read_array(buffer, offset, user_count)
+                offset += user_count * 8
+                rewards = self._read_array(buffer, offset, user_count)
+                offset += user_count * 8
+                inventory_values = self._read_array(buffer, offset, inventory_count * 4)
+
+        return {
+            "user_ids": names[:user_count],
+            "points": points,
+            "last_reward": rewards,
+            "ledger_seq": ledger_seq,
+            "names": names,
+            "inventory_values": inventory_values,
+        }
+
+    def read_inventory(self):
+        """스냅샷의 인벤토리 열을 유저 ID -> 아이템 사전으로 변환"""
+        data = self.read()
+        names = data["names"]
+        values = data["inventory_values"]
+        inventory = {}
+        for idx in range(0, len(values), 4):
+            user_idx, item_idx, quantity, date_idx = values[idx : idx + 4]
+            inventory.setdefault(names[user_idx], {})[names[item_idx]] = {
+                "quantity": quantity,
+                "purchase_date": names[date_idx] if date_idx >= 0 else None,
+            }
+        return inventory
+
+    def release(self):
+        self.cache = None
+
+
+class SqliteStore:
+    """유저/인벤토리/상점/배팅 이력 SQLite 저장소 (WAL 모드, 행 단위 저장)"""
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS meta (
+            key TEXT PRIMARY KEY,
+            value TEXT
+        );
+        CREATE TABLE IF NOT EXISTS users (
+            user_id TEXT PRIMARY KEY,
+            points INTEGER NOT NULL DEFAULT 0,
+            last_reward TEXT
+        );
+        CREATE TABLE IF NOT EXISTS inventory (
+            user_id TEXT NOT NULL,
+            item_id TEXT NOT NULL,
+            quantity INTEGER NOT NULL,
+            purchase_date TEXT,
+            PRIMARY KEY (user_id, item_id)
+        );
+        CREATE TABLE IF NOT EXISTS shop_items (
+            item_id TEXT PRIMARY KEY,
+            name TEXT NOT NULL,
+            price INTEGER NOT NULL,
+            description TEXT
+        );
+        CREATE TABLE IF NOT EXISTS betting_history (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            data TEXT NOT NULL
+        );
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(self.SCHEMA)
+
+        # 이전 버전 DB에는 요약 컬럼이 없으므로 추가
+        columns = [
+            row[1] for row in self.conn.execute("PRAGMA table_info(betting_history)")
+        ]
+        if "summary" not in columns:
+            self.conn.execute("ALTER TABLE betting_history ADD COLUMN summary TEXT")
+        self.conn.commit()
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
+
+    def get_meta(self, key, default=None):
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT value FROM meta WHERE key = ?", (key,)
+            ).fetchone()
+        return row[0] if row else default
+
+    def set_meta(self, key, value):
+        with self.lock, self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, value)
+            )
+
+    # 유저 포인트
+    def save_users(
+        self, points, last_reward, user_ids=None, ledger_seq=None, progress=None
+    ):
+        """user_ids가 주어지면 해당 유저만 upsert, 없으면 전체 교체
+
+        progress가 주어지면 SETTLEMENT_CHUNK_SIZE명씩 기록할 때마다 (기록 수, 전체 수)로
+        호출합니다. 나눠 기록해도 원장 순번과 함께 한 트랜잭션으로 커밋됩니다.
+        """
+        ids = points.keys() if user_ids is None else user_ids
+        rows = [
+            (user_id, points[user_id], last_reward.get(user_id))
+            for user_id in ids
+            if user_id in points
+        ]
+        with self.lock, self.conn:
+            if user_ids is None:
+                self.conn.execute("DELETE FROM users")
+            else:
+                # 삭제된 유저는 행도 삭제
+                self.conn.executemany(
+                    "DELETE FROM users WHERE user_id = ?",
+                    [(user_id,) for user_id in user_ids if user_id not in points],
+                )
+            for offset in range(0, len(rows), SETTLEMENT_CHUNK_SIZE):
+                self.conn.executemany(
+                    "INSERT INTO users (user_id, points, last_reward) VALUES (?, ?, ?) "
+                    "ON CONFLICT(user_id) DO UPDATE SET "
+                    "points = excluded.points, last_reward = excluded.last_reward",
+                    rows[offset : offset + SETTLEMENT_CHUNK_SIZE],
+                )
+                if progress:
+                    progress(min(len(rows), offset + SETTLEMENT_CHUNK_SIZE), len(rows))
+            # 스냅샷에 반영된 원장 순번을 같은 트랜잭션에 기록
+            if ledger_seq is not None:
+                self.conn.execute(
+                    "INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)",
+                    ("ledger_seq", str(ledger_seq)),
+                )
+
+    def load_users(self):
+        points = {}
+        last_reward = {}
+        with self.lock:
+            for user_id, user_points, reward in self.conn.execute(
+                "SELECT user_id, points, last_reward FROM users"
+            ):
+                points[user_id] = user_points
+                if reward:
+                    last_reward[user_id] = reward
+        return points, last_reward
+
+    # 유저 인벤토리
+    def save_inventory(self, inventory, user_ids=None):
+        """user_ids가 주어지면 해당 유저 인벤토리만 교체, 없으면 전체 교체"""
+        ids = inventory.keys() if user_ids is None else user_ids
+        rows = [
+            (user_id, item_id, item["quantity"], item.get("purchase_date"))
+            for user_id in ids
+            for item_id, item in inventory.get(user_id, {}).items()
+        ]
+        with self.lock, self.conn:
+            if user_ids is None:
+                self.conn.execute("DELETE FROM inventory")
+            else:
+                self.conn.executemany(
+                    "DELETE FROM inventory WHERE user_id = ?",
+                    [(user_id,) for user_id in user_ids],
+                )
+            self.conn.executemany(
+                "INSERT INTO inventory (user_id, item_id, quantity, purchase_date) "
+                "VALUES (?, ?, ?, ?)",
+                rows,
+            )
+
+    def load_inventory(self):
+        inventory = {}
+        with self.lock:
+            for user_id, item_id, quantity, purchase_date in self.conn.execute(
+                "SELECT user_id, item_id, quantity, purchase_date FROM inventory"
+            ):
+                inventory.setdefault(user_id, {})[item_id] = {
+                    "quantity": quantity,
+                    "purchase_date": purchase_date,
+                }
+        return inventory
+
+    # 상점 아이템
+    def save_shop_items(self, shop_items):
+        rows = [
+            (item_id, item["name"], item["price"], item.get("description", ""))
+            for item_id, item in shop_items.items()
+        ]
+        with self.lock, self.conn:
+            self.conn.execute("DELETE FROM shop_items")
+            self.conn.executemany(
+                "INSERT INTO shop_items (item_id, name, price, description) "
+                "VALUES (?, ?, ?, ?)",
+                rows,
+            )
+
+    def load_shop_items(self):
+        with self.lock:
+            return {
+                item_id: {"name": name, "price": price, "description": description}
+                for item_id, name, price, description in self.conn.execute(
+                    "SELECT item_id, name, price, description FROM shop_items "
+                    "ORDER BY rowid"
+                )
+            }
+
+    # 배팅 이력 (상세 데이터와 요약을 함께 저장)
+    def _insert_betting_round(self, entry):
+        cursor = self.conn.execute(
+            "INSERT INTO betting_history (data) VALUES (?)",
+            (json.dumps(entry, ensure_ascii=False),),
+        )
+        summary = summarize_betting_round(cursor.lastrowid, entry)
+        self.conn.execute(
+            "UPDATE betting_history SET summary = ? WHERE id = ?",
+            (json.dumps(summary, ensure_ascii=False), cursor.lastrowid),
+        )
+        return summary
+
+    def append_betting_round(self, entry):
+        with self.lock, self.conn:
+            return self._insert_betting_round(entry)
+
+    def save_betting_history(self, history):
+        """전체 이력 교체 (JSON 가져오기용)"""
+        with self.lock, self.conn:
+            self.conn.execute("DELETE FROM betting_history")
+            for entry in history:
+                self._insert_betting_round(entry)
+
+    def load_betting_summaries(self):
+        with self.lock, self.conn:
+            summaries = []
+            rows = self.conn.execute(
+                "SELECT id, summary FROM betting_history ORDER BY id"
+            ).fetchall()
+            for round_id, summary in rows:
+                if summary is None:
+                    # 요약이 없는 이전 데이터는 한 번만 계산해 저장
+                    (data,) = self.conn.execute(
+                        "SELECT data FROM betting_history WHERE id = ?", (round_id,)
+                    ).fetchone()
+                    summary = json.dumps(
+                        summarize_betting_round(round_id, json.loads(data)),
+                        ensure_ascii=False,
+                    )
+                    self.conn.execute(
+                        "UPDATE betting_history SET summary = ? WHERE id = ?",
+                        (summary, round_id),
+                    )
+                summaries.append(json.loads(summary))
+            return summaries
+
+    def load_betting_round(self, round_id):
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT data FROM betting_history WHERE id = ?", (round_id,)
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def iter_betting_rounds(self):
+        with self.lock:
+            rows = self.conn.execute(
+                "SELECT data FROM betting_history ORDER BY id"
+            ).fetchall()
+        for (data,) in rows:
+            yield json.loads(data)
+
+
+class PointLedger:
+    """포인트 변동 원장 (추가 전용 파일, 묶음 기록, 스냅샷 이후 기록만 재적용)"""
+
+    def __init__(
+        self,
+        path,
+        archive_path,
+        commit_interval=0.1,
+        compact_threshold=10000,
+        on_error=None,
+    ):
+        self.path = path
+        self.archive_path = archive_path
+        self.commit_interval = commit_interval
+        self.compact_threshold = compact_threshold
+        self.on_error = on_error
+        self.buffer = []
+        self.cond = threading.Condition()
+        self.file_lock = threading.Lock()
+        self.thread = None
+        self.running = False
+        self.last_seq = 0
+        self.records_in_file = 0
+        self._scan()
+
+    def _scan(self):
+        """기존 원장 파일에서 마지막 순번과 기록 수 확인"""
+        for record in self.read_after(0):
+            self.last_seq = max(self.last_seq, record["seq"])
+            self.records_in_file += 1
+
+    def start(self):
+        if self.running:
+            return
+
+        self.running = True
+        self.thread = threading.Thread(target=self._run, name="point-ledger")
+        self.thread.daemon = True
+        self.thread.start()
+
+    def stop(self, timeout=2.0):
+        if self.running:
+            with self.cond:
+                self.running = False
+                self.cond.notify_all()
+            if self.thread:
+                self.thread.join(timeout)
+            self.thread = None
+        self.commit()
+
+    def ensure_seq(self, seq):
+        """스냅샷에 기록된 순번보다 작은 순번을 다시 쓰지 않도록 보정"""
+        with self.cond:
+            self.last_seq = max(self.last_seq, seq)
+
+    def append(self, user_id, delta, reason, ref=None):
+        """기록을 버퍼에 추가하고 순번 반환 (파일 기록은 묶어서 처리)"""
+        with self.cond:
+            self.last_seq += 1
+            record = {
+                "seq": self.last_seq,
+                "ts": round(time.time(), 3),
+                "user": user_id,
+                "delta": delta,
+                "reason": reason,
+            }
+            if ref is not None:
+                record["ref"] = ref
+            self.buffer.append(record)
+            if len(self.buffer) == 1:
+                self.cond.notify()
+            return self.last_seq
+
+    def append_many(self, user_ids, deltas, reason, ref=None):
+        """여러 유저의 기록을 한 번에 추가하고 마지막 순번 반환"""
+        with self.cond:
+            ts = round(time.time(), 3)
+            seq = self.last_seq
+            records = []
+            for user_id, delta in zip(user_ids, deltas):
+                seq += 1
+                record = {
+                    "seq": seq,
+                    "ts": ts,
+                    "user": user_id,
+                    "delta": delta,
+                    "reason": reason,
+                }
+                if ref is not None:
+                    record["ref"] = ref
+                records.append(record)
+            if records:
+                self.last_seq = seq
+                notify = not self.buffer
+                self.buffer.extend(records)
+                if notify:
+                    self.cond.notify()
+            return self.last_seq
+
+    def _run(self):
+        while True:
+            with self.cond:
+                while self.running and not self.buffer:
+                    self.cond.wait()
+                if not self.running:
+                    break
+                # 잠시 기다려 같은 시점의 기록을 한 번에 씀
+                self.cond.wait(self.commit_interval)
+            self.commit()
+
+    def commit(self):
+        with self.file_lock:
+            with self.cond:
+                records = self.buffer
+                self.buffer = []
+            if not records:
+                return
+
+            data = "".join(
+                json.dumps(record, ensure_ascii=False) + "\n" for record in records
+            )
+            try:
+                with open(self.path, "a", encoding="utf-8") as f:
+                    f.write(data)
+                    f.flush()
+                    os.fsync(f.fileno())
+                self.records_in_file += len(records)
+            except Exception as e:
+                with self.cond:
+                    self.buffer = records + self.buffer
+                if self.on_error:
+                    self.on_error(e)
+
+    def read_after(self, seq):
+        """순번이 seq보다 큰 기록을 순서대로 반환 (잘린 마지막 줄은 무시)"""
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue
+                if record.get("seq", 0) > seq:
+                    yield record
+
+    def compact(self, snapshot_seq):
+        """스냅샷에 반영된 기록을 보관 파일로 옮기고 원장 파일을 줄임"""
+        self.commit()
+        with self.file_lock:
+            if not os.path.exists(self.path):
+                return
+
+            archived = []
+            remaining = []
+            with open(self.path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        continue
+                    if record.get("seq", 0) <= snapshot_seq:
+                        archived.append(line)
+                    else:
+                        remaining.append(line)
+
+            if archived:
+                with open(self.archive_path, "a", encoding="utf-8") as f:
+                    f.writelines(archived)
+                    f.flush()
+                    os.fsync(f.fileno())
+
+            tmp_path = self.path + ".tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                f.writelines(remaining)
+            os.replace(tmp_path, self.path)
+            self.records_in_file = len(remaining)
+
+    @staticmethod
+    def apply(points, record):
+        """기록 하나를 포인트 사전에 적용"""
+        reason = record.get("reason")
+        if reason == "reset":
+            points.clear()
+        elif reason == "delete_user":
+            points.pop(record["user"], None)
+        else:
+            user_id = record["user"]
+            points[user_id] = points.get(user_id, 0) + record["delta"]
+
+
+# 채팅 배팅 접수 결과
+BET_ACCEPTED = "accepted"
+BET_DUPLICATE = "duplicate"
+BET_CLOSED = "closed"
+
+
+def betting_ledger_ref(event):
+    """원장의 배팅/당첨/환불 기록에 남길 라운드 참조 (라운드 ID@시작 시각)"""
+    round_id = event.get("round_id")
+    if not round_id:
+        return event["start_time"]
+    return f"{round_id}@{event['start_time']}"
+
+
+class BettingRound:
+    """배팅 라운드 하나의 상태 (주제, 마감 시각, 배팅, 선택지별 합계)
+
+    선택지별 합계는 배팅이 들어올 때마다 O(1)로 갱신하고, 정산에 쓸 열도 함께 쌓습니다.
+    """
+
+    def __init__(self, round_id, event, end_time, journal):
+        self.id = round_id
+        self.event = event
+        self.end_time = end_time
+        self.journal = journal
+        self.active = True
+        self.settling = False
+        # 스케줄러에 등록한 마감/알림 이벤트 ID
+        self.events = []
+
+        self.lock = threading.Lock()
+        self.bets = {}
+        option_count = len(event["options"])
+        self.option_points = [0] * option_count
+        self.option_participants = [0] * option_count
+        self.total_points = 0
+        self.participants = 0
+
+        # 정산용 열 (UserTable 행 번호, 선택지, 배팅액)
+        self.rows = array("q")
+        self.options = array("q")
+        self.stakes = array("q")
+        # 라운드 중 유저가 삭제/초기화되면 행 번호를 믿을 수 없으므로 표시
+        self.stale = False
+
+    @property
+    def topic(self):
+        return self.event["topic"]
+
+    @property
+    def ledger_ref(self):
+        return betting_ledger_ref(self.event)
+
+    def has_bet(self, user_id):
+        return user_id in self.bets
+
+    def add(self, user_id, bet, row):
+        """배팅 추가 (이미 배팅한 유저면 False)"""
+        with self.lock:
+            return self._add(user_id, bet, row)
+
+    def _add(self, user_id, bet, row):
+        option, amount = bet["option"], bet["amount"]
+        if user_id in self.bets:
+            return False
+        self.bets[user_id] = bet
+        self.option_points[option] += amount
+        self.option_participants[option] += 1
+        self.total_points += amount
+        self.participants += 1
+        self.rows.append(row)
+        self.options.append(option)
+        self.stakes.append(amount)
+        return True
+
+    def _discard_last(self, user_id):
+        """마지막으로 추가한 배팅 되돌리기 (기록 실패 시)"""
+        bet = self.bets.pop(user_id)
+        option, amount = bet["option"], bet["amount"]
+        self.option_points[option] -= amount
+        self.option_participants[option] -= 1
+        self.total_points -= amount
+        self.participants -= 1
+        self.rows.pop()
+        self.options.pop()
+        self.stakes.pop()
+
+    def place(self, user_id, bet, row, ledger_seq=None):
+        """채팅 배팅 접수 (마감 확인, 추가, 기록을 마감과 같은 잠금 안에서 처리)
+
+        ledger_seq는 이 배팅의 포인트 차감 원장 순번으로, 복구 시 차감이 저장됐는지 확인하는 데 씁니다.
+        """
+        with self.lock:
+            if not self.active:
+                return BET_CLOSED
+            if not self._add(user_id, bet, row):
+                return BET_DUPLICATE
+            try:
+                self.journal.record_bet(user_id, bet, ledger_seq)
+            except Exception:
+                # 기록되지 않은 배팅은 합계에도 남기지 않음
+                self._discard_last(user_id)
+                raise
+            return BET_ACCEPTED
+
+    def close(self):
+        """배팅 마감 (이미 마감된 라운드면 False)"""
+        with self.lock:
+            if not self.active:
+                return False
+            self.active = False
+            self.journal.close_round()
+            return True
+
+    def load(self, bets, table):
+        """복원된 유저 ID -> 배팅 사전으로 합계 다시 계산"""
+        for user_id, bet in bets.items():
+            self.add(user_id, bet, table.ensure_row(user_id))
+
+    def copy_bets(self):
+        with self.lock:
+            return dict(self.bets)
+
+    def time_left(self):
+        return max(0, (self.end_time - datetime.now()).total_seconds())
+
+    def snapshot(self):
+        """총액과 선택지별 (포인트, 참여자 수, 배당률)을 한 번에 복사"""
+        with self.lock:
+            total = self.total_points
+            options = [
+                {
+                    "points": points,
+                    "participants": participants,
+                    "odds": total / points if points > 0 and total > 0 else 0,
+                }
+                for points, participants in zip(
+                    self.option_points, self.option_participants
+                )
+            ]
+            return {
+                "total_points": total,
+                "participants": self.participants,
+                "options": options,
+            }
+
+
+class BettingRegistry:
+    """동시에 열린 배팅 라운드 목록 (라운드 ID는 A~Z)"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.rounds = {}
+
+    def __len__(self):
+        return len(self.rounds)
+
+    def next_id(self):
+        with self.lock:
+            for round_id in string.ascii_uppercase:
+                if round_id not in self.rounds:
+                    return round_id
+        return None
+
+    def add(self, betting_round):
+        with self.lock:
+            self.rounds[betting_round.id] = betting_round
+
+    def remove(self, round_id):
+        with self.lock:
+            return self.rounds.pop(round_id, None)
+
+    def get(self, round_id):
+        return self.rounds.get(round_id.upper()) if round_id else None
+
+    def all(self):
+        with self.lock:
+            return list(self.rounds.values())
+
+    def open_rounds(self):
+        """배팅을 받고 있는 라운드 목록"""
+        return [betting_round for betting_round in self.all() if betting_round.active]
+
+    def resolve(self, round_id=None):
+        """라운드 ID가 없으면 열린 라운드가 하나일 때만 그 라운드 반환"""
+        if round_id:
+            return self.get(round_id)
+        open_rounds = self.open_rounds()
+        return open_rounds[0] if len(open_rounds) == 1 else None
+
+    def mark_stale(self):
+        """유저 행이 바뀌었을 때 모든 라운드의 정산 열을 다시 모으도록 표시"""
+        for betting_round in self.all():
+            betting_round.stale = True
+
+
+class BettingSettlement:
+    """배팅 정산 (UserTable 행 번호, 선택지, 배팅액 열로 한 번에 계산)
+
+    NumPy가 있으면 배열 연산을, 없으면 array 모듈과 한 번의 루프를 사용합니다.
+    """
+
+    def __init__(self, rows, options, stakes):
+        self.rows = rows
+        self.options = options
+        self.stakes = stakes
+        self.winner_index = array("q")
+        self.payouts = array("q")
+        self.winner_ids = []
+
+    @classmethod
+    def from_round(cls, betting_round, table):
+        """배팅 라운드가 모아둔 열 사용 (유저 행이 바뀌었으면 배팅 내역으로 다시 모음)
+
+        호출 측에서 table.lock을 잡고 있어야 합니다.
+        """
+        with betting_round.lock:
+            if not betting_round.stale:
+                return cls(
+                    array("q", betting_round.rows),
+                    array("q", betting_round.options),
+                    array("q", betting_round.stakes),
+                )
+            bets = list(betting_round.bets.items())
+
+        return cls(
+            array("q", [table.ensure_row(user_id) for user_id, _ in bets]),
+            array("q", [bet["option"] for _, bet in bets]),
+            array("q", [bet["amount"] for _, bet in bets]),
+        )
+
+    def __len__(self):
+        return len(self.rows)
+
+    def settle(self, table, winning_option, odds):
+        """당첨자와 지급액(배팅액 * 배당률, 소수점 버림)을 계산해 포인트 열에 한 번에 더함
+
+        호출 측에서 table.lock을 잡고 있어야 하며, 지급 총액을 반환합니다.
+        """
+        if numpy is not None and self.stakes:
+            options = numpy.frombuffer(self.options, dtype=numpy.int64)
+            stakes = numpy.frombuffer(self.stakes, dtype=numpy.int64)
+            rows = numpy.frombuffer(self.rows, dtype=numpy.int64)
+            self.winner_index = numpy.flatnonzero(options == winning_option)
+            self.payouts = (stakes[self.winner_index] * odds).astype(numpy.int64)
+            winner_rows = rows[self.winner_index]
+
+            points = numpy.frombuffer(table.points, dtype=numpy.int64)
+            points[winner_rows] += self.payouts
+            # 버퍼를 놓아야 포인트 열에 새 유저 행을 추가할 수 있음
+            del points
+            winner_rows = winner_rows.tolist()
+        else:
+            winner_index = array("q")
+            payouts = array("q")
+            winner_rows = []
+            points = table.points
+            for index, (row, option, stake) in enumerate(
+                zip(self.rows, self.options, self.stakes)
+            ):
+                if option == winning_option:
+                    payout = int(stake * odds)
+                    points[row] += payout
+                    winner_index.append(index)
+                    payouts.append(payout)
+                    winner_rows.append(row)
+            self.winner_index = winner_index
+            self.payouts = payouts
+
+        user_ids = table.user_ids
+        self.winner_ids = [user_ids[row] for row in winner_rows]
+        return int(sum(self.payouts))
+
+    def payout_list(self):
+        return self.payouts.tolist()
+
+    def winners(self):
+        """배팅 이력에 저장할 당첨자 목록"""
+        stakes = self.stakes
+        return [
+            {"user_id": user_id, "bet_amount": stakes[index], "win_amount": payout}
+            for user_id, index, payout in zip(
+                self.winner_ids, self.winner_index.tolist(), self.payouts.tolist()
+            )
+        ]
+
+    def top_winners(self, count):
+        """지급액이 큰 당첨자 count명 (전체 정렬 없이 부분 선택)"""
+        payouts = self.payouts
+        if numpy is not None and len(payouts) > count:
+            picked = numpy.argpartition(payouts, -count)[-count:]
+            picked = picked[numpy.argsort(payouts[picked])[::-1]].tolist()
+        else:
+            picked = heapq.nlargest(count, range(len(payouts)), key=payouts.__getitem__)
+
+        return [
+            (
+                self.winner_ids[position],
+                self.stakes[int(self.winner_index[position])],
+                int(payouts[position]),
+            )
+            for position in picked
+        ]
+
+
+class BettingJournal:
+    """진행 중인 배팅 라운드 기록 (시작 정보와 배팅을 한 줄씩 추가)"""
+
+    def __init__(self, path, sync_interval=0.5):
+        self.path = path
+        self.sync_interval = sync_interval
+        self.lock = threading.Lock()
+        self.file = None
+        self.last_sync = 0.0
+
+    def _write(self, record, sync=False):
+        with self.lock:
+            if self.file is None:
+                self.file = open(self.path, "a", encoding="utf-8")
+                # 비정상 종료로 잘린 줄이 있으면 줄을 바꿔 이어 씀
+                if self.file.tell() > 0:
+                    with open(self.path, "rb") as f:
+                        f.seek(-1, os.SEEK_END)
+                        if f.read(1) != b"\n":
+                            self.file.write("\n")
+            self.file.write(json.dumps(record, ensure_ascii=False) + "\n")
+            self.file.flush()
+
+            # fsync는 일정 간격으로만 수행해 배팅이 몰릴 때도 부담을 줄임
+            now = time.monotonic()
+            if sync or now - self.last_sync >= self.sync_interval:
+                os.fsync(self.file.fileno())
+                self.last_sync = now
+
+    def begin(self, event, end_time):
+        """새 라운드 시작 (이전 기록은 지움)"""
+        with self.lock:
+            if self.file:
+                self.file.close()
+            self.file = open(self.path, "w", encoding="utf-8")
+        self._write(
+            {
+                "type": "event",
+                "event": event,
+                "end_time": end_time.strftime("%Y-%m-%d %H:%M:%S"),
+            },
+            sync=True,
+        )
+
+    def record_bet(self, user_id, bet, ledger_seq=None):
+        """배팅 기록 (포인트 차감 원장 기록의 순번과 함께)"""
+        self._write(
+            {"type": "bet", "user": user_id, "bet": bet, "ledger_seq": ledger_seq}
+        )
+
+    def close_round(self):
+        """배팅 마감 기록"""
+        self._write({"type": "close"}, sync=True)
+
+    def settle(self, result, ledger_seq):
+        """결과 적용 기록 (당첨금 원장 기록의 마지막 순번과 함께, 원장 커밋 전에 기록)"""
+        self._write(
+            {"type": "settled", "result": result, "ledger_seq": ledger_seq}, sync=True
+        )
+
+    def archive(self):
+        """배팅 이력 저장 완료 기록"""
+        self._write({"type": "archived"}, sync=True)
+
+    def finish(self):
+        """결과 적용 또는 환불이 끝난 라운드 기록 삭제"""
+        with self.lock:
+            if self.file:
+                self.file.close()
+                self.file = None
+            if os.path.exists(self.path):
+                os.remove(self.path)
+
+    def shutdown(self):
+        with self.lock:
+            if self.file:
+                self.file.flush()
+                os.fsync(self.file.fileno())
+                self.file.close()
+                self.file = None
+
+    def load(self):
+        """남아 있는 라운드 복원 (없으면 None)"""
+        if not os.path.exists(self.path):
+            return None
+
+        round_state = None
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    # 기록 중 종료되어 잘린 줄은 무시
+                    continue
+
+                record_type = record.get("type")
+                if record_type == "event":
+                    round_state = {
+                        "event": record["event"],
+                        "end_time": datetime.strptime(
+                            record["end_time"], "%Y-%m-%d %H:%M:%S"
+                        ),
+                        "bets": {},
+                        "bet_seqs": {},
+                        "closed": False,
+                        "settled": None,
+                        "archived": False,
+                    }
+                elif round_state is None:
+                    continue
+                elif record_type == "bet":
+                    round_state["bets"][record["user"]] = record["bet"]
+                    round_state["bet_seqs"][record["user"]] = record.get("ledger_seq")
+                elif record_type == "close":
+                    round_state["closed"] = True
+                elif record_type == "settled":
+                    round_state["settled"] = record
+                elif record_type == "archived":
+                    round_state["archived"] = True
+        return round_state
+
+
+class PersistenceScheduler:
+    """변경된 데이터를 표시해 두었다가 백그라운드에서 모아서 저장 (N초 또는 M회 변경마다)"""
+
+    def __init__(self, flush_func, interval=5.0, max_changes=100, on_error=None):
+        self.flush_func = flush_func
+        self.interval = interval
+        self.max_changes = max_changes
+        self.on_error = on_error
+        # 데이터 종류 -> 변경된 유저 집합 (None이면 전체 저장)
+        self.dirty = {}
+        self.changes = 0
+        self.first_dirty_at = None
+        self.cond = threading.Condition()
+        self.flush_lock = threading.Lock()
+        self.thread = None
+        self.running = False
+        self.flush_count = 0
+        self.last_flush_at = None
+        self.last_latency = 0.0
+        self.last_bytes = 0
+        self.total_bytes = 0
+
+    def start(self):
+        if self.running:
+            return
+
+        self.running = True
+        self.thread = threading.Thread(target=self._run, name="persistence")
+        self.thread.daemon = True
+        self.thread.start()
+
+    def stop(self, timeout=5.0):
+        """스레드를 멈추고 남은 변경 사항을 마지막으로 저장"""
+        if self.running:
+            with self.cond:
+                self.running = False
+                self.cond.notify_all()
+            if self.thread:
+                self.thread.join(timeout)
+            self.thread = None
+        self.flush()
+
+    def mark_dirty(self, name, user_ids=None):
+        with self.cond:
+            current = self.dirty.get(name, set())
+            if user_ids is None or current is None:
+                self.dirty[name] = None
+            else:
+                current.update(user_ids)
+                self.dirty[name] = current
+
+            self.changes += 1
+            if self.first_dirty_at is None:
+                # 저장 타이머 시작
+                self.first_dirty_at = time.monotonic()
+                self.cond.notify()
+            elif self.changes >= self.max_changes:
+                self.cond.notify()
+
+    def write_now(self, name, user_ids=None):
+        """기다리지 않고 바로 저장 (실패하면 예외를 그대로 전달)"""
+        with self.flush_lock:
+            return self.flush_func(name, user_ids)
+
+    def take(self, name):
+        """대기 중인 변경 표시를 꺼냄 (없으면 빈 집합, 전체 저장이면 None)"""
+        with self.cond:
+            return self.dirty.pop(name, set())
+
+    def pending_changes(self):
+        return self.changes
+
+    def last_flush_age(self):
+        if self.last_flush_at is None:
+            return None
+        return time.monotonic() - self.last_flush_at
+
+    def _due(self):
+        if not self.dirty:
+            return False
+        if self.changes >= self.max_changes:
+            return True
+        return time.monotonic() - self.first_dirty_at >= self.interval
+
+    def _run(self):
+        while True:
+            with self.cond:
+                while self.running and not self._due():
+                    if self.dirty:
+                        timeout = self.interval - (
+                            time.monotonic() - self.first_dirty_at
+                        )
+                    else:
+                        timeout = None
+                    self.cond.wait(timeout)
+                if not self.running:
+                    break
+            self.flush()
+
+    def flush(self):
+        with self.flush_lock:
+            with self.cond:
+                dirty = self.dirty
+                self.dirty = {}
+                self.changes = 0
+                self.first_dirty_at = None
+
+            if not dirty:
+                return
+
+            started = time.perf_counter()
+            written = 0
+            for name, user_ids in dirty.items():
+                try:
+                    written += self.flush_func(name, user_ids) or 0
+                except Exception as e:
+                    # 실패한 데이터는 다음 저장 때 다시 시도
+                    self.mark_dirty(name, user_ids)
+                    if self.on_error:
+                        self.on_error(name, e)
+
+            self.flush_count += 1
+            self.last_latency = time.perf_counter() - started
+            self.last_bytes = written
+            self.total_bytes += written
+            self.last_flush_at = time.monotonic()
+
+
+def parse_bet_keyword(keyword):
+    """배팅 명령어 첫 토큰 해석 ("1" -> (None, 1), "A1" -> ("A", 1), 아니면 None)"""
+    round_id = None
+    if keyword and keyword[0] in string.ascii_letters:
+        round_id, keyword = keyword[0].upper(), keyword[1:]
+    if not keyword.isdigit():
+        return None
+    try:
+        return round_id, int(keyword)
+    except ValueError:
+        return None
+
+
+class DeadlineScheduler:
+    """마감 시각 이벤트 스케줄러 (최소 힙에 쌓아 두고 다음 마감까지 잠드는 스레드 하나)
+
+    콜백은 스케줄러 스레드에서 실행되므로 Tk 위젯은 root.after(0, ...)로 넘겨서 다룹니다.
+    """
+
+    def __init__(self, on_error=None):
+        self.on_error = on_error
+        # [마감 시각(time.monotonic), 이벤트 ID, 콜백] (취소하면 콜백이 None)
+        self.heap = []
+        self.events = {}
+        self.next_id = 0
+        self.cond = threading.Condition()
+        self.thread = None
+        self.running = False
+        self.fired = 0
+
+    def start(self):
+        if self.running:
+            return
+
+        self.running = True
+        self.thread = threading.Thread(target=self._run, name="deadline-scheduler")
+        self.thread.daemon = True
+        self.thread.start()
+
+    def stop(self, timeout=5.0):
+        """스레드 중지 (남은 이벤트는 실행하지 않음)"""
+        with self.cond:
+            self.running = False
+            self.heap = []
+            self.events = {}
+            self.cond.notify_all()
+        if self.thread:
+            self.thread.join(timeout)
+        self.thread = None
+
+    def call_at(self, deadline, callback):
+        """time.monotonic() 기준 deadline에 callback 실행 예약 (취소용 이벤트 ID 반환)"""
+        with self.cond:
+            self.next_id += 1
+            entry = [deadline, self.next_id, callback]
+            self.events[self.next_id] = entry
+            heapq.heappush(self.heap, entry)
+            # 가장 빠른 마감이 바뀌었을 때만 스레드를 깨움
+            if self.heap[0] is entry:
+                self.cond.notify()
+            return self.next_id
+
+    def call_later(self, delay, callback):
+        return self.call_at(time.monotonic() + delay, callback)
+
+    def cancel(self, event_id):
+        """예약 취소 (힙에서는 실행 차례가 왔을 때 버림)"""
+        with self.cond:
+            entry = self.events.pop(event_id, None)
+            if entry is not None:
+                entry[2] = None
+
+    def pending(self):
+        return len(self.events)
+
+    def _next(self):
+        """실행할 콜백을 꺼낼 때까지 대기 (중지되면 None)"""
+        with self.cond:
+            while self.running:
+                while self.heap and self.heap[0][2] is None:
+                    heapq.heappop(self.heap)
+                if not self.heap:
+                    self.cond.wait()
+                    continue
+                timeout = self.heap[0][0] - time.monotonic()
+                if timeout > 0:
+                    self.cond.wait(timeout)
+                    continue
+                _, event_id, callback = heapq.heappop(self.heap)
+                del self.events[event_id]
+                return callback
+            return None
+
+    def _run(self):
+        while True:
+            callback = self._next()
+            if callback is None:
+                break
+            self.fired += 1
+            try:
+                callback()
+            except Exception as e:
+                if self.on_error:
+                    self.on_error(e)
+
+
+class CommandRouter:
+    """채팅 명령어 라우터 (첫 토큰 해시 조회로 핸들러 선택)"""
+
+    def __init__(self, prefix="!"):
+        self.prefix = prefix
+        self.commands = {}
+        self.numeric_handler = None
+        self.default_handler = None
+        self.chat_handler = None
+
+    def register(self, keyword, handler, arg_mode="none"):
+        """명령어 등록 (arg_mode: none / required / optional)"""
+        if arg_mode not in ("none", "required", "optional"):
+            raise ValueError(f"알 수 없는 인자 모드: {arg_mode}")
+        self.commands[keyword] = (handler, arg_mode)
+
+    def unregister(self, keyword):
+        self.commands.pop(keyword, None)
+
+    def set_numeric_handler(self, handler):
+        """!숫자 또는 !라운드숫자(예: !A1) 형태 명령어 핸들러 등록"""
+        self.numeric_handler = handler
+
+    def set_default_handler(self, handler):
+        """등록되지 않은 ! 명령어 핸들러 등록"""
+        self.default_handler = handler
+
+    def set_chat_handler(self, handler):
+        """일반 채팅 핸들러 등록"""
+        self.chat_handler = handler
+
+    def dispatch(self, user_id, username, content):
+        """메시지를 핸들러로 전달, 처리된 핸들러 종류를 반환"""
+        content = content.strip()
+
+        if not content.startswith(self.prefix):
+            if self.chat_handler:
+                self.chat_handler(user_id, username)
+            return "chat"
+
+        body = content[len(self.prefix) :]
+        parts = body.split(None, 1)
+        if not parts:
+            if self.default_handler:
+                self.default_handler(user_id, username, body.strip())
+            return "default"
+
+        keyword = parts[0]
+        arg = parts[1].strip() if len(parts) > 1 else ""
+
+        entry = self.commands.get(keyword)
+        if entry:
+            handler, arg_mode = entry
+            if arg_mode == "none" and not arg:
+                handler(user_id, username)
+                return keyword
+            if arg_mode == "required" and arg:
+                handler(user_id, username, arg)
+                return keyword
+            if arg_mode == "optional":
+                handler(user_id, username, arg)
+                return keyword
+        elif self.numeric_handler and parse_bet_keyword(keyword) is not None:
+            self.numeric_handler(user_id, username, content)
+            return "numeric"
+
+        if self.default_handler:
+            self.default_handler(user_id, username, body.strip())
+        return "default"
+
+
+class ChatWorkerPool:
+    """채팅 명령 처리 워커 풀 (유저별 직렬화, 큐 길이 제한)"""
+
+    def __init__(self, handler, worker_count=4, queue_size=1000, on_error=None):
+        self.handler = handler
+        self.worker_count = max(1, int(worker_count))
+        self.queue_size = max(self.worker_count, int(queue_size))
+        self.on_error = on_error
+        self.queues = []
+        self.threads = []
+        self.running = False
+        self.processed = 0
+        self.dropped = 0
+        self.lock = threading.Lock()
+
+    def start(self):
+        if self.running:
+            return
+
+        self.running = True
+        shard_size = max(1, self.queue_size // self.worker_count)
+        self.queues = [
+            queue.Queue(maxsize=shard_size) for _ in range(self.worker_count)
+        ]
+        self.threads = []
+        for idx, q in enumerate(self.queues):
+            thread = threading.Thread(
+                target=self._worker, args=(q,), name=f"chat-worker-{idx}"
+            )
+            thread.daemon = True
+            thread.start()
+            self.threads.append(thread)
+
+    def stop(self, timeout=2.0):
+        if not self.running:
+            return
+
+        self.running = False
+        for q in self.queues:
+            try:
+                q.put_nowait(None)
+            except queue.Full:
+                pass
+        for thread in self.threads:
+            thread.join(timeout)
+        self.threads = []
+
+    def submit(self, user_id, *args):
+        """같은 유저의 메시지는 항상 같은 워커로 전달 (유저별 순서 보장)"""
+        if not self.running:
+            with self.lock:
+                self.dropped += 1
+            return False
+
+        q = self.queues[hash(user_id) % self.worker_count]
+        try:
+            q.put_nowait(args)
+            return True
+        except queue.Full:
+            with self.lock:
+                self.dropped += 1
+            return False
+
+    def _worker(self, q):
+        while True:
+            args = q.get()
+            if args is None:
+                break
+            try:
+                self.handler(*args)
+            except Exception as e:
+                if self.on_error:
+                    self.on_error(e)
+            finally:
+                with self.lock:
+                    self.processed += 1
+
+    def stats(self):
+        return {
+            "depth": sum(q.qsize() for q in self.queues),
+            "processed": self.processed,
+            "dropped": self.dropped,
+            "workers": self.worker_count if self.running else 0,
+        }
+
+
+class ChzzkApiClient:
+    """치지직 Open API 클라이언트 (연결 재사용, 타임아웃, 엔드포인트별 지연 통계)"""
+
+    BASE_URL = "https://openapi.chzzk.naver.com"
+
+    def __init__(self, connect_timeout=3.05, read_timeout=10, pool_size=4):
+        self.timeout = (connect_timeout, read_timeout)
+        self.session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(
+            pool_connections=1, pool_maxsize=pool_size
+        )
+        self.session.mount("https://", adapter)
+        self.latency = {}
+        self.lock = threading.Lock()
+
+    def request(self, method, path, **kwargs):
+        kwargs.setdefault("timeout", self.timeout)
+        started = time.perf_counter()
+        failed = True
+        try:
+            response = self.session.request(method, self.BASE_URL + path, **kwargs)
+            failed = response.status_code >= 400
+            return response
+        finally:
+            self._record(path, time.perf_counter() - started, failed)
+
+    def get(self, path, **kwargs):
+        return self.request("GET", path, **kwargs)
+
+    def post(self, path, **kwargs):
+        return self.request("POST", path, **kwargs)
+
+    def _record(self, path, elapsed, failed):
+        with self.lock:
+            stats = self.latency.setdefault(
+                path, {"count": 0, "errors": 0, "total": 0.0, "max": 0.0, "last": 0.0}
+            )
+            stats["count"] += 1
+            stats["total"] += elapsed
+            stats["last"] = elapsed
+            stats["max"] = max(stats["max"], elapsed)
+            if failed:
+                stats["errors"] += 1
+
+    def latency_stats(self):
+        """엔드포인트별 호출 수, 오류 수, 평균/최대/최근 지연(ms)"""
+        with self.lock:
+            return {
+                path: {
+                    "count": stats["count"],
+                    "errors": stats["errors"],
+                    "avg_ms": round(stats["total"] / stats["count"] * 1000, 1),
+                    "max_ms": round(stats["max"] * 1000, 1),
+                    "last_ms": round(stats["last"] * 1000, 1),
+                }
+                for path, stats in self.latency.items()
+                if stats["count"]
+            }
+
+    def close(self):
+        self.session.close()
+
+
+class TokenBucket:
+    """토큰 버킷 (초당 rate개, 최대 burst개까지 누적)"""
+
+    def __init__(self, rate, burst):
+        self.rate = float(rate)
+        self.burst = float(burst)
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def set_rate(self, rate, burst=None):
+        """속도 변경 (지금까지 쌓인 토큰은 이전 속도로 계산해 유지)"""
+        self._refill()
+        self.rate = float(rate)
+        if burst:
+            self.burst = float(burst)
+            self.tokens = min(self.tokens, self.burst)
+
+    def try_acquire(self):
+        self._refill()
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return True
+        return False
+
+    def wait_time(self):
+        """토큰 1개를 얻기까지 남은 시간 (초)"""
+        self._refill()
+        if self.tokens >= 1:
+            return 0.0
+        return (1 - self.tokens) / self.rate
+
+
+class ChatSendHandle:
+    """전송 대기 중인 채팅 메시지 핸들 (wait()로 결과 대기 가능)"""
+
+    def __init__(self, message, priority=None):
+        self.message = message
+        self.priority = CHAT_PRIORITY_INFO if priority is None else priority
+        self.success = None
+        self.event = threading.Event()
+
+    def set_result(self, success):
+        self.success = success
+        self.event.set()
+
+    def done(self):
+        return self.event.is_set()
+
+    def wait(self, timeout=None):
+        """전송 완료까지 대기 후 성공 여부 반환 (시간 초과 시 None)"""
+        self.event.wait(timeout)
+        return self.success
+
+
+class ChzzkApiError(Exception):
+    """치지직 API 호출 실패 (재시도 가능 여부, Retry-After 포함)"""
+
+    def __init__(
+        self, message, status_code=None, retryable=True, retry_after=None, auth=False
+    ):
+        super().__init__(message)
+        self.status_code = status_code
+        self.retryable = retryable
+        self.retry_after = retry_after
+        self.auth = auth
+
+
+class CircuitBreaker:
+    """연속 실패 시 호출을 차단하고 일정 시간 후 시험 호출을 허용하는 회로 차단기"""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold=5, reset_timeout=30.0, on_change=None):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.on_change = on_change
+        self.state = self.CLOSED
+        self.failures = 0
+        self.retry_at = 0.0
+
+    def _set_state(self, state):
+        if state != self.state:
+            self.state = state
+            if self.on_change:
+                self.on_change(state)
+
+    def allow_request(self):
+        if self.state == self.OPEN and time.monotonic() >= self.retry_at:
+            self._set_state(self.HALF_OPEN)
+        return self.state != self.OPEN
+
+    def time_until_retry(self):
+        if self.state != self.OPEN:
+            return 0.0
+        return max(0.0, self.retry_at - time.monotonic())
+
+    def record_success(self):
+        self.failures = 0
+        self._set_state(self.CLOSED)
+
+    def record_failure(self):
+        self.failures += 1
+        if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+            self.trip()
+
+    def trip(self, duration=None):
+        """지정한 시간(기본 reset_timeout) 동안 호출 차단"""
+        self.retry_at = time.monotonic() + (
+            self.reset_timeout if duration is None else duration
+        )
+        self._set_state(self.OPEN)
+
+    def reset(self):
+        self.failures = 0
+        self.retry_at = 0.0
+        self._set_state(self.CLOSED)
+
+
+class ChatSender:
+    """채팅 메시지 전송 전용 스레드 (우선순위별 대기열, 토큰 버킷 속도 조절, 재시도와 회로 차단)"""
+
+    def __init__(
+        self,
+        send_func,
+        rate=2.0,
+        burst=3,
+        cosmetic_limit=20,
+        max_retries=3,
+        base_backoff=0.5,
+        max_backoff=8.0,
+        failure_threshold=5,
+        reset_timeout=30.0,
+        spill_limit=500,
+        on_error=None,
+        on_breaker_change=None,
+    ):
+        self.send_func = send_func
+        self.bucket = TokenBucket(rate, burst)
+        self.cosmetic_limit = cosmetic_limit
+        self.max_retries = max_retries
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self.spill_limit = spill_limit
+        self.on_error = on_error
+        self.breaker = CircuitBreaker(
+            failure_threshold, reset_timeout, on_change=on_breaker_change
+        )
+        self.lanes = [collections.deque() for _ in CHAT_PRIORITY_NAMES]
+        # 회로 차단 중 보류된 메시지 (복구 후 자동 전송)
+        self.spill = collections.deque()
+        # 재시도 대기 중인 묶음 [(다시 보낼 시각, 우선순위, 시도 횟수, 묶음)]
+        self.delayed = []
+        self.cond = threading.Condition()
+        self.thread = None
+        self.running = False
+        self.sent = 0
+        self.failed = 0
+        self.dropped = 0
+        self.merged = 0
+        self.retried = 0
+
+    def set_rate(self, rate, burst=None):
+        """전송 속도 변경 (전송 스레드가 쓰는 버킷을 잠금 안에서 그대로 갱신)"""
+        with self.cond:
+            self.bucket.set_rate(rate, burst)
+            self.cond.notify()
+
+    def start(self):
+        if self.running:
+            return
+
+        self.running = True
+        self.thread = threading.Thread(target=self._run, name="chat-sender")
+        self.thread.daemon = True
+        self.thread.start()
+
+    def stop(self, timeout=2.0):
+        if not self.running:
+            return
+
+        with self.cond:
+            self.running = False
+            self.cond.notify_all()
+        if self.thread:
+            self.thread.join(timeout)
+        self.thread = None
+
+    def reset_breaker(self):
+        """토큰 갱신 등으로 즉시 재시도할 때 회로 차단 해제"""
+        with self.cond:
+            self.breaker.reset()
+            self.cond.notify()
+
+    def send(self, message, priority=CHAT_PRIORITY_INFO):
+        handle = ChatSendHandle(message, priority)
+        if not self.running:
+            handle.set_result(False)
+            return handle
+
+        with self.cond:
+            lane = self.lanes[priority]
+            # 꾸밈 메시지는 대기열이 가득 차면 가장 오래된 것부터 버림
+            if priority == CHAT_PRIORITY_COSMETIC and len(lane) >= self.cosmetic_limit:
+                lane.popleft().set_result(False)
+                self.dropped += 1
+            lane.append(handle)
+            self.cond.notify()
+        return handle
+
+    def pending(self):
+        return sum(len(lane) for lane in self.lanes) + sum(
+            len(entry[3]) for entry in self.delayed
+        )
+
+    def pending_by_priority(self):
+        counts = [len(lane) for lane in self.lanes]
+        for _, priority, _, batch in self.delayed:
+            counts[priority] += len(batch)
+        return dict(zip(CHAT_PRIORITY_NAMES, counts))
+
+    def spilled(self):
+        return len(self.spill)
+
+    def _spill_handles(self, handles):
+        """보류 대기열에 추가 (꾸밈 메시지는 버림, 가득 차면 오래된 것부터 버림)"""
+        for handle in handles:
+            if handle.priority == CHAT_PRIORITY_COSMETIC:
+                handle.set_result(False)
+                self.dropped += 1
+                continue
+            if len(self.spill) >= self.spill_limit:
+                self.spill.popleft().set_result(False)
+                self.dropped += 1
+            self.spill.append(handle)
+
+    def _spill_pending(self):
+        for lane in self.lanes:
+            handles = list(lane)
+            lane.clear()
+            self._spill_handles(handles)
+        for entry in self.delayed:
+            self._spill_handles(entry[3])
+        self.delayed.clear()
+
+    def _ready_retry(self):
+        """다시 보낼 시각이 된 재시도 묶음 중 가장 급한 것 (없으면 None)"""
+        now = time.monotonic()
+        ready = [entry for entry in self.delayed if entry[0] <= now]
+        if not ready:
+            return None
+        return min(ready, key=lambda entry: (entry[1], entry[0]))
+
+    def _has_ready(self):
+        return any(self.lanes) or self._ready_retry() is not None
+
+    def _retry_wait(self):
+        """가장 이른 재시도까지 남은 시간 (초, 없으면 None)"""
+        if not self.delayed:
+            return None
+        return max(0.0, min(entry[0] for entry in self.delayed) - time.monotonic())
+
+    def _next_batch(self):
+        """다음에 보낼 (메시지 묶음, 시도 횟수) 선택 (마감 안내 > 보류 메시지 > 나머지 우선순위 순)
+
+        재시도 묶음은 다시 보낼 시각이 지난 뒤 같은 우선순위의 새 메시지보다 먼저 보냅니다.
+        """
+        retry = self._ready_retry()
+        if retry and retry[1] == CHAT_PRIORITY_DEADLINE:
+            self.delayed.remove(retry)
+            return retry[3], retry[2]
+        if self.lanes[CHAT_PRIORITY_DEADLINE]:
+            return [self.lanes[CHAT_PRIORITY_DEADLINE].popleft()], 0
+        if self.spill:
+            return [self.spill.popleft()], 0
+
+        for priority, lane in enumerate(self.lanes):
+            if retry and retry[1] == priority:
+                self.delayed.remove(retry)
+                return retry[3], retry[2]
+            if not lane:
+                continue
+
+            batch = [lane.popleft()]
+            # 정보성 이하 메시지는 같은 대기열의 뒤 메시지와 합침
+            if priority >= CHAT_PRIORITY_INFO:
+                length = len(batch[0].message)
+                while (
+                    lane
+                    and length + 3 + len(lane[0].message) <= CHAT_MESSAGE_MAX_LENGTH
+                ):
+                    handle = lane.popleft()
+                    length += 3 + len(handle.message)
+                    batch.append(handle)
+                self.merged += len(batch) - 1
+            return batch, 0
+        return None
+
+    def _wait_for_token(self):
+        # 버킷은 set_rate와 같은 잠금 안에서만 다루고, 속도가 바뀌면 깨어나 다시 계산
+        with self.cond:
+            delay = self.bucket.wait_time()
+            while delay > 0 and self.running:
+                self.cond.wait(delay)
+                delay = self.bucket.wait_time()
+            self.bucket.try_acquire()
+
+    def _backoff(self, attempt):
+        """지터를 섞은 지수 백오프 시간 (초)"""
+        return random.uniform(0, min(self.max_backoff, self.base_backoff * 2**attempt))
+
+    def _finish(self, batch, success):
+        if success:
+            self.sent += 1
+        else:
+            self.failed += 1
+        for handle in batch:
+            handle.set_result(success)
+
+    def _deliver(self, batch, attempt):
+        message = " | ".join(handle.message for handle in batch)
+
+        try:
+            if self.send_func(message):
+                with self.cond:
+                    self.breaker.record_success()
+                self._finish(batch, True)
+                return
+            error = ChzzkApiError("전송 실패", retryable=False)
+        except ChzzkApiError as e:
+            error = e
+        except Exception as e:
+            error = ChzzkApiError(str(e))
+
+        if self.on_error:
+            self.on_error(error)
+
+        # 잘못된 요청 등 재시도해도 소용없는 오류는 차단기에 반영하지 않음
+        if not error.retryable and not error.auth:
+            self._finish(batch, False)
+            return
+
+        with self.cond:
+            if error.auth:
+                self.breaker.trip()
+            elif error.retry_after and error.retry_after > self.max_backoff:
+                self.breaker.trip(error.retry_after)
+            else:
+                self.breaker.record_failure()
+
+            if self.breaker.state == CircuitBreaker.OPEN:
+                self._spill_handles(batch)
+                return
+
+            if attempt < self.max_retries:
+                # 전송 스레드는 잠들지 않고, 정해진 시각 이후 우선순위에 따라 다시 꺼냄
+                self.retried += 1
+                delay = error.retry_after or self._backoff(attempt)
+                self.delayed.append(
+                    (time.monotonic() + delay, batch[0].priority, attempt + 1, batch)
+                )
+                return
+
+        self._finish(batch, False)
+
+    def _run(self):
+        while True:
+            with self.cond:
+                while self.running:
+                    if self._has_ready():
+                        break
+                    if self.spill and self.breaker.allow_request():
+                        break
+                    timeouts = [self._retry_wait()]
+                    if self.spill:
+                        timeouts.append(self.breaker.time_until_retry())
+                    timeouts = [timeout for timeout in timeouts if timeout is not None]
+                    self.cond.wait(min(timeouts) if timeouts else None)
+                if not self.running:
+                    break
+
+                # 차단 중에는 API를 호출하지 않고 보류 대기열로 옮김
+                if not self.breaker.allow_request():
+                    self._spill_pending()
+                    continue
+
+            # 토큰을 먼저 확보한 뒤 그 시점에 가장 급한 메시지를 꺼냄
+            self._wait_for_token()
+
+            with self.cond:
+                picked = self._next_batch()
+            if picked:
+                self._deliver(*picked)
+
+        # 종료 시 남은 메시지는 실패 처리
+        with self.cond:
+            for lane in self.lanes:
+                while lane:
+                    lane.popleft().set_result(False)
+            for entry in self.delayed:
+                for handle in entry[3]:
+                    handle.set_result(False)
+            self.delayed.clear()
+            while self.spill:
+                self.spill.popleft().set_result(False)
 
 
 class ChzzkPointsBot:
@@ -29,7 +2785,15 @@ class ChzzkPointsBot:
         self.root.geometry("1024x800")
         self.root.resizable(True, True)
 
-        self.setup_data_directory()
+        # 다른 스레드의 로그는 모아 두었다가 UI 스레드에서 표시
+        self.log_queue = queue.SimpleQueue()
+
+        # 시작 단계별 소요 시간 기록
+        self.startup_started = time.perf_counter()
+        self.startup_timings = []
+
+        with self.startup_phase("데이터 폴더/템플릿"):
+            self.setup_data_directory()
 
         self.channel_id = ""
         self.api_key = ""
@@ -43,8 +2807,21 @@ class ChzzkPointsBot:
         self.jackpot_chance = 5
         self.cooldown_minutes = 10
         self.point_multiplier = 1.0
+        self.reward_clock = MonotonicClock()
+        self.reward_wheel = RewardWheel()
         self.show_point_messages = True
         self.show_betting_messages = True
+        self.chat_worker_count = 4
+        self.chat_queue_size = 1000
+        self.chat_send_rate = 2.0
+        self.point_digest_enabled = False
+        self.point_digest_window = 60
+        self.point_digest_jackpot_immediate = True
+        self.storage_backend = "json"
+        self.storage = None
+        self.snapshot = None
+        self.persist_interval = 5
+        self.persist_max_changes = 100
 
         # 설정 관련 UI 변수 미리 초기화
         self.show_point_messages_var = tk.BooleanVar(value=self.show_point_messages)
@@ -56,30 +2833,58 @@ class ChzzkPointsBot:
             value=self.show_betting_messages
         )
 
-        self.user_points = {}
-        self.user_last_reward = {}
+        # 유저 상태는 한 테이블에 모으고, 기존 이름은 사전 형태의 뷰로 사용
+        self.users = UserTable()
+        self.user_points = self.users.points_map
+        self.user_last_reward = self.users.last_reward_map
+        # 채팅 처리 스레드에서 바뀐 유저 목록은 대시보드 갱신 주기에 한 번에 반영
+        self.user_view_dirty = False
 
         self.shop_items = {}
-        self.user_inventory = {}
+        self.shop_index = ItemNameIndex()
+        self.inventory_index = InventoryNameIndex()
+        self.user_inventory = self.users.inventory_map
 
         # 아이템 사용 이력 초기화
         self.item_use_history = []
 
-        self.betting_event = None
-        self.is_betting_active = False
+        # 동시에 열린 배팅 라운드 (라운드마다 합계, 타이머, 기록 파일을 따로 가짐)
+        self.betting_rounds = BettingRegistry()
+        self.selected_round_id = None
         self.betting_options = []
-        self.user_bets = {}
-        self.betting_end_time = None
-        self.betting_timer = None
         self.betting_results_file = os.path.join(
             self.data_dir, "chzzk_betting_history.json"
         )
-        self.betting_history = []
+        self.betting_history = []  # 배팅 이력 요약 목록
+        self.recent_betting_rounds = collections.deque(maxlen=10)
+        self.betting_archive = BettingHistoryArchive(
+            os.path.join(self.data_dir, "betting_history")
+        )
 
         self.sio = None
         self.is_connected = False
         self.is_running = False
 
+        # 채팅 명령어 라우터
+        self.command_router = CommandRouter()
+        self.register_commands()
+        self.chat_workers = None
+
+        # 포인트 획득 요약 메시지
+        self.point_digest = PointDigest()
+
+        # 치지직 API 클라이언트 (연결 재사용)
+        self.api_client = ChzzkApiClient()
+
+        # 채팅 전송 스레드
+        self.chat_sender = ChatSender(
+            self.post_chat_message,
+            rate=self.chat_send_rate,
+            on_error=lambda e: self.log(f"메시지 전송 실패: {str(e)}"),
+            on_breaker_change=self.on_chat_breaker_change,
+        )
+        self.chat_sender.start()
+
         # Flask 서버 설정
         self.flask_app = Flask(
             __name__,
@@ -102,23 +2907,153 @@ class ChzzkPointsBot:
         style.configure("TLabel", font=("Helvetica", 10))
         style.configure("TFrame", background="#f0f0f0")
 
-        self.create_ui()
-
-        self.load_settings()
+        with self.startup_phase("UI 생성"):
+            self.create_ui()
+
+        with self.startup_phase("설정 로드"):
+            self.load_settings()
+        with self.startup_phase("저장소 열기"):
+            self.open_storage()
+
+        # 포인트 변동 원장
+        self.points_lock = threading.RLock()
+        # 자동 저장과 정산 작업이 동시에 스냅샷을 쓰지 않도록 순서를 맞춤
+        self.store_lock = threading.Lock()
+        self.point_ledger = PointLedger(
+            self.point_ledger_file,
+            self.point_ledger_archive_file,
+            on_error=lambda e: self.log(f"포인트 원장 기록 오류: {str(e)}"),
+        )
+        self.point_ledger.start()
+
+        # 변경된 데이터 자동 저장 스레드
+        self.persistence = PersistenceScheduler(
+            self.flush_collection,
+            interval=self.persist_interval,
+            max_changes=self.persist_max_changes,
+            on_error=lambda name, e: self.log(f"자동 저장 오류 ({name}): {str(e)}"),
+        )
+        self.persistence.start()
 
-        self.load_shop_items()
-        self.refresh_shop_items()  # 상점 아이템 UI 자동 갱신
+        # 배팅 마감, 마감 전 알림, 포인트 요약 전송 스케줄러
+        self.scheduler = DeadlineScheduler(
+            on_error=lambda e: self.log(f"예약 작업 오류: {str(e)}")
+        )
+        self.scheduler.start()
 
-        self.load_user_inventory()
+        self.startup_load()
 
-        self.load_betting_history()
+        self.update_queue_stats()
+        self.schedule_point_digest()
 
         self.log(
             "프로그램이 시작되었습니다. 치지직 채널에 연결하려면 '연결' 버튼을 클릭하세요."
         )
 
         # Flask 서버 시작
-        self.start_flask_server()
+        with self.startup_phase("Flask 서버 시작"):
+            self.start_flask_server()
+
+        self.report_startup_timings()
+
+    @contextlib.contextmanager
+    def startup_phase(self, name):
+        """시작 단계 소요 시간 측정"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.startup_timings.append((name, time.perf_counter() - started))
+
+    def report_startup_timings(self):
+        total = time.perf_counter() - self.startup_started
+        lines = [f"시작 소요 시간: {total * 1000:.0f}ms"]
+        for name, seconds in self.startup_timings:
+            lines.append(f"  - {name}: {seconds * 1000:.0f}ms")
+
+        for line in lines:
+            print(line)
+            self.log(line)
+
+    def startup_load(self):
+        """데이터 파일을 한 번씩만 읽음 (서로 독립적인 파일은 동시에 읽기)"""
+        readers = {
+            "유저 데이터": self.read_user_data,
+            "상점 아이템": self.read_shop_items,
+            "유저 인벤토리": self.read_user_inventory,
+            "배팅 이력": self.read_betting_history,
+        }
+
+        def timed(name, reader):
+            started = time.perf_counter()
+            try:
+                return reader()
+            finally:
+                self.startup_timings.append(
+                    (f"{name} 읽기", time.perf_counter() - started)
+                )
+
+        with self.startup_phase("데이터 읽기 (병렬)"):
+            with ThreadPoolExecutor(
+                max_workers=len(readers), thread_name_prefix="startup-load"
+            ) as executor:
+                futures = {
+                    name: executor.submit(timed, name, reader)
+                    for name, reader in readers.items()
+                }
+
+        # 읽은 결과는 UI 스레드에서 적용 (읽기 오류는 각 load_* 메서드에서 처리)
+        with self.startup_phase("데이터 적용"):
+            self.load_user_data(futures["유저 데이터"].result)
+            self.load_shop_items(futures["상점 아이템"].result)
+            self.refresh_shop_items()  # 상점 아이템 UI 자동 갱신
+            self.load_user_inventory(futures["유저 인벤토리"].result)
+            self.load_betting_history(futures["배팅 이력"].result)
+            self.refresh_betting_history()
+
+        if self.snapshot:
+            self.snapshot.release()
+
+        with self.startup_phase("배팅 복구"):
+            self.restore_betting_rounds()
+
+    def betting_round_response(self, betting_round):
+        """배팅 라운드 하나의 오버레이용 API 응답"""
+        if betting_round is None or not betting_round.active:
+            self.log("현재 진행 중인 배팅 없음")
+            return jsonify(
+                {"active": False, "message": "현재 진행 중인 배팅이 없습니다."}
+            )
+
+        options_data = []
+        stats = betting_round.snapshot()
+        total_points = stats["total_points"]
+
+        for idx, option in enumerate(betting_round.event["options"]):
+            option_stats = stats["options"][idx]
+            options_data.append(
+                {
+                    "idx": idx + 1,
+                    "name": option,
+                    "bets": option_stats["points"],
+                    "participants": option_stats["participants"],
+                    "odds": round(option_stats["odds"], 2),
+                }
+            )
+
+        response_data = {
+            "active": True,
+            "round_id": betting_round.id,
+            "topic": betting_round.topic,
+            "time_left": int(betting_round.time_left()),
+            "total_points": total_points,
+            "options": options_data,
+        }
+
+        self.log(
+            f"배팅 정보 API 응답: [{betting_round.id}] {response_data['topic']} (옵션 {len(options_data)}개)"
+        )
+        return jsonify(response_data)
 
     def setup_flask_routes(self):
         @self.flask_app.route("/")
@@ -134,66 +3069,38 @@ class ChzzkPointsBot:
         @self.flask_app.route("/api/betting/current")
         def current_betting():
             self.log("현재 배팅 정보 API 요청 받음")
-            if not self.is_betting_active:
-                self.log("현재 진행 중인 배팅 없음")
-                return jsonify(
-                    {"active": False, "message": "현재 진행 중인 배팅이 없습니다."}
-                )
-
-            time_left = 0
-            if self.betting_end_time:
-                time_left = max(
-                    0, (self.betting_end_time - datetime.now()).total_seconds()
-                )
-
-            options_data = []
-            total_points = sum(bet["amount"] for bet in self.user_bets.values())
-
-            for idx, option in enumerate(self.betting_event["options"]):
-                option_bets = sum(
-                    bet["amount"]
-                    for bet in self.user_bets.values()
-                    if bet["option"] == idx
-                )
-                participants = len(
-                    [bet for bet in self.user_bets.values() if bet["option"] == idx]
-                )
-
-                # 배당률 계산
-                odds = 0
-                if option_bets > 0 and total_points > 0:
-                    odds = round(total_points / option_bets, 2)
-
-                options_data.append(
+            # ?round=A 로 라운드를 지정하지 않으면 첫 번째로 열린 라운드
+            round_id = request.args.get("round")
+            if round_id:
+                betting_round = self.betting_rounds.get(round_id)
+            else:
+                open_rounds = self.betting_rounds.open_rounds()
+                betting_round = open_rounds[0] if open_rounds else None
+            return self.betting_round_response(betting_round)
+
+        @self.flask_app.route("/api/betting/round/<round_id>")
+        def betting_round_info(round_id):
+            self.log(f"배팅 라운드 {round_id} 정보 API 요청 받음")
+            return self.betting_round_response(self.betting_rounds.get(round_id))
+
+        @self.flask_app.route("/api/betting/rounds")
+        def betting_rounds():
+            return jsonify(
+                [
                     {
-                        "idx": idx + 1,
-                        "name": option,
-                        "bets": option_bets,
-                        "participants": participants,
-                        "odds": odds,
+                        "round_id": betting_round.id,
+                        "topic": betting_round.topic,
+                        "active": betting_round.active,
+                        "time_left": int(betting_round.time_left()),
                     }
-                )
-
-            response_data = {
-                "active": True,
-                "topic": self.betting_event["topic"],
-                "time_left": int(time_left),
-                "total_points": total_points,
-                "options": options_data,
-            }
-
-            self.log(
-                f"배팅 정보 API 응답: {response_data['topic']} (옵션 {len(options_data)}개)"
+                    for betting_round in self.betting_rounds.all()
+                ]
             )
-            return jsonify(response_data)
 
         @self.flask_app.route("/api/betting/history")
         def betting_history():
             self.log("배팅 이력 API 요청 받음")
-            recent_history = (
-                self.betting_history[-10:] if len(self.betting_history) > 0 else []
-            )
-            return jsonify(recent_history)
+            return jsonify(list(self.recent_betting_rounds))
 
         # 아이템 사용 API 추가
         @self.flask_app.route("/api/item/used")
@@ -271,6 +3178,14 @@ class ChzzkPointsBot:
         self.user_inventory_file = os.path.join(
             self.data_dir, "chzzk_user_inventory.json"
         )
+        self.sqlite_file = os.path.join(self.data_dir, "chzzk_bot_data.db")
+        self.snapshot_file = os.path.join(self.data_dir, "chzzk_snapshot.bin")
+        self.point_ledger_file = os.path.join(
+            self.data_dir, "chzzk_point_ledger.ndjson"
+        )
+        self.point_ledger_archive_file = os.path.join(
+            self.data_dir, "chzzk_point_ledger_archive.ndjson"
+        )
 
         # 템플릿 및 스태틱 디렉토리 생성
         self.templates_dir = os.path.join(
@@ -333,7 +3248,7 @@ class ChzzkPointsBot:
         }
         
         function checkBettingStatus() {
-            fetch('/api/betting/current')
+            fetch('/api/betting/current' + window.location.search)
                 .then(response => response.json())
                 .then(data => {
                     const statusDiv = document.getElementById('status');
@@ -437,7 +3352,7 @@ class ChzzkPointsBot:
         // 배팅 오버레이 업데이트 함수
         function updateBettingOverlay() {
             logDebug("배팅 데이터 업데이트 시도 중...");
-            fetch('/api/betting/current')
+            fetch('/api/betting/current' + window.location.search)
                 .then(response => response.json())
                 .then(data => {
                     logDebug("배팅 데이터 받음: " + JSON.stringify(data).substring(0, 100) + "...");
@@ -865,26 +3780,37 @@ h2 {
 
         # index.html 파일 저장
         index_path = os.path.join(self.templates_dir, "index.html")
-        with open(index_path, "w", encoding="utf-8") as f:
-            f.write(index_html)
+        self.write_if_changed(index_path, index_html)
 
         # overlay.html 파일 저장
         overlay_path = os.path.join(self.templates_dir, "overlay.html")
-        with open(overlay_path, "w", encoding="utf-8") as f:
-            f.write(overlay_html)
+        self.write_if_changed(overlay_path, overlay_html)
 
         # styles.css 파일 저장
         if not os.path.exists(self.static_dir):
             os.makedirs(self.static_dir)
 
         styles_path = os.path.join(self.static_dir, "styles.css")
-        with open(styles_path, "w", encoding="utf-8") as f:
-            f.write(styles_css)
+        self.write_if_changed(styles_path, styles_css)
 
         # overlay.css 파일 저장
         overlay_css_path = os.path.join(self.static_dir, "overlay.css")
-        with open(overlay_css_path, "w", encoding="utf-8") as f:
-            f.write(overlay_css)
+        self.write_if_changed(overlay_css_path, overlay_css)
+
+    def write_if_changed(self, path, content):
+        """내용의 해시가 기존 파일과 다를 때만 파일 기록 (기록했으면 True)"""
+        encoded = content.encode("utf-8")
+        if os.path.exists(path):
+            with open(path, "rb") as f:
+                if (
+                    hashlib.sha256(f.read()).digest()
+                    == hashlib.sha256(encoded).digest()
+                ):
+                    return False
+
+        with open(path, "wb") as f:
+            f.write(encoded)
+        return True
 
     def create_ui(self):
         main_frame = ttk.Notebook(self.root)
@@ -1017,6 +3943,25 @@ h2 {
         self.total_bets_label = ttk.Label(stats_frame, text="총 배팅 이벤트: 0")
         self.total_bets_label.pack(anchor="w", padx=10, pady=5)
 
+        self.reward_wheel_label = ttk.Label(
+            stats_frame, text="보상 쿨다운: 대기 0명 / 1분 내 0명"
+        )
+        self.reward_wheel_label.pack(anchor="w", padx=10, pady=5)
+
+        self.chat_queue_label = ttk.Label(
+            stats_frame, text="채팅 큐: 대기 0 / 처리 0 / 드롭 0"
+        )
+        self.chat_queue_label.pack(anchor="w", padx=10, pady=5)
+
+        self.api_latency_label = ttk.Label(stats_frame, text="API 지연: -")
+        self.api_latency_label.pack(anchor="w", padx=10, pady=5)
+
+        self.chat_breaker_label = ttk.Label(stats_frame, text="채팅 전송 상태: 정상")
+        self.chat_breaker_label.pack(anchor="w", padx=10, pady=5)
+
+        self.persistence_label = ttk.Label(stats_frame, text="자동 저장: -")
+        self.persistence_label.pack(anchor="w", padx=10, pady=5)
+
         event_frame = ttk.LabelFrame(parent, text="이벤트")
         event_frame.pack(fill="x", padx=10, pady=10)
 
@@ -1160,6 +4105,60 @@ h2 {
             value=self.show_point_messages
         )
 
+        # 채팅 처리 설정
+        perf_settings_frame = ttk.LabelFrame(parent, text="채팅 처리 설정")
+        perf_settings_frame.pack(fill="x", padx=10, pady=10)
+
+        ttk.Label(perf_settings_frame, text="처리 워커 수:").grid(
+            row=0, column=0, sticky="w", padx=10, pady=5
+        )
+        self.chat_worker_count_entry = ttk.Entry(perf_settings_frame, width=10)
+        self.chat_worker_count_entry.grid(row=0, column=1, sticky="w", padx=10, pady=5)
+        self.chat_worker_count_entry.insert(0, str(self.chat_worker_count))
+
+        ttk.Label(perf_settings_frame, text="대기열 크기:").grid(
+            row=0, column=2, sticky="w", padx=10, pady=5
+        )
+        self.chat_queue_size_entry = ttk.Entry(perf_settings_frame, width=10)
+        self.chat_queue_size_entry.grid(row=0, column=3, sticky="w", padx=10, pady=5)
+        self.chat_queue_size_entry.insert(0, str(self.chat_queue_size))
+
+        ttk.Label(perf_settings_frame, text="채팅 전송 속도 (초당):").grid(
+            row=1, column=0, sticky="w", padx=10, pady=5
+        )
+        self.chat_send_rate_entry = ttk.Entry(perf_settings_frame, width=10)
+        self.chat_send_rate_entry.grid(row=1, column=1, sticky="w", padx=10, pady=5)
+        self.chat_send_rate_entry.insert(0, str(self.chat_send_rate))
+
+        # 포인트 획득 요약 메시지 설정
+        digest_frame = ttk.LabelFrame(parent, text="포인트 획득 요약 메시지")
+        digest_frame.pack(fill="x", padx=10, pady=10)
+
+        self.point_digest_enabled_var = tk.BooleanVar(value=self.point_digest_enabled)
+        ttk.Checkbutton(
+            digest_frame,
+            text="포인트 획득 메시지를 모아서 요약 전송",
+            variable=self.point_digest_enabled_var,
+        ).grid(row=0, column=0, columnspan=2, sticky="w", padx=10, pady=5)
+
+        self.point_digest_jackpot_var = tk.BooleanVar(
+            value=self.point_digest_jackpot_immediate
+        )
+        ttk.Checkbutton(
+            digest_frame,
+            text="잭팟은 즉시 전송",
+            variable=self.point_digest_jackpot_var,
+        ).grid(row=0, column=2, sticky="w", padx=10, pady=5)
+
+        ttk.Label(digest_frame, text="요약 주기 (초):").grid(
+            row=1, column=0, sticky="w", padx=10, pady=5
+        )
+        self.point_digest_window_entry = ttk.Entry(digest_frame, width=10)
+        self.point_digest_window_entry.grid(
+            row=1, column=1, sticky="w", padx=10, pady=5
+        )
+        self.point_digest_window_entry.insert(0, str(self.point_digest_window))
+
         # 오버레이 서버 설정
         server_frame = ttk.LabelFrame(parent, text="오버레이 서버 설정")
         server_frame.pack(fill="x", padx=10, pady=10)
@@ -1216,9 +4215,44 @@ h2 {
         path_label = ttk.Label(path_frame, text=self.data_dir, foreground="blue")
         path_label.grid(row=0, column=1, columnspan=2, sticky="w", padx=10, pady=5)
 
-        ttk.Button(path_frame, text="폴더 열기", command=self.open_data_folder).grid(
-            row=1, column=0, sticky="w", padx=10, pady=5
+        ttk.Button(path_frame, text="폴더 열기", command=self.open_data_folder).grid(
+            row=1, column=0, sticky="w", padx=10, pady=5
+        )
+
+        ttk.Label(path_frame, text="저장 방식:").grid(
+            row=2, column=0, sticky="w", padx=10, pady=5
+        )
+        self.storage_backend_var = tk.StringVar(value=self.storage_backend)
+        ttk.Combobox(
+            path_frame,
+            textvariable=self.storage_backend_var,
+            values=["json", "sqlite", "binary"],
+            state="readonly",
+            width=10,
+        ).grid(row=2, column=1, sticky="w", padx=10, pady=5)
+        ttk.Label(path_frame, text="(다음 실행 시 적용)").grid(
+            row=2, column=2, sticky="w", padx=10, pady=5
+        )
+
+        ttk.Button(
+            path_frame, text="JSON으로 내보내기", command=self.export_json_data
+        ).grid(row=1, column=1, sticky="w", padx=10, pady=5)
+
+        ttk.Label(path_frame, text="자동 저장 주기 (초):").grid(
+            row=3, column=0, sticky="w", padx=10, pady=5
+        )
+        self.persist_interval_entry = ttk.Entry(path_frame, width=10)
+        self.persist_interval_entry.grid(row=3, column=1, sticky="w", padx=10, pady=5)
+        self.persist_interval_entry.insert(0, str(self.persist_interval))
+
+        ttk.Label(path_frame, text="변경 횟수 기준:").grid(
+            row=3, column=2, sticky="w", padx=10, pady=5
         )
+        self.persist_max_changes_entry = ttk.Entry(path_frame, width=10)
+        self.persist_max_changes_entry.grid(
+            row=3, column=3, sticky="w", padx=10, pady=5
+        )
+        self.persist_max_changes_entry.insert(0, str(self.persist_max_changes))
 
         button_frame = ttk.Frame(parent)
         button_frame.pack(fill="x", padx=10, pady=10)
@@ -1447,6 +4481,17 @@ h2 {
         )
         self.current_betting_label.pack(anchor="w", padx=10, pady=5)
 
+        round_select_frame = ttk.Frame(betting_status_frame)
+        round_select_frame.pack(anchor="w", padx=10, pady=5)
+
+        ttk.Label(round_select_frame, text="라운드:").pack(side="left", padx=5)
+        self.round_var = tk.StringVar()
+        self.round_combo = ttk.Combobox(
+            round_select_frame, textvariable=self.round_var, width=40, state="readonly"
+        )
+        self.round_combo.pack(side="left", padx=5)
+        self.round_combo.bind("<<ComboboxSelected>>", self.on_betting_round_selected)
+
         self.betting_time_left_label = ttk.Label(betting_status_frame, text="")
         self.betting_time_left_label.pack(anchor="w", padx=10, pady=5)
 
@@ -1522,9 +4567,21 @@ h2 {
         )
         self.apply_result_button.pack(side="left", padx=5, pady=5)
 
+        # 배팅 결과 정산 진행률
+        self.settlement_progress = ttk.Progressbar(
+            result_frame, length=150, mode="determinate", maximum=100
+        )
+        self.settlement_progress.pack(side="left", padx=5, pady=5)
+        self.settlement_status_label = ttk.Label(result_frame, text="")
+        self.settlement_status_label.pack(side="left", padx=5, pady=5)
+
         ttk.Button(
             result_frame, text="이력 새로고침", command=self.refresh_betting_history
         ).pack(side="right", padx=5, pady=5)
+        ttk.Button(
+            result_frame, text="상세 보기", command=self.view_betting_round
+        ).pack(side="right", padx=5, pady=5)
+        self.history_tree.bind("<Double-1>", lambda e: self.view_betting_round())
 
         self.refresh_betting_history()
 
@@ -1589,6 +4646,7 @@ h2 {
                 "price": price,
                 "description": item_desc,
             }
+            self.shop_index.add(item_id, item_name)
 
             self.shop_tree.insert(
                 "", "end", values=(item_id, item_name, price, item_desc)
@@ -1682,6 +4740,8 @@ h2 {
                 "price": price,
                 "description": new_desc,
             }
+            self.shop_index.add(item_id, new_name)
+            self.inventory_index.rename(item_id, new_name)
 
             self.shop_tree.item(
                 selected_item[0], values=(item_id, new_name, price, new_desc)
@@ -1733,6 +4793,8 @@ h2 {
         if confirm:
             if item_id in self.shop_items:
                 del self.shop_items[item_id]
+            self.shop_index.remove(item_id)
+            self.inventory_index.remove_item(item_id)
 
             users_affected = 0
             for user_id, inventory in self.user_inventory.items():
@@ -1786,17 +4848,15 @@ h2 {
             messagebox.showwarning("경고", "상점에 등록된 아이템이 없습니다.")
             return
 
-        self.send_chat_message("🛒 포인트 상점 아이템 목록 🛒")
-        time.sleep(0.5)
-
+        lines = ["🛒 포인트 상점 아이템 목록 🛒"]
         for item_id, item_data in self.shop_items.items():
-            message = f"[{item_data['name']}] - {item_data['price']}포인트 : {item_data['description']}"
-            self.send_chat_message(message)
-            time.sleep(0.5)
-
-        self.send_chat_message(
+            lines.append(
+                f"[{item_data['name']}] - {item_data['price']}포인트 : {item_data['description']}"
+            )
+        lines.append(
             "🛒 '!상점' 명령어로 언제든지 확인 가능합니다. '!아이템이름'으로 구매할 수 있습니다. 🛒"
         )
+        self.send_chat_lines(lines)
         self.log("상점 아이템 목록이 채팅에 공지되었습니다.")
 
     def view_user_inventory(self):
@@ -1939,6 +4999,7 @@ h2 {
 
                 if current_quantity <= quantity:
                     del self.user_inventory[username][item_id]
+                    self.inventory_index.remove(username, item_id)
                     self.log(
                         f"{username}의 인벤토리에서 '{item_name}' 아이템 완전 삭제"
                     )
@@ -1950,7 +5011,7 @@ h2 {
                         f"{username}의 인벤토리에서 '{item_name}' 아이템 {quantity}개 삭제 (남은 수량: {current_quantity - quantity})"
                     )
 
-                self.save_user_inventory()
+                self.save_user_inventory([username])
 
                 for item in inventory_tree.get_children():
                     inventory_tree.delete(item)
@@ -2007,21 +5068,20 @@ h2 {
         )
 
         if confirm:
-            if username in self.user_points:
-                del self.user_points[username]
-
-            if username in self.user_last_reward:
-                del self.user_last_reward[username]
-
-            if username in self.user_inventory:
-                del self.user_inventory[username]
+            # 포인트, 보상 시간, 인벤토리를 한 번에 삭제
+            with self.points_lock:
+                self.users.remove(username)
+                self.reward_wheel.discard(username)
+                self.inventory_index.drop_user(username)
+                self.betting_rounds.mark_stale()
+                self.point_ledger.append(username, 0, "delete_user")
 
             self.user_tree.delete(selected_item)
             self.update_stats()
             self.log(f"'{username}' 유저가 삭제되었습니다.")
 
-            self.save_user_data()
-            self.save_user_inventory()
+            self.save_user_data([username])
+            self.save_user_inventory([username])
 
             messagebox.showinfo(
                 "알림", f"'{username}' 유저가 성공적으로 삭제되었습니다."
@@ -2066,7 +5126,11 @@ h2 {
                     messagebox.showwarning("경고", "포인트는 0 이상이어야 합니다.")
                     return
 
-                self.user_points[username] = new_points
+                self.change_points(
+                    username,
+                    new_points - self.user_points.get(username, 0),
+                    "admin",
+                )
 
                 self.user_tree.item(
                     selected_item, values=(username, new_points, user_values[2])
@@ -2076,7 +5140,7 @@ h2 {
                     f"'{username}' 유저의 포인트가 {current_points}에서 {new_points}로 수정되었습니다."
                 )
 
-                self.save_user_data()
+                self.save_user_data([username])
 
                 edit_window.destroy()
                 messagebox.showinfo(
@@ -2102,11 +5166,25 @@ h2 {
         edit_window.geometry("{}x{}+{}+{}".format(width, height, x, y))
 
     def log(self, message):
+        """로그 추가 (어느 스레드에서나 호출 가능, 화면에는 UI 스레드에서만 씀)"""
         timestamp = datetime.now().strftime("%H:%M:%S")
-        log_message = f"[{timestamp}] {message}\n"
+        self.log_queue.put(f"[{timestamp}] {message}\n")
+        if threading.current_thread() is threading.main_thread():
+            self.drain_logs()
+
+    def drain_logs(self):
+        """쌓인 로그를 로그 창에 한 번에 표시 (UI 스레드)"""
+        lines = []
+        while True:
+            try:
+                lines.append(self.log_queue.get_nowait())
+            except queue.Empty:
+                break
+        if not lines:
+            return
 
         self.log_text.config(state=tk.NORMAL)
-        self.log_text.insert(tk.END, log_message)
+        self.log_text.insert(tk.END, "".join(lines))
         self.log_text.see(tk.END)
         self.log_text.config(state=tk.DISABLED)
 
@@ -2140,8 +5218,8 @@ h2 {
             "Client-Secret": self.client_secret,
             "Content-Type": "application/json",
         }
-        response = requests.get(
-            "https://openapi.chzzk.naver.com/open/v1/sessions/auth/client",
+        response = self.api_client.get(
+            "/open/v1/sessions/auth/client",
             headers=headers,
         )
         if response.status_code == 200:
@@ -2167,8 +5245,8 @@ h2 {
                 "Authorization": "Bearer " + str(self.access_token),
                 "Content-Type": "application/json",
             }
-            response = requests.post(
-                "https://openapi.chzzk.naver.com/open/v1/sessions/events/subscribe/chat",
+            response = self.api_client.post(
+                "/open/v1/sessions/events/subscribe/chat",
                 params={"sessionKey": self.session_key},
                 headers=headers,
             )
@@ -2191,6 +5269,8 @@ h2 {
 
         self.log(f"채널 {channel_id}에 연결 시도 중...")
 
+        self.start_chat_workers()
+
         try:
             self.sio = socketio.Client()
 
@@ -2264,6 +5344,45 @@ h2 {
     def on_connect_error(self, error):
         self.log(f"SocketIO 연결 오류: {error}")
 
+    def register_commands(self):
+        """채팅 명령어 등록"""
+        router = self.command_router
+        router.register("포인트", self.handle_points_command)
+        router.register("상점", self.handle_shop_command, arg_mode="optional")
+        router.register("아이템", self.handle_inventory_command, arg_mode="optional")
+        router.register("배팅", self.handle_betting_info_command)
+        router.register("사용", self.handle_item_use, arg_mode="required")
+        router.set_numeric_handler(self.handle_numeric_command)
+        router.set_default_handler(self.handle_item_purchase)
+        router.set_chat_handler(self.handle_chat_message)
+
+    def handle_numeric_command(self, user_id, username, content):
+        """!숫자 / !라운드숫자 명령어 처리 (열린 배팅이 있으면 배팅, 아니면 아이템 구매)"""
+        round_id, _ = parse_bet_keyword(content[1:].split(None, 1)[0])
+        betting_round = self.betting_rounds.resolve(round_id)
+        if betting_round is not None and betting_round.active:
+            self.handle_betting_command(betting_round, user_id, username, content)
+            return
+
+        open_rounds = self.betting_rounds.open_rounds()
+        if round_id is None and len(open_rounds) > 1:
+            # 라운드가 여러 개 열려 있으면 어느 라운드인지 물어봄
+            round_ids = ", ".join(betting_round.id for betting_round in open_rounds)
+            self.send_chat_message(
+                f"@{username} 님, 진행 중인 배팅이 여러 개입니다. !{open_rounds[0].id}1 500 처럼 라운드를 함께 입력해주세요. (진행 중: {round_ids})",
+                priority=CHAT_PRIORITY_TRANSACTION,
+            )
+            return
+
+        if betting_round is not None:
+            self.send_chat_message(
+                f"@{username} 님, [{betting_round.id}] 배팅은 이미 마감되었습니다.",
+                priority=CHAT_PRIORITY_TRANSACTION,
+            )
+            return
+
+        self.handle_item_purchase(user_id, username, content[1:].strip())
+
     def on_chat_message(self, data):
         try:
             data = json.loads(data)
@@ -2273,88 +5392,123 @@ h2 {
 
             self.log(f"[채팅] {username}: {content}")
 
-            # 명령어 처리 순서 변경: 먼저 정확한 명령어 체크, 그 다음 배팅 명령어
-            content_stripped = content.strip()
-
-            # 정확한 명령어 먼저 확인
-            if content_stripped == "!포인트":
-                self.handle_points_command(user_id, username)
-            elif content_stripped == "!상점":
-                self.handle_shop_command(user_id, username)
-            elif content_stripped == "!아이템":
-                self.handle_inventory_command(user_id, username)
-            elif content_stripped == "!배팅":
-                self.handle_betting_info_command(user_id, username)
-            # 아이템 사용 명령어 처리 추가
-            elif content_stripped.startswith("!사용 "):
-                self.handle_item_use(user_id, username, content_stripped[4:].strip())
-            # 배팅 명령어 처리 (패턴: !숫자 포인트)
-            elif (
-                self.is_betting_active
-                and content_stripped.startswith("!")
-                and len(content_stripped) > 1
-            ):
-                # 배팅 명령어 패턴 확인 (!숫자 ...)
-                parts = content_stripped[1:].split()
-                if parts and parts[0].isdigit():
-                    self.handle_betting_command(user_id, username, content_stripped)
-                else:
-                    # 패턴이 맞지 않으면 아이템 구매로 처리
-                    self.handle_item_purchase(
-                        user_id, username, content_stripped[1:].strip()
-                    )
-            # 아이템 구매 처리
-            elif content_stripped.startswith("!"):
-                self.handle_item_purchase(
-                    user_id, username, content_stripped[1:].strip()
-                )
-            # 일반 채팅 메시지 처리
+            # 수신 스레드에서는 파싱 후 큐에 넣기만 함
+            if self.chat_workers:
+                if not self.chat_workers.submit(user_id, user_id, username, content):
+                    self.log(f"채팅 대기열이 가득 차 메시지 처리 생략: {username}")
             else:
-                self.handle_chat_message(user_id, username)
+                self.command_router.dispatch(user_id, username, content)
         except Exception as e:
             self.log(f"메시지 처리 오류: {str(e)}")
 
+    def start_chat_workers(self):
+        """채팅 명령 처리 워커 시작"""
+        self.stop_chat_workers()
+        self.chat_workers = ChatWorkerPool(
+            self.command_router.dispatch,
+            worker_count=self.chat_worker_count,
+            queue_size=self.chat_queue_size,
+            on_error=lambda e: self.log(f"메시지 처리 오류: {str(e)}"),
+        )
+        self.chat_workers.start()
+        self.log(
+            f"채팅 처리 워커 시작: {self.chat_worker_count}개 (대기열 {self.chat_queue_size})"
+        )
+
+    def stop_chat_workers(self):
+        """채팅 명령 처리 워커 중지"""
+        if self.chat_workers:
+            self.chat_workers.stop()
+            self.chat_workers = None
+
+    def update_queue_stats(self):
+        """대시보드 채팅 큐 상태 갱신 (1초 주기)"""
+        now = self.reward_clock.now()
+        self.reward_wheel.advance(now)
+        self.reward_wheel_label.config(
+            text=f"보상 쿨다운: 대기 {self.reward_wheel.pending()}명 / 1분 내 {self.reward_wheel.due_within(now, 60)}명"
+        )
+
+        self.refresh_betting_time_left()
+        self.drain_logs()
+
+        if self.user_view_dirty:
+            self.user_view_dirty = False
+            self.refresh_users()
+            self.update_stats()
+
+        if self.chat_workers:
+            stats = self.chat_workers.stats()
+            self.chat_queue_label.config(
+                text=f"채팅 큐: 대기 {stats['depth']} / 처리 {stats['processed']} / 드롭 {stats['dropped']} (워커 {stats['workers']}개) | 전송 대기 {self.chat_sender.pending()} (버림 {self.chat_sender.dropped}, 병합 {self.chat_sender.merged})"
+            )
+
+        breaker = self.chat_sender.breaker
+        if breaker.state == CircuitBreaker.OPEN:
+            breaker_text = f"차단 ({int(breaker.time_until_retry())}초 후 재시도)"
+        elif breaker.state == CircuitBreaker.HALF_OPEN:
+            breaker_text = "재시도 중"
+        else:
+            breaker_text = "정상"
+        self.chat_breaker_label.config(
+            text=f"채팅 전송 상태: {breaker_text} | 보류 {self.chat_sender.spilled()} / 재시도 {self.chat_sender.retried} / 실패 {self.chat_sender.failed}"
+        )
+
+        if hasattr(self, "persistence"):
+            age = self.persistence.last_flush_age()
+            age_text = "없음" if age is None else f"{int(age)}초 전"
+            self.persistence_label.config(
+                text=f"자동 저장: 마지막 {age_text} / 소요 {self.persistence.last_latency * 1000:.1f}ms / 기록 {self.persistence.last_bytes / 1024:.1f}KB / 대기 변경 {self.persistence.pending_changes()}"
+            )
+
+        send_stats = self.api_client.latency_stats().get("/open/v1/chats/send")
+        if send_stats:
+            self.api_latency_label.config(
+                text=f"API 지연 (채팅 전송): 평균 {send_stats['avg_ms']}ms / 최근 {send_stats['last_ms']}ms / 최대 {send_stats['max_ms']}ms (호출 {send_stats['count']}, 오류 {send_stats['errors']})"
+            )
+        self.root.after(1000, self.update_queue_stats)
+
     # 아이템 사용 처리 함수 추가
     def handle_item_use(self, user_id, username, item_name):
         """아이템 사용 명령어 처리"""
-        if user_id not in self.user_inventory:
-            self.send_chat_message(f"@{username} 님은 보유한 아이템이 없습니다.")
+        user = self.users.get(user_id)
+        user_inventory = None if user is None else user.inventory
+        if user_inventory is None:
+            self.send_chat_message(
+                f"@{username} 님은 보유한 아이템이 없습니다.",
+                priority=CHAT_PRIORITY_TRANSACTION,
+            )
             return
 
-        # 입력된 아이템 이름과 일치하는 아이템 찾기
-        item_id = None
-        item_data = None
-        user_inventory = self.user_inventory.get(user_id, {})
-
-        # 정확한 이름 일치 먼저 시도
-        for inv_item_id, inv_item_data in user_inventory.items():
-            if inv_item_id in self.shop_items:
-                shop_item_name = self.shop_items[inv_item_id]["name"]
-                if shop_item_name.lower() == item_name.lower():
-                    item_id = inv_item_id
-                    item_data = self.shop_items[inv_item_id]
-                    break
+        # 유저별 이름 색인으로 보유 아이템 찾기
+        matches = [
+            item_id
+            for item_id in self.inventory_index.find(user_id, item_name)
+            if item_id in user_inventory and item_id in self.shop_items
+        ]
 
-        # 부분 일치로 확장
-        if not item_id:
-            for inv_item_id, inv_item_data in user_inventory.items():
-                if inv_item_id in self.shop_items:
-                    shop_item_name = self.shop_items[inv_item_id]["name"]
-                    if item_name.lower() in shop_item_name.lower():
-                        item_id = inv_item_id
-                        item_data = self.shop_items[inv_item_id]
-                        break
+        if not matches:
+            self.send_chat_message(
+                f"@{username} 님이 '{item_name}' 아이템을 보유하고 있지 않습니다.",
+                priority=CHAT_PRIORITY_TRANSACTION,
+            )
+            return
 
-        if not item_id:
+        if len(matches) > 1:
             self.send_chat_message(
-                f"@{username} 님이 '{item_name}' 아이템을 보유하고 있지 않습니다."
+                f"@{username} 님, '{item_name}'에 해당하는 보유 아이템이 여러 개입니다: {self.format_item_candidates(matches)} 정확한 이름으로 다시 입력해주세요.",
+                priority=CHAT_PRIORITY_TRANSACTION,
             )
             return
 
+        item_id = matches[0]
+        item_data = self.shop_items[item_id]
+
         # 아이템 사용 처리
         if user_inventory[item_id]["quantity"] <= 0:
             self.send_chat_message(
-                f"@{username} 님이 '{item_data['name']}' 아이템을 모두 사용하셨습니다."
+                f"@{username} 님이 '{item_data['name']}' 아이템을 모두 사용하셨습니다.",
+                priority=CHAT_PRIORITY_TRANSACTION,
             )
             return
 
@@ -2364,10 +5518,12 @@ h2 {
         # 아이템 수량이 0이 되면 인벤토리에서 제거
         if user_inventory[item_id]["quantity"] <= 0:
             del user_inventory[item_id]
+            self.inventory_index.remove(user_id, item_id)
 
         # 채팅에 사용 메시지 전송
         self.send_chat_message(
-            f"🎮 @{username} 님이 '{item_data['name']}' 아이템을 사용하였습니다!"
+            f"🎮 @{username} 님이 '{item_data['name']}' 아이템을 사용하였습니다!",
+            priority=CHAT_PRIORITY_TRANSACTION,
         )
 
         # 오버레이에 아이템 사용 알림 표시
@@ -2377,7 +5533,7 @@ h2 {
         self.log(f"{username}님이 '{item_data['name']}' 아이템을 사용했습니다.")
 
         # 데이터 저장
-        self.save_user_inventory()
+        self.persistence.mark_dirty("inventory", [user_id])
 
     # 오버레이에 아이템 사용 알림 표시 함수 추가
     def show_item_used_overlay(self, username, item_name):
@@ -2423,6 +5579,8 @@ h2 {
                 except Exception as e:
                     self.log(f"Socket.IO 연결 종료 중 오류 발생: {str(e)}")
 
+            self.stop_chat_workers()
+
             self.is_connected = False
             self.status_label.config(text="연결 안됨", foreground="red")
             self.connect_button.config(text="연결")
@@ -2434,319 +5592,474 @@ h2 {
             messagebox.showerror("오류", f"연결 해제 중 오류가 발생했습니다: {str(e)}")
 
     def handle_points_command(self, user_id, username):
-        if user_id in self.user_points:
-            points = self.user_points[user_id]
+        user = self.users.get(user_id)
+        if user is not None:
+            points = user.points
             self.send_chat_message(f"@{username} 님의 현재 포인트: {points}점")
             self.log(f"{username}님의 포인트 조회: {points}점")
         else:
             self.send_chat_message(f"@{username} 님은 아직 포인트가 없습니다.")
             self.log(f"{username}님의 포인트 조회: 0점")
 
-    def handle_shop_command(self, user_id, username):
+    def handle_shop_command(self, user_id, username, page_arg=""):
+        # 페이지 번호가 아니면 기존처럼 아이템 구매로 처리
+        if page_arg and not page_arg.isdigit():
+            self.handle_item_purchase(user_id, username, f"상점 {page_arg}")
+            return
+
         if not self.shop_items:
             self.send_chat_message("🛒 현재 상점에 아이템이 없습니다.")
             return
 
-        self.send_chat_message("🛒 포인트 상점 아이템 목록 🛒")
-        time.sleep(0.5)
+        lines = [
+            f"[{item_data['name']}] - {item_data['price']}포인트 : {item_data['description']}"
+            for item_data in self.shop_items.values()
+        ]
+        page_lines, page, total_pages = paginate_chat_lines(
+            lines, int(page_arg) if page_arg else 1
+        )
 
-        for item_id, item_data in self.shop_items.items():
-            message = f"[{item_data['name']}] - {item_data['price']}포인트 : {item_data['description']}"
-            self.send_chat_message(message)
-            time.sleep(0.5)
+        header = "🛒 포인트 상점 아이템 목록 🛒"
+        footer = "🛒 '!아이템이름'으로 아이템을 구매할 수 있습니다. 🛒"
+        if total_pages > 1:
+            header += f" ({page}/{total_pages})"
+            if page < total_pages:
+                footer += f" 다음: '!상점 {page + 1}'"
+
+        self.send_chat_lines([header] + page_lines + [footer])
+        self.log(f"{username}님이 상점 목록을 조회했습니다. ({page}/{total_pages})")
 
-        self.send_chat_message("🛒 '!아이템이름'으로 아이템을 구매할 수 있습니다. 🛒")
-        self.log(f"{username}님이 상점 목록을 조회했습니다.")
+    def handle_inventory_command(self, user_id, username, page_arg=""):
+        # 페이지 번호가 아니면 기존처럼 아이템 구매로 처리
+        if page_arg and not page_arg.isdigit():
+            self.handle_item_purchase(user_id, username, f"아이템 {page_arg}")
+            return
 
-    def handle_inventory_command(self, user_id, username):
-        user_inventory = self.user_inventory.get(user_id, {})
+        user = self.users.get(user_id)
+        user_inventory = None if user is None else user.inventory
 
         if not user_inventory:
             self.send_chat_message(f"@{username} 님은 보유한 아이템이 없습니다.")
             return
 
-        self.send_chat_message(f"🎒 @{username} 님의 보유 아이템 목록 🎒")
-        time.sleep(0.5)
-
+        lines = []
         for item_id, item_data in user_inventory.items():
             item_name = "알 수 없는 아이템"
             if item_id in self.shop_items:
                 item_name = self.shop_items[item_id]["name"]
 
-            message = f"[{item_name}] - {item_data['quantity']}개"
-            self.send_chat_message(message)
-            time.sleep(0.3)
+            lines.append(f"[{item_name}] - {item_data['quantity']}개")
+
+        page_lines, page, total_pages = paginate_chat_lines(
+            lines, int(page_arg) if page_arg else 1
+        )
+
+        header = f"🎒 @{username} 님의 보유 아이템 목록 🎒"
+        if total_pages > 1:
+            header += f" ({page}/{total_pages})"
+        lines = [header] + page_lines
+        if page < total_pages:
+            lines.append(f"다음: '!아이템 {page + 1}'")
 
-        self.log(f"{username}님이 인벤토리를 조회했습니다.")
+        self.send_chat_lines(lines)
+        self.log(f"{username}님이 인벤토리를 조회했습니다. ({page}/{total_pages})")
 
     # 배팅 관련 명령어 및 함수 추가
     def handle_betting_info_command(self, user_id, username):
-        """!배팅 명령어로 현재 배팅 정보 조회"""
-        if not self.is_betting_active:
+        """!배팅 명령어로 진행 중인 배팅 라운드 정보 조회"""
+        open_rounds = self.betting_rounds.open_rounds()
+        if not open_rounds:
             self.send_chat_message("🎲 현재 진행 중인 배팅이 없습니다.")
             return
 
         # 배팅 메시지 설정이 꺼져 있더라도 !배팅 명령어에 대한 응답은 항상 보여줌
-        # 현재 배팅 정보 표시
-        self.send_chat_message(f"🎲 배팅 주제: {self.betting_event['topic']} 🎲")
-        time.sleep(0.3)
-
-        # 남은 시간 계산
-        time_left = self.betting_end_time - datetime.now()
-        minutes_left = int(time_left.total_seconds() / 60)
-        seconds_left = int(time_left.total_seconds() % 60)
-
-        # 옵션 및 배팅 방법 안내
-        self.send_chat_message("📊 현재 배팅 옵션:")
-        for idx, option in enumerate(self.betting_event["options"]):
-            # 현재 배팅 금액과 배당률 계산
-            total_bets = sum(
-                bet["amount"] for bet in self.user_bets.values() if bet["option"] == idx
-            )
-            total_participants = len(
-                [bet for bet in self.user_bets.values() if bet["option"] == idx]
+        lines = []
+        for betting_round in open_rounds:
+            # 남은 시간 계산
+            seconds = betting_round.time_left()
+            lines.append(
+                f"🎲 [{betting_round.id}] {betting_round.topic} (남은 시간: {int(seconds / 60)}분 {int(seconds % 60)}초)"
             )
 
-            message = (
-                f"[{idx+1}] {option} - {total_bets}포인트 ({total_participants}명 참여)"
-            )
-            self.send_chat_message(message)
-            time.sleep(0.3)
+            # 옵션별 현황
+            stats = betting_round.snapshot()
+            for idx, option in enumerate(betting_round.event["options"]):
+                option_stats = stats["options"][idx]
+                lines.append(
+                    f"[{betting_round.id}{idx+1}] {option} - {option_stats['points']}포인트 ({option_stats['participants']}명 참여)"
+                )
 
-        self.send_chat_message(
-            "💰 배팅 방법: !숫자 포인트 (예: !1 포인트 - 1번에 포인트/올인 배팅)"
+        example = open_rounds[0].id
+        lines.append(
+            f"💰 배팅 방법: !라운드숫자 포인트 (예: !{example}1 500 - {example} 라운드 1번에 500포인트/올인 배팅)"
         )
+        self.send_chat_lines(lines)
 
         self.log(f"{username}님이 배팅 정보를 조회했습니다.")
 
-    def handle_betting_command(self, user_id, username, content):
-        """배팅 명령어 처리 (!숫자 포인트)"""
-        if not self.is_betting_active:
-            self.send_chat_message(f"@{username} 님, 현재 진행 중인 배팅이 없습니다.")
-            return
+    def handle_betting_command(self, betting_round, user_id, username, content):
+        """배팅 명령어 처리 (!라운드숫자 포인트, 라운드가 하나면 !숫자 포인트)"""
+        event = betting_round.event
+        round_id = betting_round.id
 
         # 이미 배팅한 유저인지 확인
-        if user_id in self.user_bets:
+        if betting_round.has_bet(user_id):
             self.send_chat_message(
-                f"@{username} 님, 이미 배팅에 참여하셨습니다. 중복 배팅은 불가능합니다."
+                f"@{username} 님, 이미 [{round_id}] 배팅에 참여하셨습니다. 중복 배팅은 불가능합니다.",
+                priority=CHAT_PRIORITY_TRANSACTION,
             )
             return
+        user = self.users.get(user_id)
 
         # 명령어 파싱
         try:
             parts = content[1:].strip().split()
             if len(parts) < 2:
                 self.send_chat_message(
-                    f"@{username} 님, 배팅 형식이 잘못되었습니다. !숫자 포인트 형식으로 배팅해주세요. (예: !1 500)"
+                    f"@{username} 님, 배팅 형식이 잘못되었습니다. !라운드숫자 포인트 형식으로 배팅해주세요. (예: !{round_id}1 500)",
+                    priority=CHAT_PRIORITY_TRANSACTION,
                 )
                 return
 
-            option_num = int(parts[0])
+            option_num = parse_bet_keyword(parts[0])[1]
 
             # 옵션 번호 확인
-            if option_num < 1 or option_num > len(self.betting_event["options"]):
+            if option_num < 1 or option_num > len(event["options"]):
                 self.send_chat_message(
-                    f"@{username} 님, 유효하지 않은 선택지입니다. 1~{len(self.betting_event['options'])} 사이의 번호를 입력해주세요."
+                    f"@{username} 님, 유효하지 않은 선택지입니다. 1~{len(event['options'])} 사이의 번호를 입력해주세요.",
+                    priority=CHAT_PRIORITY_TRANSACTION,
                 )
                 return
 
             # 포인트 확인
             if parts[1].lower() == "올인":
                 # 올인 처리
-                if user_id not in self.user_points or self.user_points[user_id] <= 0:
-                    self.send_chat_message(f"@{username} 님, 배팅할 포인트가 없습니다.")
+                if user is None or user.points <= 0:
+                    self.send_chat_message(
+                        f"@{username} 님, 배팅할 포인트가 없습니다.",
+                        priority=CHAT_PRIORITY_TRANSACTION,
+                    )
                     return
 
-                bet_amount = self.user_points[user_id]
+                bet_amount = user.points
             else:
                 try:
                     bet_amount = int(parts[1])
                 except ValueError:
                     self.send_chat_message(
-                        f"@{username} 님, 유효한 포인트 수량을 입력해주세요."
+                        f"@{username} 님, 유효한 포인트 수량을 입력해주세요.",
+                        priority=CHAT_PRIORITY_TRANSACTION,
                     )
                     return
 
             # 최소 배팅 금액 확인
             if bet_amount < 10:
                 self.send_chat_message(
-                    f"@{username} 님, 최소 배팅 금액은 10포인트입니다."
+                    f"@{username} 님, 최소 배팅 금액은 10포인트입니다.",
+                    priority=CHAT_PRIORITY_TRANSACTION,
                 )
                 return
 
             # 유저 포인트 확인
-            if user_id not in self.user_points:
-                self.user_points[user_id] = 0
+            if user is None:
+                user = self.users.ensure(user_id)
 
-            if bet_amount > self.user_points[user_id]:
+            if bet_amount > user.points:
                 self.send_chat_message(
-                    f"@{username} 님, 보유 포인트가 부족합니다. (보유: {self.user_points[user_id]}점, 필요: {bet_amount}점)"
+                    f"@{username} 님, 보유 포인트가 부족합니다. (보유: {user.points}점, 필요: {bet_amount}점)",
+                    priority=CHAT_PRIORITY_TRANSACTION,
                 )
                 return
 
             # 배팅 처리
-            self.user_points[user_id] -= bet_amount
-            self.user_bets[user_id] = {
+            bet = {
                 "option": option_num - 1,  # 0-based 인덱스로 저장
                 "amount": bet_amount,
                 "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
             }
+            # 포인트를 먼저 차감하고 그 원장 순번을 배팅 기록에 남김
+            # (복구 시 차감이 저장된 배팅만 되살리거나 환불)
+            ledger_ref = betting_round.ledger_ref
+            _, seq = self.change_points_with_seq(
+                user_id, -bet_amount, "bet", ledger_ref
+            )
+            try:
+                placed = betting_round.place(user_id, bet, user.row, seq)
+            except Exception:
+                # 배팅 기록에 실패하면 차감한 포인트를 돌려줌
+                self.change_points(user_id, bet_amount, "bet_refund", ledger_ref)
+                raise
+            if placed != BET_ACCEPTED:
+                # 마감이나 중복 배팅과 겹쳐 거절된 배팅은 바로 환불
+                self.change_points(user_id, bet_amount, "bet_refund", ledger_ref)
+            if placed == BET_CLOSED:
+                self.send_chat_message(
+                    f"@{username} 님, [{round_id}] 배팅은 이미 마감되었습니다.",
+                    priority=CHAT_PRIORITY_TRANSACTION,
+                )
+                return
+            if placed == BET_DUPLICATE:
+                self.send_chat_message(
+                    f"@{username} 님, 이미 [{round_id}] 배팅에 참여하셨습니다. 중복 배팅은 불가능합니다.",
+                    priority=CHAT_PRIORITY_TRANSACTION,
+                )
+                return
 
-            option_name = self.betting_event["options"][option_num - 1]
+            option_name = event["options"][option_num - 1]
 
             # 배팅 메시지 설정에 따라 메시지 표시
             if self.show_betting_messages:
                 self.send_chat_message(
-                    f"💰 @{username} 님이 '{option_name}'에 {bet_amount}포인트를 배팅했습니다! (남은 포인트: {self.user_points[user_id]}점)"
+                    f"💰 @{username} 님이 [{round_id}] '{option_name}'에 {bet_amount}포인트를 배팅했습니다! (남은 포인트: {user.points}점)",
+                    priority=CHAT_PRIORITY_TRANSACTION,
                 )
 
-            # 배팅 현황 업데이트
-            self.update_betting_status()
-            self.save_user_data()
-            self.log(f"{username}님이 '{option_name}'에 {bet_amount}포인트 배팅")
+            # 배팅 현황 업데이트 (UI 스레드에서)
+            self.root.after(0, lambda: self.update_betting_status(round_id))
+            self.log(
+                f"{username}님이 [{round_id}] '{option_name}'에 {bet_amount}포인트 배팅"
+            )
 
         except Exception as e:
             self.log(f"배팅 처리 오류: {str(e)}")
             self.send_chat_message(
-                f"@{username} 님, 배팅 처리 중 오류가 발생했습니다. 다시 시도해주세요."
+                f"@{username} 님, 배팅 처리 중 오류가 발생했습니다. 다시 시도해주세요.",
+                priority=CHAT_PRIORITY_TRANSACTION,
             )
 
+    def format_item_candidates(self, item_ids, limit=5):
+        """애매한 검색어 안내용 아이템 이름 목록"""
+        names = [self.shop_items[item_id]["name"] for item_id in item_ids[:limit]]
+        if len(item_ids) > limit:
+            names.append(f"외 {len(item_ids) - limit}개")
+        return ", ".join(names)
+
     def handle_item_purchase(self, user_id, username, item_name):
-        if user_id not in self.user_points:
+        user = self.users.get(user_id)
+        if user is None:
             self.send_chat_message(
-                f"@{username} 님은 포인트가 없습니다. 채팅을 통해 포인트를 모아보세요!"
+                f"@{username} 님은 포인트가 없습니다. 채팅을 통해 포인트를 모아보세요!",
+                priority=CHAT_PRIORITY_TRANSACTION,
             )
             return
 
-        user_points = self.user_points[user_id]
-
-        item_id = None
-        item_data = None
+        user_points = user.points
 
-        for id, data in self.shop_items.items():
-            if data["name"].lower() == item_name.lower():
-                item_id = id
-                item_data = data
-                break
-
-        if not item_data:
-            for id, data in self.shop_items.items():
-                if item_name.lower() in data["name"].lower():
-                    item_id = id
-                    item_data = data
-                    break
+        matches = [
+            item_id
+            for item_id in self.shop_index.find(item_name)
+            if item_id in self.shop_items
+        ]
 
-        if not item_data:
+        if not matches:
             # 아이템을 찾지 못한 경우
             self.send_chat_message(
-                f"@{username} 님, 상점에서 '{item_name}' 아이템을 찾을 수 없습니다."
+                f"@{username} 님, 상점에서 '{item_name}' 아이템을 찾을 수 없습니다.",
+                priority=CHAT_PRIORITY_TRANSACTION,
+            )
+            return
+
+        if len(matches) > 1:
+            # 여러 아이템이 걸리면 임의로 고르지 않고 후보를 알려줌
+            self.send_chat_message(
+                f"@{username} 님, '{item_name}'에 해당하는 아이템이 여러 개입니다: {self.format_item_candidates(matches)} 정확한 이름으로 다시 입력해주세요.",
+                priority=CHAT_PRIORITY_TRANSACTION,
             )
             return
 
+        item_id = matches[0]
+        item_data = self.shop_items[item_id]
+
         # 포인트 확인
         if user_points < item_data["price"]:
             self.send_chat_message(
-                f"@{username} 님, '{item_data['name']}' 아이템을 구매하기 위한 포인트가 부족합니다. (보유: {user_points}점, 필요: {item_data['price']}점)"
+                f"@{username} 님, '{item_data['name']}' 아이템을 구매하기 위한 포인트가 부족합니다. (보유: {user_points}점, 필요: {item_data['price']}점)",
+                priority=CHAT_PRIORITY_TRANSACTION,
             )
             return
 
-        # 아이템 구매 처리
-        self.user_points[user_id] = user_points - item_data["price"]
-
-        if user_id not in self.user_inventory:
-            self.user_inventory[user_id] = {}
+        # 아이템 구매 처리: 원장은 인벤토리를 기록하지 않으므로 인벤토리를 먼저 저장한 뒤
+        # 포인트를 차감 (사이에 종료되면 아이템만 받고 포인트는 남는 쪽으로 복구됨)
+        inventory = user.inventory
+        if inventory is None:
+            inventory = user.inventory = {}
 
         current_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
 
-        if item_id in self.user_inventory[user_id]:
-            self.user_inventory[user_id][item_id]["quantity"] += 1
+        previous = inventory.get(item_id)
+        if previous is not None:
+            inventory[item_id] = dict(previous, quantity=previous["quantity"] + 1)
         else:
-            self.user_inventory[user_id][item_id] = {
+            inventory[item_id] = {
                 "quantity": 1,
                 "purchase_date": current_time,
             }
+            self.inventory_index.add(user_id, item_id, item_data["name"])
+
+        try:
+            self.persistence.write_now("inventory", [user_id])
+        except Exception as e:
+            if previous is not None:
+                inventory[item_id] = previous
+            else:
+                del inventory[item_id]
+                self.inventory_index.remove(user_id, item_id)
+                if not inventory:
+                    user.inventory = None
+            self.log(f"아이템 구매 저장 오류: {str(e)}")
+            self.send_chat_message(
+                f"@{username} 님, '{item_data['name']}' 구매를 처리하지 못했습니다. 잠시 후 다시 시도해주세요.",
+                priority=CHAT_PRIORITY_TRANSACTION,
+            )
+            return
+
+        remaining = self.change_points(
+            user_id, -item_data["price"], "purchase", item_id
+        )
+        self.point_ledger.commit()
 
         self.send_chat_message(
-            f"🎉 @{username} 님이 '{item_data['name']}'을(를) 구매했습니다! (남은 포인트: {self.user_points[user_id]}점)"
+            f"🎉 @{username} 님이 '{item_data['name']}'을(를) 구매했습니다! (남은 포인트: {remaining}점)",
+            priority=CHAT_PRIORITY_TRANSACTION,
         )
 
         self.log(
             f"{username}님이 '{item_data['name']}' 아이템을 {item_data['price']}포인트에 구매했습니다."
         )
-        self.save_user_data()
-        self.save_user_inventory()
-        self.refresh_users()
+        self.user_view_dirty = True
 
     def handle_chat_message(self, user_id, username):
-        now = datetime.now()
-
-        if user_id not in self.user_points:
-            self.user_points[user_id] = 0
-            self.user_last_reward[user_id] = now - timedelta(
-                minutes=self.cooldown_minutes + 1
-            )
-            self.refresh_users()
-
-        last_reward = self.user_last_reward.get(user_id, datetime.min)
-        time_diff = now - last_reward
-
-        if time_diff.total_seconds() >= self.cooldown_minutes * 60:
-            if random.randint(1, 100) <= self.jackpot_chance:
+        now = self.reward_clock.now()
+        cooldown = self.cooldown_minutes * 60
+
+        user = self.users.get(user_id)
+        if user is None:
+            user = self.users.ensure(user_id)
+            user.last_reward_epoch = now - cooldown - 60
+            self.user_view_dirty = True
+
+        last_reward = user.last_reward_epoch
+        if last_reward is None or now - last_reward >= cooldown:
+            jackpot = random.randint(1, 100) <= self.jackpot_chance
+            if jackpot:
                 points = int(self.jackpot_points * self.point_multiplier)
-                # 포인트 메시지 표시 설정 적용
-                if self.show_point_messages:
-                    self.send_chat_message(
-                        f"🎉 {username}님 축하합니다! 잭팟 {points}포인트를 획득하셨습니다!"
-                    )
+                message = (
+                    f"🎉 {username}님 축하합니다! 잭팟 {points}포인트를 획득하셨습니다!"
+                )
             else:
                 points = int(
                     random.randint(self.min_points, self.max_points)
                     * self.point_multiplier
                 )
-                # 포인트 메시지 표시 설정 적용
-                if self.show_point_messages:
+                message = f"✨ {username}님이 {points}포인트를 획득했습니다!"
+
+            # 포인트 메시지 표시 설정 적용 (요약 모드면 모아서 전송)
+            # 잭팟 안내는 대기열이 밀려도 버려지지 않도록 일반 안내 우선순위로 전송
+            if self.show_point_messages:
+                if not self.point_digest_enabled:
                     self.send_chat_message(
-                        f"✨ {username}님이 {points}포인트를 획득했습니다!"
+                        message,
+                        priority=(
+                            CHAT_PRIORITY_INFO if jackpot else CHAT_PRIORITY_COSMETIC
+                        ),
                     )
+                elif jackpot and self.point_digest_jackpot_immediate:
+                    self.send_chat_message(message, priority=CHAT_PRIORITY_INFO)
+                    self.point_digest.add(username, points)
+                else:
+                    self.point_digest.add(username, points, jackpot)
 
-            self.user_points[user_id] = self.user_points.get(user_id, 0) + points
-            self.user_last_reward[user_id] = now
+            user.last_reward_epoch = now
+            self.reward_wheel.schedule(user_id, now + cooldown)
+            total = self.change_points(
+                user_id, points, "jackpot" if jackpot else "chat"
+            )
 
             # 로그에는 항상 기록
-            self.log(
-                f"{username}님에게 {points}포인트 지급 (총 {self.user_points[user_id]}점)"
-            )
-            self.refresh_users()
-            self.update_stats()
+            self.log(f"{username}님에게 {points}포인트 지급 (총 {total}점)")
+            self.user_view_dirty = True
+
+    def schedule_point_digest(self):
+        """포인트 획득 요약 메시지 예약 (스케줄러 스레드에서 전송)"""
+        self.scheduler.call_later(self.point_digest_window, self.flush_point_digest)
+
+    def flush_point_digest(self):
+        """모인 포인트 획득 내역을 요약해 채팅에 전송하고 다음 요약 예약"""
+        try:
+            self.send_point_digest()
+        finally:
+            self.schedule_point_digest()
 
-    def send_chat_message(self, message):
+    def send_point_digest(self):
+        """모인 포인트 획득 내역을 요약해 채팅에 전송 (보낸 메시지 핸들, 없으면 None)"""
+        try:
+            message = self.point_digest.flush(self.point_digest_window)
+            if message and self.is_connected:
+                return self.send_chat_message(message)
+        except Exception as e:
+            self.log(f"포인트 요약 메시지 오류: {str(e)}")
+        return None
+
+    def send_chat_message(self, message, priority=CHAT_PRIORITY_INFO):
+        """채팅 메시지를 우선순위 대기열에 추가하고 핸들 반환"""
         if not self.is_connected:
             self.log("메시지 전송 실패: 연결되어 있지 않음")
-            return
+            handle = ChatSendHandle(message, priority)
+            handle.set_result(False)
+            return handle
 
-        try:
-            headers = {
-                "Authorization": f"Bearer {self.access_token}",
-                "Content-Type": "application/json",
-            }
+        return self.chat_sender.send(message, priority)
 
-            payload = {"channelId": self.channel_id, "message": message}
+    def send_chat_lines(self, lines, priority=CHAT_PRIORITY_INFO):
+        """여러 줄을 최소 개수의 메시지로 묶어 전송하고 핸들 목록 반환"""
+        return [
+            self.send_chat_message(message, priority)
+            for message in pack_chat_lines(lines)
+        ]
 
-            response = requests.post(
-                "https://openapi.chzzk.naver.com/open/v1/chats/send",
-                headers=headers,
-                json=payload,
-            )
+    def post_chat_message(self, message):
+        """채팅 메시지 실제 전송 (전송 스레드에서 호출, 실패 시 ChzzkApiError)"""
+        headers = {
+            "Authorization": f"Bearer {self.access_token}",
+            "Content-Type": "application/json",
+        }
 
-            if response.status_code == 200:
-                self.log(f"[봇] {message}")
-            else:
-                self.log(
-                    f"메시지 전송 실패: 상태 코드 {response.status_code}, 응답: {response.text}"
-                )
+        payload = {"channelId": self.channel_id, "message": message}
 
-        except Exception as e:
-            self.log(f"메시지 전송 오류: {str(e)}")
+        response = self.api_client.post(
+            "/open/v1/chats/send",
+            headers=headers,
+            json=payload,
+        )
+
+        if response.status_code == 200:
+            self.log(f"[봇] {message}")
+            return True
+
+        retry_after = None
+        try:
+            retry_after = float(response.headers.get("Retry-After", ""))
+        except ValueError:
+            pass
+
+        raise ChzzkApiError(
+            f"상태 코드 {response.status_code}, 응답: {response.text}",
+            status_code=response.status_code,
+            retryable=response.status_code == 429 or response.status_code >= 500,
+            retry_after=retry_after,
+            auth=response.status_code in (401, 403),
+        )
+
+    def on_chat_breaker_change(self, state):
+        """채팅 전송 회로 차단기 상태 변경 로그"""
+        if state == CircuitBreaker.OPEN:
+            self.log(
+                "채팅 전송 실패가 계속되어 전송을 일시 중단하고 메시지를 보류합니다."
+            )
+        elif state == CircuitBreaker.HALF_OPEN:
+            self.log("채팅 전송 재시도 중...")
+        else:
+            self.log("채팅 전송이 정상화되었습니다.")
 
     def toggle_event(self):
         current_multiplier = float(self.multiplier_var.get())
@@ -2772,12 +6085,29 @@ h2 {
         for item in self.user_tree.get_children():
             self.user_tree.delete(item)
 
-        for user_id, points in self.user_points.items():
-            username = user_id
-            last_reward = self.user_last_reward.get(user_id, datetime.min)
-            last_reward_str = last_reward.strftime("%Y-%m-%d %H:%M:%S")
-
-            self.user_tree.insert("", "end", values=(username, points, last_reward_str))
+        for user_id, points, last_reward_str in self.user_rows():
+            self.user_tree.insert("", "end", values=(user_id, points, last_reward_str))
+
+    def user_rows(self):
+        """유저 목록 표시용 (유저 ID, 포인트, 마지막 보상 시간 문자열)"""
+        table = self.users
+        no_time = UserTable.NO_TIME
+        formatted = {}
+        rows = []
+        for user_id, row in list(table.rows.items()):
+            last_reward = table.last_rewards[row]
+            # 같은 시각은 한 번만 변환
+            text = formatted.get(last_reward)
+            if text is None:
+                if last_reward == no_time:
+                    text = datetime.min.strftime("%Y-%m-%d %H:%M:%S")
+                else:
+                    text = time.strftime(
+                        "%Y-%m-%d %H:%M:%S", time.localtime(last_reward)
+                    )
+                formatted[last_reward] = text
+            rows.append((user_id, table.points[row], text))
+        return rows
 
     def search_user(self):
         search_term = self.search_var.get().lower()
@@ -2785,19 +6115,15 @@ h2 {
         for item in self.user_tree.get_children():
             self.user_tree.delete(item)
 
-        for user_id, points in self.user_points.items():
+        for user_id, points, last_reward_str in self.user_rows():
             if search_term in user_id.lower():
-                username = user_id
-                last_reward = self.user_last_reward.get(user_id, datetime.min)
-                last_reward_str = last_reward.strftime("%Y-%m-%d %H:%M:%S")
-
                 self.user_tree.insert(
-                    "", "end", values=(username, points, last_reward_str)
+                    "", "end", values=(user_id, points, last_reward_str)
                 )
 
     def update_stats(self):
-        total_users = len(self.user_points)
-        total_points = sum(self.user_points.values())
+        total_users = len(self.users)
+        total_points = self.users.total_points()
         total_items = len(self.shop_items)
         total_bets = len(self.betting_history)
 
@@ -2858,6 +6184,7 @@ h2 {
                     self.jackpot_chance_entry.delete(0, tk.END)
                     self.jackpot_chance_entry.insert(0, "5")
 
+                previous_cooldown = self.cooldown_minutes
                 try:
                     self.cooldown_minutes = int(self.cooldown_entry.get())
                 except ValueError:
@@ -2866,6 +6193,91 @@ h2 {
                     self.cooldown_minutes = 10
                     self.cooldown_entry.delete(0, tk.END)
                     self.cooldown_entry.insert(0, "10")
+                if self.cooldown_minutes != previous_cooldown:
+                    self.rebuild_reward_wheel()
+
+                try:
+                    self.chat_worker_count = max(
+                        1, int(self.chat_worker_count_entry.get())
+                    )
+                except ValueError:
+                    if not silent:
+                        self.log("처리 워커 수 값이 올바르지 않습니다. 기본값 4 사용")
+                    self.chat_worker_count = 4
+                    self.chat_worker_count_entry.delete(0, tk.END)
+                    self.chat_worker_count_entry.insert(0, "4")
+
+                try:
+                    self.chat_queue_size = max(1, int(self.chat_queue_size_entry.get()))
+                except ValueError:
+                    if not silent:
+                        self.log("대기열 크기 값이 올바르지 않습니다. 기본값 1000 사용")
+                    self.chat_queue_size = 1000
+                    self.chat_queue_size_entry.delete(0, tk.END)
+                    self.chat_queue_size_entry.insert(0, "1000")
+
+                try:
+                    self.chat_send_rate = float(self.chat_send_rate_entry.get())
+                    if self.chat_send_rate <= 0:
+                        raise ValueError
+                except ValueError:
+                    if not silent:
+                        self.log(
+                            "채팅 전송 속도 값이 올바르지 않습니다. 기본값 2.0 사용"
+                        )
+                    self.chat_send_rate = 2.0
+                    self.chat_send_rate_entry.delete(0, tk.END)
+                    self.chat_send_rate_entry.insert(0, "2.0")
+                self.chat_sender.set_rate(self.chat_send_rate)
+
+                self.storage_backend = self.storage_backend_var.get()
+
+                try:
+                    self.persist_interval = max(
+                        1, int(self.persist_interval_entry.get())
+                    )
+                except ValueError:
+                    if not silent:
+                        self.log("자동 저장 주기 값이 올바르지 않습니다. 기본값 5 사용")
+                    self.persist_interval = 5
+                    self.persist_interval_entry.delete(0, tk.END)
+                    self.persist_interval_entry.insert(0, "5")
+
+                try:
+                    self.persist_max_changes = max(
+                        1, int(self.persist_max_changes_entry.get())
+                    )
+                except ValueError:
+                    if not silent:
+                        self.log(
+                            "변경 횟수 기준 값이 올바르지 않습니다. 기본값 100 사용"
+                        )
+                    self.persist_max_changes = 100
+                    self.persist_max_changes_entry.delete(0, tk.END)
+                    self.persist_max_changes_entry.insert(0, "100")
+
+                if hasattr(self, "persistence"):
+                    self.persistence.interval = self.persist_interval
+                    self.persistence.max_changes = self.persist_max_changes
+
+                # 토큰이 갱신되었을 수 있으므로 전송 차단 해제
+                self.chat_sender.reset_breaker()
+
+                try:
+                    self.point_digest_window = int(self.point_digest_window_entry.get())
+                    if self.point_digest_window < 5:
+                        raise ValueError
+                except ValueError:
+                    if not silent:
+                        self.log("요약 주기 값이 올바르지 않습니다. 기본값 60 사용")
+                    self.point_digest_window = 60
+                    self.point_digest_window_entry.delete(0, tk.END)
+                    self.point_digest_window_entry.insert(0, "60")
+
+                self.point_digest_enabled = self.point_digest_enabled_var.get()
+                self.point_digest_jackpot_immediate = (
+                    self.point_digest_jackpot_var.get()
+                )
 
                 # 설정 탭의 메시지 표시 체크박스 값 가져오기 (안전 검사 추가)
                 if hasattr(self, "settings_show_point_messages_var"):
@@ -2930,6 +6342,15 @@ h2 {
                 "show_point_messages": self.show_point_messages,
                 "show_betting_messages": self.show_betting_messages,
                 "flask_port": self.flask_port,
+                "chat_worker_count": self.chat_worker_count,
+                "chat_queue_size": self.chat_queue_size,
+                "chat_send_rate": self.chat_send_rate,
+                "point_digest_enabled": self.point_digest_enabled,
+                "point_digest_window": self.point_digest_window,
+                "point_digest_jackpot_immediate": self.point_digest_jackpot_immediate,
+                "storage_backend": self.storage_backend,
+                "persist_interval": self.persist_interval,
+                "persist_max_changes": self.persist_max_changes,
             }
 
             # 디버깅: 설정 객체 확인 (민감 정보 마스킹)
@@ -3000,6 +6421,18 @@ h2 {
                 self.show_point_messages = settings.get("show_point_messages", True)
                 self.show_betting_messages = settings.get("show_betting_messages", True)
                 self.flask_port = settings.get("flask_port", 5000)
+                self.chat_worker_count = settings.get("chat_worker_count", 4)
+                self.chat_queue_size = settings.get("chat_queue_size", 1000)
+                self.chat_send_rate = settings.get("chat_send_rate", 2.0)
+                self.chat_sender.set_rate(self.chat_send_rate)
+                self.point_digest_enabled = settings.get("point_digest_enabled", False)
+                self.point_digest_window = settings.get("point_digest_window", 60)
+                self.point_digest_jackpot_immediate = settings.get(
+                    "point_digest_jackpot_immediate", True
+                )
+                self.storage_backend = settings.get("storage_backend", "json")
+                self.persist_interval = settings.get("persist_interval", 5)
+                self.persist_max_changes = settings.get("persist_max_changes", 100)
                 self.overlay_url = f"http://localhost:{self.flask_port}/overlay"
 
                 # 디버깅: 클라이언트 ID/시크릿 확인
@@ -3036,6 +6469,25 @@ h2 {
                 self.cooldown_entry.delete(0, tk.END)
                 self.cooldown_entry.insert(0, str(self.cooldown_minutes))
 
+                self.chat_worker_count_entry.delete(0, tk.END)
+                self.chat_worker_count_entry.insert(0, str(self.chat_worker_count))
+
+                self.chat_queue_size_entry.delete(0, tk.END)
+                self.chat_queue_size_entry.insert(0, str(self.chat_queue_size))
+
+                self.chat_send_rate_entry.delete(0, tk.END)
+                self.chat_send_rate_entry.insert(0, str(self.chat_send_rate))
+
+                self.point_digest_enabled_var.set(self.point_digest_enabled)
+                self.storage_backend_var.set(self.storage_backend)
+                self.persist_interval_entry.delete(0, tk.END)
+                self.persist_interval_entry.insert(0, str(self.persist_interval))
+                self.persist_max_changes_entry.delete(0, tk.END)
+                self.persist_max_changes_entry.insert(0, str(self.persist_max_changes))
+                self.point_digest_jackpot_var.set(self.point_digest_jackpot_immediate)
+                self.point_digest_window_entry.delete(0, tk.END)
+                self.point_digest_window_entry.insert(0, str(self.point_digest_window))
+
                 self.multiplier_var.set(str(self.point_multiplier))
 
                 # 서버 포트 설정
@@ -3049,44 +6501,257 @@ h2 {
                 self.show_betting_messages_var.set(self.show_betting_messages)
                 self.settings_show_betting_messages_var.set(self.show_betting_messages)
 
-                self.log("설정이 로드되었습니다.")
+                self.log("설정이 로드되었습니다.")
+            else:
+                self.log("설정 파일을 찾을 수 없습니다. 기본값을 사용합니다.")
+        except Exception as e:
+            self.log(f"설정 로드 오류: {str(e)}")
+            self.log("기본 설정값을 사용합니다.")
+
+    def reset_points(self):
+        """포인트 초기화"""
+        if messagebox.askyesno(
+            "포인트 초기화", "모든 유저의 포인트를 초기화하시겠습니까?"
+        ):
+            with self.points_lock:
+                self.users.reset_points()
+                self.reward_wheel.clear()
+                self.betting_rounds.mark_stale()
+                self.point_ledger.append("*", 0, "reset")
+            self.refresh_users()
+            self.update_stats()
+            self.log("모든 유저의 포인트가 초기화되었습니다.")
+            # 데이터 저장
+            self.save_user_data()
+            messagebox.showinfo("알림", "모든 유저의 포인트가 초기화되었습니다.")
+
+    def open_storage(self):
+        """설정된 저장 방식에 따라 SQLite 저장소 열기 (최초 1회 JSON 가져오기)"""
+        if self.storage_backend == "binary":
+            # 유저/인벤토리만 바이너리 스냅샷 사용 (스냅샷이 없으면 JSON에서 읽음)
+            self.snapshot = BinarySnapshot(self.snapshot_file)
+            self.log(f"바이너리 스냅샷 사용: {self.snapshot_file}")
+            return
+
+        if self.storage_backend != "sqlite":
+            return
+
+        try:
+            self.storage = SqliteStore(self.sqlite_file)
+            self.log(f"SQLite 저장소 사용: {self.sqlite_file}")
+
+            if not self.storage.get_meta("json_imported"):
+                self.import_json_to_storage()
+                self.storage.set_meta("json_imported", datetime.now().isoformat())
+        except Exception as e:
+            self.log(f"SQLite 저장소 열기 오류: {str(e)}")
+            self.log("JSON 저장 방식을 사용합니다.")
+            self.storage = None
+
+    def import_json_to_storage(self):
+        """기존 JSON 데이터 파일을 SQLite 저장소로 가져오기"""
+        self.log("기존 JSON 데이터를 SQLite 저장소로 가져오는 중...")
+
+        if os.path.exists(self.user_data_file):
+            with open(self.user_data_file, "r", encoding="utf-8") as f:
+                user_data = json.load(f)
+            self.storage.save_users(
+                user_data.get("points", {}),
+                user_data.get("last_reward", {}),
+                ledger_seq=user_data.get("ledger_seq", 0),
+            )
+
+        if os.path.exists(self.user_inventory_file):
+            with open(self.user_inventory_file, "r", encoding="utf-8") as f:
+                self.storage.save_inventory(json.load(f))
+
+        if os.path.exists(self.shop_items_file):
+            with open(self.shop_items_file, "r", encoding="utf-8") as f:
+                self.storage.save_shop_items(json.load(f))
+
+        if self.betting_archive.exists():
+            self.betting_archive.load_index()
+            self.storage.save_betting_history(list(self.betting_archive.iter_rounds()))
+        elif os.path.exists(self.betting_results_file):
+            with open(self.betting_results_file, "r", encoding="utf-8") as f:
+                self.storage.save_betting_history(json.load(f))
+
+        self.log("JSON 데이터 가져오기 완료")
+
+    def export_json_data(self):
+        """현재 데이터를 JSON 파일로 내보내기"""
+        try:
+            self.write_user_data_json()
+            self.write_shop_items_json()
+            self.write_user_inventory_json()
+            self.write_betting_history_json()
+            self.log(f"데이터를 JSON으로 내보냈습니다: {self.data_dir}")
+            messagebox.showinfo("내보내기", "데이터를 JSON 파일로 내보냈습니다.")
+        except Exception as e:
+            self.log(f"JSON 내보내기 오류: {str(e)}")
+            messagebox.showerror(
+                "내보내기 오류", f"JSON 내보내기에 실패했습니다: {str(e)}"
+            )
+
+    def format_last_rewards(self):
+        return {
+            user_id: time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(last_reward))
+            for user_id, last_reward in self.user_last_reward.epochs().items()
+        }
+
+    def write_json_file(self, path, data):
+        """임시 파일에 쓴 뒤 교체 (기록한 바이트 수 반환)"""
+        encoded = json.dumps(data, ensure_ascii=False, indent=4).encode("utf-8")
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(encoded)
+        os.replace(tmp_path, path)
+        return len(encoded)
+
+    def write_user_data_json(self):
+        points, last_rewards, seq = self.snapshot_users()
+        user_data = {
+            "points": points,
+            "last_reward": last_rewards,
+            "ledger_seq": seq,
+        }
+        return self.write_json_file(self.user_data_file, user_data)
+
+    def rebuild_reward_wheel(self):
+        """현재 쿨다운 설정으로 보상 대기 휠 다시 구성"""
+        with self.points_lock:
+            last_rewards = self.user_last_reward.epochs()
+        self.reward_wheel.rebuild(
+            last_rewards, self.cooldown_minutes * 60, self.reward_clock.now()
+        )
+
+    def snapshot_users(self, user_ids=None):
+        """포인트와 원장 순번을 함께 복사 (user_ids가 주어지면 해당 유저만)"""
+        with self.points_lock:
+            seq = self.point_ledger.last_seq
+            if user_ids is None:
+                return self.user_points.copy(), self.format_last_rewards(), seq
+
+            points = {}
+            last_rewards = {}
+            for user_id in user_ids:
+                user = self.users.get(user_id)
+                if user is None:
+                    continue
+                points[user_id] = user.points
+                if user.last_reward_epoch is not None:
+                    last_rewards[user_id] = time.strftime(
+                        "%Y-%m-%d %H:%M:%S", time.localtime(user.last_reward_epoch)
+                    )
+            return points, last_rewards, seq
+
+    def store_user_snapshot(self, user_ids=None, progress=None):
+        """유저 포인트 스냅샷 저장 후 필요하면 원장 정리 (기록한 바이트 수 반환)"""
+        with self.store_lock:
+            if self.storage:
+                with self.points_lock:
+                    # 스냅샷 순번 이전의 변경이 빠지지 않도록 대기 중인 변경 표시를 합침
+                    pending = self.persistence.take("users")
+                    if user_ids is None or pending is None:
+                        user_ids = None
+                    else:
+                        user_ids = set(user_ids) | pending
+                    points, last_rewards, seq = self.snapshot_users(user_ids)
+                self.storage.save_users(
+                    points, last_rewards, user_ids, ledger_seq=seq, progress=progress
+                )
+                written = 0
+            elif self.snapshot:
+                # 스냅샷에는 인벤토리도 포함되므로 함께 기록
+                with self.points_lock:
+                    self.persistence.take("users")
+                    self.persistence.take("inventory")
+                    points = self.user_points.copy()
+                    last_rewards = self.user_last_reward.epochs()
+                    seq = self.point_ledger.last_seq
+                written = self.snapshot.write(
+                    points, last_rewards, self.copy_user_inventory(), seq
+                )
             else:
-                self.log("설정 파일을 찾을 수 없습니다. 기본값을 사용합니다.")
-        except Exception as e:
-            self.log(f"설정 로드 오류: {str(e)}")
-            self.log("기본 설정값을 사용합니다.")
+                with self.points_lock:
+                    self.persistence.take("users")
+                    points, last_rewards, seq = self.snapshot_users()
+                written = self.write_json_file(
+                    self.user_data_file,
+                    {"points": points, "last_reward": last_rewards, "ledger_seq": seq},
+                )
 
-    def reset_points(self):
-        """포인트 초기화"""
-        if messagebox.askyesno(
-            "포인트 초기화", "모든 유저의 포인트를 초기화하시겠습니까?"
-        ):
-            self.user_points = {}
-            self.user_last_reward = {}
-            self.refresh_users()
-            self.update_stats()
-            self.log("모든 유저의 포인트가 초기화되었습니다.")
-            # 데이터 저장
-            self.save_user_data()
-            messagebox.showinfo("알림", "모든 유저의 포인트가 초기화되었습니다.")
+            if self.point_ledger.records_in_file >= self.point_ledger.compact_threshold:
+                self.point_ledger.compact(seq)
+            return written
+
+    def change_points(self, user_id, delta, reason, ref=None):
+        """포인트 변경 (원장 기록과 자동 저장 표시를 함께 처리), 변경 후 포인트 반환"""
+        return self.change_points_with_seq(user_id, delta, reason, ref)[0]
+
+    def change_points_with_seq(self, user_id, delta, reason, ref=None):
+        """포인트 변경 후 (변경 후 포인트, 원장 기록 순번) 반환"""
+        with self.points_lock:
+            user = self.users.ensure(user_id)
+            points = user.points + delta
+            user.points = points
+            self.persistence.mark_dirty("users", [user_id])
+            seq = self.point_ledger.append(user_id, delta, reason, ref)
+        return points, seq
+
+    def write_shop_items_json(self):
+        return self.write_json_file(self.shop_items_file, dict(self.shop_items))
+
+    def copy_user_inventory(self):
+        return {
+            user_id: {
+                item_id: dict(item_data) for item_id, item_data in list(items.items())
+            }
+            for user_id, items in list(self.user_inventory.items())
+        }
+
+    def write_user_inventory_json(self):
+        return self.write_json_file(
+            self.user_inventory_file, self.copy_user_inventory()
+        )
 
-    def save_user_data(self):
-        """유저 데이터 저장"""
+    def write_betting_history_json(self):
+        """전체 배팅 이력을 하나의 JSON 파일로 내보내기"""
+        if self.storage:
+            rounds = self.storage.iter_betting_rounds()
+        else:
+            rounds = self.betting_archive.iter_rounds()
+        return self.write_json_file(self.betting_results_file, list(rounds))
+
+    def flush_collection(self, name, user_ids=None):
+        """자동 저장 스레드에서 호출되는 저장 함수 (기록한 바이트 수 반환)"""
+        if name == "users":
+            return self.store_user_snapshot(user_ids)
+        if name == "inventory":
+            if self.storage:
+                self.storage.save_inventory(dict(self.user_inventory), user_ids)
+                return 0
+            if self.snapshot:
+                return self.store_user_snapshot()
+            return self.write_user_inventory_json()
+        raise ValueError(f"알 수 없는 데이터 종류: {name}")
+
+    def save_user_data(self, user_ids=None):
+        """유저 데이터 저장 (SQLite 사용 시 user_ids만 행 단위 저장)"""
         try:
-            self.log(f"유저 데이터 저장 중: {self.user_data_file}")
-            # 유저 포인트 데이터
-            user_data = {
-                "points": self.user_points,
-                "last_reward": {
-                    user_id: time.strftime(
-                        "%Y-%m-%d %H:%M:%S", time.localtime(last_reward.timestamp())
-                    )
-                    for user_id, last_reward in self.user_last_reward.items()
-                },
-            }
+            if self.storage:
+                if user_ids is None:
+                    self.log("유저 데이터 저장 중 (SQLite)")
+                self.store_user_snapshot(user_ids)
+                return True
+
+            if self.snapshot:
+                self.log(f"유저 데이터 저장 중: {self.snapshot_file}")
+                self.store_user_snapshot()
+                return True
 
-            with open(self.user_data_file, "w", encoding="utf-8") as f:
-                json.dump(user_data, f, ensure_ascii=False, indent=4)
+            self.log(f"유저 데이터 저장 중: {self.user_data_file}")
+            self.store_user_snapshot()
 
             self.log("유저 데이터가 성공적으로 저장되었습니다.")
             return True
@@ -3097,34 +6762,67 @@ h2 {
             )
             return False
 
-    def load_user_data(self):
-        """유저 데이터 로드"""
-        try:
-            self.log(f"유저 데이터 로드 중: {self.user_data_file}")
-            if os.path.exists(self.user_data_file):
-                with open(self.user_data_file, "r", encoding="utf-8") as f:
-                    user_data = json.load(f)
-
-                self.user_points = user_data.get("points", {})
+    def read_user_data(self):
+        """유저 데이터 읽기 (스냅샷 이후 원장 기록까지 적용, UI는 건드리지 않음)"""
+        table = UserTable()
+        if self.storage:
+            points, last_reward_data = self.storage.load_users()
+            table.load_dicts(points, parse_reward_times(last_reward_data))
+            snapshot_seq = int(self.storage.get_meta("ledger_seq", 0))
+            source = "SQLite"
+        elif self.snapshot and self.snapshot.exists():
+            # 스냅샷에서 읽은 열을 다시 복사하지 않고 그대로 테이블로 사용
+            user_data = self.snapshot.read()
+            table.load_columns(
+                user_data["user_ids"], user_data["points"], user_data["last_reward"]
+            )
+            snapshot_seq = user_data["ledger_seq"]
+            source = self.snapshot_file
+        elif os.path.exists(self.user_data_file):
+            with open(self.user_data_file, "r", encoding="utf-8") as f:
+                user_data = json.load(f)
+            table.load_dicts(
+                user_data.get("points", {}),
+                parse_reward_times(user_data.get("last_reward", {})),
+            )
+            snapshot_seq = user_data.get("ledger_seq", 0)
+            source = self.user_data_file
+        else:
+            snapshot_seq = 0
+            source = None
 
-                # 마지막 보상 시간 변환
-                last_reward_data = user_data.get("last_reward", {})
-                self.user_last_reward = {}
+        # 스냅샷 이후의 원장 기록 재적용
+        replayed = 0
+        for record in self.point_ledger.read_after(snapshot_seq):
+            PointLedger.apply(table.points_map, record)
+            replayed += 1
+        self.point_ledger.ensure_seq(snapshot_seq)
 
-                for user_id, time_str in last_reward_data.items():
-                    try:
-                        dt = datetime.strptime(time_str, "%Y-%m-%d %H:%M:%S")
-                        self.user_last_reward[user_id] = dt
-                    except:
-                        self.user_last_reward[user_id] = datetime.now()
+        return {"table": table, "source": source, "replayed": replayed}
 
-                self.refresh_users()
-                self.update_stats()
-                self.log("유저 데이터가 로드되었습니다.")
-                return True
+    def load_user_data(self, read=None):
+        """유저 데이터 로드 (read가 주어지면 미리 읽은 결과 사용)"""
+        try:
+            user_data = (read or self.read_user_data)()
+            if user_data["source"]:
+                self.log(f"유저 데이터 로드 중: {user_data['source']}")
             else:
                 self.log("유저 데이터 파일을 찾을 수 없습니다. 빈 데이터로 시작합니다.")
-                return False
+
+            if user_data["replayed"]:
+                self.log(
+                    f"포인트 원장 기록 {user_data['replayed']}건을 다시 적용했습니다."
+                )
+                self.persistence.mark_dirty("users")
+
+            with self.points_lock:
+                self.users.adopt(user_data["table"])
+            self.rebuild_reward_wheel()
+
+            self.refresh_users()
+            self.update_stats()
+            self.log("유저 데이터가 로드되었습니다.")
+            return True
         except Exception as e:
             self.log(f"유저 데이터 로드 오류: {str(e)}")
             self.log("기본 유저 데이터를 사용합니다.")
@@ -3133,10 +6831,12 @@ h2 {
     def save_shop_items(self):
         """상점 아이템 저장"""
         try:
-            self.log(f"상점 아이템 저장 중: {self.shop_items_file}")
-
-            with open(self.shop_items_file, "w", encoding="utf-8") as f:
-                json.dump(self.shop_items, f, ensure_ascii=False, indent=4)
+            if self.storage:
+                self.log("상점 아이템 저장 중 (SQLite)")
+                self.storage.save_shop_items(self.shop_items)
+            else:
+                self.log(f"상점 아이템 저장 중: {self.shop_items_file}")
+                self.write_shop_items_json()
 
             self.log("상점 아이템이 저장되었습니다.")
             return True
@@ -3147,33 +6847,57 @@ h2 {
             )
             return False
 
-    def load_shop_items(self):
-        """상점 아이템 로드"""
+    def read_shop_items(self):
+        """상점 아이템 읽기 (파일이 없으면 None)"""
+        if self.storage:
+            return self.storage.load_shop_items()
+        if os.path.exists(self.shop_items_file):
+            with open(self.shop_items_file, "r", encoding="utf-8") as f:
+                return json.load(f)
+        return None
+
+    def load_shop_items(self, read=None):
+        """상점 아이템 로드 (read가 주어지면 미리 읽은 결과 사용)"""
         try:
-            self.log(f"상점 아이템 로드 중: {self.shop_items_file}")
-            if os.path.exists(self.shop_items_file):
-                with open(self.shop_items_file, "r", encoding="utf-8") as f:
-                    self.shop_items = json.load(f)
-
-                self.log("상점 아이템이 로드되었습니다.")
-                return True
+            if self.storage:
+                self.log("상점 아이템 로드 중 (SQLite)")
             else:
+                self.log(f"상점 아이템 로드 중: {self.shop_items_file}")
+
+            shop_items = (read or self.read_shop_items)()
+            if shop_items is None:
                 self.log("상점 아이템 파일을 찾을 수 없습니다. 빈 데이터로 시작합니다.")
                 self.shop_items = {}
+                self.shop_index.rebuild(self.shop_items)
                 return False
+
+            self.shop_items = shop_items
+            self.shop_index.rebuild(self.shop_items)
+            self.inventory_index.rebuild(self.user_inventory, self.shop_items)
+            self.log("상점 아이템이 로드되었습니다.")
+            return True
         except Exception as e:
             self.log(f"상점 아이템 로드 오류: {str(e)}")
             self.log("기본 상점 아이템을 사용합니다.")
             self.shop_items = {}
+            self.shop_index.rebuild(self.shop_items)
             return False
 
-    def save_user_inventory(self):
-        """유저 인벤토리 저장"""
+    def save_user_inventory(self, user_ids=None):
+        """유저 인벤토리 저장 (SQLite 사용 시 user_ids만 행 단위 저장)"""
         try:
-            self.log(f"유저 인벤토리 저장 중: {self.user_inventory_file}")
+            if self.storage:
+                if user_ids is None:
+                    self.log("유저 인벤토리 저장 중 (SQLite)")
+                self.storage.save_inventory(self.user_inventory, user_ids)
+                return True
 
-            with open(self.user_inventory_file, "w", encoding="utf-8") as f:
-                json.dump(self.user_inventory, f, ensure_ascii=False, indent=4)
+            if self.snapshot:
+                self.store_user_snapshot()
+                return True
+
+            self.log(f"유저 인벤토리 저장 중: {self.user_inventory_file}")
+            self.write_user_inventory_json()
 
             self.log("유저 인벤토리가 성공적으로 저장되었습니다.")
             return True
@@ -3184,26 +6908,46 @@ h2 {
             )
             return False
 
-    def load_user_inventory(self):
-        """유저 인벤토리 로드"""
+    def read_user_inventory(self):
+        """유저 인벤토리 읽기 (파일이 없으면 None)"""
+        if self.storage:
+            return self.storage.load_inventory()
+        if self.snapshot and self.snapshot.exists():
+            return self.snapshot.read_inventory()
+        if os.path.exists(self.user_inventory_file):
+            with open(self.user_inventory_file, "r", encoding="utf-8") as f:
+                return json.load(f)
+        return None
+
+    def load_user_inventory(self, read=None):
+        """유저 인벤토리 로드 (read가 주어지면 미리 읽은 결과 사용)"""
         try:
-            self.log(f"유저 인벤토리 로드 중: {self.user_inventory_file}")
-            if os.path.exists(self.user_inventory_file):
-                with open(self.user_inventory_file, "r", encoding="utf-8") as f:
-                    self.user_inventory = json.load(f)
-
-                self.log("유저 인벤토리가 로드되었습니다.")
-                return True
+            if self.storage:
+                self.log("유저 인벤토리 로드 중 (SQLite)")
+            elif self.snapshot and self.snapshot.exists():
+                self.log(f"유저 인벤토리 로드 중: {self.snapshot_file}")
             else:
+                self.log(f"유저 인벤토리 로드 중: {self.user_inventory_file}")
+
+            user_inventory = (read or self.read_user_inventory)()
+            if user_inventory is None:
                 self.log(
                     "유저 인벤토리 파일을 찾을 수 없습니다. 빈 데이터로 시작합니다."
                 )
-                self.user_inventory = {}
+                self.user_inventory.clear()
+                self.inventory_index.rebuild({}, self.shop_items)
                 return False
+
+            self.user_inventory.clear()
+            self.user_inventory.update(user_inventory)
+            self.inventory_index.rebuild(self.user_inventory, self.shop_items)
+            self.log("유저 인벤토리가 로드되었습니다.")
+            return True
         except Exception as e:
             self.log(f"유저 인벤토리 로드 오류: {str(e)}")
             self.log("기본 유저 인벤토리를 사용합니다.")
-            self.user_inventory = {}
+            self.user_inventory.clear()
+            self.inventory_index.rebuild({}, self.shop_items)
             return False
 
     def settings_toggle_betting_messages(self):
@@ -3219,14 +6963,26 @@ h2 {
         self.save_settings(silent=True)
 
     # 배팅 시스템 메서드
+    def betting_journal_path(self, round_id):
+        """라운드별 배팅 기록 파일 경로"""
+        return os.path.join(self.data_dir, f"chzzk_betting_round_{round_id}.ndjson")
+
+    def selected_betting_round(self):
+        """배팅 탭에서 선택한 라운드 (없으면 None)"""
+        return self.betting_rounds.get(self.selected_round_id)
+
     def start_betting(self):
-        """배팅 이벤트 시작"""
+        """배팅 라운드 시작 (진행 중인 라운드가 있으면 새 라운드로 추가)"""
         if not self.is_connected:
             messagebox.showwarning("경고", "채팅에 연결되어 있지 않습니다.")
             return
 
-        if self.is_betting_active:
-            messagebox.showwarning("경고", "이미 진행 중인 배팅이 있습니다.")
+        round_id = self.betting_rounds.next_id()
+        if round_id is None:
+            messagebox.showwarning(
+                "경고",
+                "더 이상 배팅 라운드를 열 수 없습니다. 진행 중인 라운드를 정산해주세요.",
+            )
             return
 
         # 배팅 주제 가져오기
@@ -3260,130 +7016,219 @@ h2 {
             messagebox.showwarning("경고", "유효한 배팅 시간을 입력해주세요.")
             return
 
-        # 배팅 이벤트 시작
-        self.betting_event = {
+        # 배팅 라운드 시작
+        event = {
+            "round_id": round_id,
             "topic": topic,
             "options": options,
             "start_time": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
         }
+        end_time = datetime.now() + timedelta(minutes=betting_time)
+        journal = BettingJournal(self.betting_journal_path(round_id))
+        journal.begin(event, end_time)
+        self.betting_rounds.add(BettingRound(round_id, event, end_time, journal))
 
-        self.is_betting_active = True
-        self.user_bets = {}  # 배팅 초기화
-        self.betting_end_time = datetime.now() + timedelta(minutes=betting_time)
-
-        # UI 업데이트
-        self.start_betting_button.config(state=tk.DISABLED)
-        self.end_betting_button.config(state=tk.NORMAL)
-        self.current_betting_label.config(text=f"현재 배팅: {topic}")
-
-        # 결과 선택지 콤보박스 업데이트
-        self.result_combo["values"] = options
-
-        # 배팅 상태 트리뷰 초기화
-        for item in self.betting_tree.get_children():
-            self.betting_tree.delete(item)
-
-        for idx, option in enumerate(options):
-            self.betting_tree.insert("", "end", values=(option, "0", "0", "0", "0.00"))
+        # UI 업데이트 (새 라운드를 선택)
+        self.select_betting_round(round_id)
 
-        # 타이머 시작
-        self.update_betting_timer()
+        # 마감과 마감 전 알림 예약
+        self.schedule_betting_round(self.betting_rounds.get(round_id))
 
         # 오버레이 관련 로그 추가
-        self.log(f"오버레이에 배팅 표시 시작: {topic}")
-        self.log(f"오버레이 확인 URL: {self.overlay_url}")
+        self.log(f"오버레이에 배팅 표시 시작: [{round_id}] {topic}")
+        self.log(f"오버레이 확인 URL: {self.overlay_url}?round={round_id}")
 
         # 채팅에 배팅 시작 알림 (메시지 표시 설정에 따라)
         if self.show_betting_messages:
-            self.send_chat_message(f"🎲 배팅 이벤트가 시작되었습니다! 🎲")
-            time.sleep(0.3)
-            self.send_chat_message(f"📢 주제: {topic}")
-            time.sleep(0.3)
+            lines = [
+                f"🎲 [{round_id}] 배팅 이벤트가 시작되었습니다! 🎲",
+                f"📢 주제: {topic}",
+            ]
 
             # 배팅 옵션 안내
-            self.send_chat_message("📊 배팅 선택지:")
+            lines.append("📊 배팅 선택지:")
             for idx, option in enumerate(options):
-                self.send_chat_message(f"[{idx+1}] {option}")
-                time.sleep(0.2)
+                lines.append(f"[{round_id}{idx+1}] {option}")
 
             # 배팅 방법 안내
-            time.sleep(0.3)
-            self.send_chat_message(
-                "💰 배팅 방법: !숫자 포인트 (예: !1 포인트 - 1번에 포인트/올인 배팅)"
+            lines.append(
+                f"💰 배팅 방법: !{round_id}숫자 포인트 (예: !{round_id}1 500 - {round_id} 라운드 1번에 500포인트/올인 배팅)"
             )
+            self.send_chat_lines(lines)
 
         self.log(
-            f"배팅 이벤트 시작: {topic} (선택지: {len(options)}개, 시간: {betting_time}분)"
+            f"배팅 이벤트 시작: [{round_id}] {topic} (선택지: {len(options)}개, 시간: {betting_time}분)"
         )
 
-    def update_betting_timer(self):
-        """배팅 타이머 업데이트"""
-        if not self.is_betting_active:
-            return
+    def schedule_betting_round(self, betting_round):
+        """라운드 마감과 마감 전 채팅 알림을 스케줄러에 등록"""
+        round_id = betting_round.id
+        time_left = betting_round.time_left()
+        close_at = time.monotonic() + time_left
+
+        betting_round.events = [
+            self.scheduler.call_at(close_at, lambda: self.on_betting_deadline(round_id))
+        ]
+        for seconds in BETTING_COUNTDOWN_SECONDS:
+            if time_left > seconds:
+                betting_round.events.append(
+                    self.scheduler.call_at(
+                        close_at - seconds,
+                        lambda seconds=seconds: self.announce_betting_deadline(
+                            round_id, seconds
+                        ),
+                    )
+                )
 
-        now = datetime.now()
-        time_left = self.betting_end_time - now
+    def cancel_betting_round_events(self, betting_round):
+        for event_id in betting_round.events:
+            self.scheduler.cancel(event_id)
+        betting_round.events = []
 
-        # 시간이 다 되면 자동으로 배팅 종료
-        if time_left.total_seconds() <= 0:
-            self.end_betting()
+    def on_betting_deadline(self, round_id):
+        """마감 시각이 되면 배팅 자동 종료 (스케줄러 스레드, 화면 갱신만 UI 스레드로 넘김)
+
+        UI 스레드가 바빠도 마감 시각 이후의 배팅은 받지 않도록 라운드는 여기서 바로 닫습니다.
+        """
+        betting_round = self.betting_rounds.get(round_id)
+        if betting_round is None or not betting_round.close():
             return
+        self.announce_betting_closed(betting_round)
+        self.root.after(0, lambda: self.on_betting_closed(betting_round))
+
+    def announce_betting_closed(self, betting_round):
+        """마감된 라운드의 예약 취소와 채팅 종료 알림"""
+        self.cancel_betting_round_events(betting_round)
+        if self.show_betting_messages:
+            self.send_chat_message(
+                f"🚨 [{betting_round.id}] 배팅이 마감되었습니다! 🚨",
+                priority=CHAT_PRIORITY_DEADLINE,
+            )
 
-        minutes_left = int(time_left.total_seconds() / 60)
-        seconds_left = int(time_left.total_seconds() % 60)
+    def on_betting_closed(self, betting_round):
+        """마감된 라운드 화면 갱신 (UI 스레드)"""
+        self.refresh_betting_rounds()
+        self.log(f"배팅 [{betting_round.id}] '{betting_round.topic}' 종료됨")
+
+    def announce_betting_deadline(self, round_id, seconds):
+        """배팅 마감 전 채팅 알림 (스케줄러 스레드)"""
+        betting_round = self.betting_rounds.get(round_id)
+        if betting_round is None or not betting_round.active:
+            return
+        if self.show_betting_messages:
+            self.send_chat_message(
+                f"⏰ [{round_id}] 배팅 마감까지 {seconds}초 남았습니다!",
+                priority=CHAT_PRIORITY_DEADLINE,
+            )
 
+    def refresh_betting_time_left(self):
+        """선택한 라운드의 남은 시간 표시 (대시보드 갱신 주기에 맞춰 호출)"""
+        betting_round = self.selected_betting_round()
+        if betting_round is None or not betting_round.active:
+            return
+        seconds = betting_round.time_left()
         self.betting_time_left_label.config(
-            text=f"남은 시간: {minutes_left}분 {seconds_left}초"
+            text=f"남은 시간: {int(seconds / 60)}분 {int(seconds % 60)}초"
         )
 
-        # 1분, 30초, 10초 남았을 때 채팅에 알림
-        total_seconds = int(time_left.total_seconds())
-        if self.show_betting_messages and total_seconds in [60, 30, 10]:
-            self.send_chat_message(f"⏰ 배팅 마감까지 {total_seconds}초 남았습니다!")
+    def select_betting_round(self, round_id=None):
+        """배팅 탭에서 보여줄 라운드 선택 (없는 라운드면 마지막 라운드)"""
+        if self.betting_rounds.get(round_id) is None:
+            rounds = self.betting_rounds.all()
+            round_id = rounds[-1].id if rounds else None
+        self.selected_round_id = round_id
+        self.refresh_betting_rounds()
+
+    def on_betting_round_selected(self, event=None):
+        """라운드 콤보박스 선택 처리"""
+        value = self.round_var.get()
+        self.result_var.set("")
+        self.select_betting_round(value.split(" ", 1)[0] if value else None)
+
+    def refresh_betting_rounds(self):
+        """라운드 목록과 선택한 라운드의 현황, 버튼 상태 갱신"""
+        rounds = self.betting_rounds.all()
+        labels = []
+        for betting_round in rounds:
+            if betting_round.settling:
+                state = "정산 중"
+            elif betting_round.active:
+                state = "진행 중"
+            else:
+                state = "결과 대기"
+            labels.append(f"{betting_round.id} - {betting_round.topic} ({state})")
+        self.round_combo["values"] = labels
+
+        open_rounds = [
+            betting_round for betting_round in rounds if betting_round.active
+        ]
+        if open_rounds:
+            self.current_betting_label.config(
+                text="현재 배팅: "
+                + ", ".join(
+                    f"[{betting_round.id}] {betting_round.topic}"
+                    for betting_round in open_rounds
+                )
+            )
+        elif rounds:
+            self.current_betting_label.config(
+                text="결과 적용을 기다리는 배팅이 있습니다."
+            )
+        else:
+            self.current_betting_label.config(text="현재 진행 중인 배팅이 없습니다.")
+
+        betting_round = self.selected_betting_round()
+        if betting_round is None:
+            self.round_var.set("")
+            self.betting_time_left_label.config(text="")
+            self.end_betting_button.config(state=tk.DISABLED)
+            self.result_combo["values"] = []
+            self.result_var.set("")
+            self.result_combo.config(state=tk.DISABLED)
+            self.apply_result_button.config(state=tk.DISABLED)
+            self.update_betting_status()
+            return
 
-        # 1초마다 타이머 업데이트
-        self.betting_timer = self.root.after(1000, self.update_betting_timer)
+        self.round_var.set(labels[rounds.index(betting_round)])
+        self.result_combo["values"] = betting_round.event["options"]
+        waiting = not betting_round.active and not betting_round.settling
+        self.end_betting_button.config(
+            state=tk.NORMAL if betting_round.active else tk.DISABLED
+        )
+        self.result_combo.config(state="readonly" if waiting else tk.DISABLED)
+        self.apply_result_button.config(state=tk.NORMAL if waiting else tk.DISABLED)
 
-    def update_betting_status(self):
-        """배팅 현황 업데이트"""
-        if not self.is_betting_active or not self.betting_event:
+        if betting_round.active:
+            self.refresh_betting_time_left()
+        elif betting_round.settling:
+            self.betting_time_left_label.config(text="정산 중")
+        else:
+            self.betting_time_left_label.config(text="배팅 종료")
+        self.update_betting_status()
+
+    def update_betting_status(self, round_id=None):
+        """선택한 라운드의 배팅 현황 업데이트 (round_id가 선택한 라운드가 아니면 무시)"""
+        betting_round = self.selected_betting_round()
+        if round_id is not None and (
+            betting_round is None or betting_round.id != round_id
+        ):
             return
 
         # 배팅 트리뷰 초기화
         for item in self.betting_tree.get_children():
             self.betting_tree.delete(item)
 
-        # 각 옵션별 총 배팅액 계산
-        option_stats = {}
-        for option_idx in range(len(self.betting_event["options"])):
-            option_stats[option_idx] = {
-                "total_bets": 0,  # 배팅 수
-                "total_points": 0,  # 총 배팅 포인트
-                "participants": 0,  # 참여자 수
-            }
-
-        total_points = 0
-
-        # 각 유저 배팅 정보 처리
-        for user_id, bet_info in self.user_bets.items():
-            option_idx = bet_info["option"]
-            bet_amount = bet_info["amount"]
-
-            option_stats[option_idx]["total_bets"] += 1
-            option_stats[option_idx]["total_points"] += bet_amount
-            option_stats[option_idx]["participants"] += 1
+        if betting_round is None:
+            return
 
-            total_points += bet_amount
+        # 선택지별 합계는 배팅이 들어올 때마다 갱신되어 있음
+        round_stats = betting_round.snapshot()
 
-        # 각 옵션별 배당률 계산 (최소 배당률은 1.0)
-        for option_idx, stats in option_stats.items():
-            if total_points > 0 and stats["total_points"] > 0:
-                # 배당률 = 총 배팅액 / 해당 옵션 배팅액
-                odds = round(total_points / stats["total_points"], 2)
-            else:
-                odds = 0.0
+        for option_idx, stats in enumerate(round_stats["options"]):
+            # 배당률 = 총 배팅액 / 해당 옵션 배팅액
+            odds = round(stats["odds"], 2)
 
-            option_name = self.betting_event["options"][option_idx]
+            option_name = betting_round.event["options"][option_idx]
 
             # 트리뷰에 추가
             self.betting_tree.insert(
@@ -3391,44 +7236,37 @@ h2 {
                 "end",
                 values=(
                     option_name,
-                    stats["total_bets"],
-                    stats["total_points"],
+                    stats["participants"],
+                    stats["points"],
                     stats["participants"],
                     f"{odds:.2f}",
                 ),
             )
 
-    def end_betting(self):
-        """배팅 이벤트 종료"""
-        if not self.is_betting_active:
+    def end_betting(self, round_id=None):
+        """배팅 라운드 마감 (round_id가 없으면 배팅 탭에서 선택한 라운드)"""
+        if round_id is None:
+            betting_round = self.selected_betting_round()
+        else:
+            betting_round = self.betting_rounds.get(round_id)
+        if betting_round is None or not betting_round.close():
             messagebox.showwarning("경고", "진행 중인 배팅이 없습니다.")
             return
 
-        # 타이머 중지
-        if self.betting_timer:
-            self.root.after_cancel(self.betting_timer)
-            self.betting_timer = None
-
-        # 채팅에 배팅 종료 알림
-        if self.show_betting_messages:
-            self.send_chat_message("🚨 배팅이 마감되었습니다! 🚨")
-            time.sleep(0.3)
-
-        # UI 업데이트
-        self.betting_time_left_label.config(text="배팅 종료")
-        self.start_betting_button.config(state=tk.NORMAL)
-        self.end_betting_button.config(state=tk.DISABLED)
-        self.apply_result_button.config(state=tk.NORMAL)
-        self.result_combo.config(state="readonly")
-
-        self.log(f"배팅 '{self.betting_event['topic']}' 종료됨")
+        self.announce_betting_closed(betting_round)
+        self.on_betting_closed(betting_round)
 
     def apply_betting_result(self):
-        """배팅 결과 적용"""
-        if not self.betting_event:
+        """선택한 라운드에 배팅 결과 적용"""
+        betting_round = self.selected_betting_round()
+        if betting_round is None or betting_round.settling:
             messagebox.showwarning("경고", "적용할 배팅 결과가 없습니다.")
             return
 
+        if betting_round.active:
+            messagebox.showwarning("경고", "배팅을 먼저 종료해주세요.")
+            return
+
         # 선택된 결과 확인
         selected_option = self.result_var.get()
         if not selected_option:
@@ -3437,7 +7275,7 @@ h2 {
 
         # 선택지 인덱스 찾기
         selected_idx = -1
-        for idx, option in enumerate(self.betting_event["options"]):
+        for idx, option in enumerate(betting_round.event["options"]):
             if option == selected_option:
                 selected_idx = idx
                 break
@@ -3446,15 +7284,10 @@ h2 {
             messagebox.showwarning("경고", "유효하지 않은 선택지입니다.")
             return
 
-        # 총 배팅액 계산
-        total_points = sum(bet["amount"] for bet in self.user_bets.values())
-
-        # 당첨된 선택지에 배팅한 총액
-        winning_points = sum(
-            bet["amount"]
-            for bet in self.user_bets.values()
-            if bet["option"] == selected_idx
-        )
+        # 총 배팅액과 당첨된 선택지에 배팅한 총액
+        round_stats = betting_round.snapshot()
+        total_points = round_stats["total_points"]
+        winning_points = round_stats["options"][selected_idx]["points"]
 
         # 배당률 계산 (최소 1.0)
         if winning_points > 0:
@@ -3462,127 +7295,420 @@ h2 {
         else:
             odds = 1.0
 
-        # 당첨자 처리
-        winners = []
-        for user_id, bet_info in self.user_bets.items():
-            if bet_info["option"] == selected_idx:
-                # 배팅액 * 배당률로 포인트 지급
-                win_amount = int(bet_info["amount"] * odds)
+        # 정산은 백그라운드에서 진행하고 끝나면 UI 스레드에서 마무리
+        job = {
+            "round": betting_round,
+            "selected_idx": selected_idx,
+            "selected_option": selected_option,
+            "total_points": total_points,
+            "odds": odds,
+            "applied": False,
+            "error": None,
+        }
+        betting_round.settling = True
+        self.refresh_betting_rounds()
+        self.settlement_progress.config(value=0)
+        self.settlement_status_label.config(text=f"[{betting_round.id}] 정산 준비 중")
+        self.log(f"배팅 [{betting_round.id}] '{betting_round.topic}' 결과 정산 시작")
+
+        threading.Thread(
+            target=self.run_settlement_job,
+            args=(job,),
+            name=f"betting-settlement-{betting_round.id}",
+            daemon=True,
+        ).start()
+
+    def report_settlement_progress(self, percent, text):
+        """정산 진행률 표시 (정산 스레드에서 호출)"""
+
+        def update():
+            self.settlement_progress.config(value=percent)
+            self.settlement_status_label.config(text=text)
+
+        self.root.after(0, update)
+
+    def run_settlement_job(self, job):
+        """배팅 정산 작업 (백그라운드 스레드, 결과는 job에 기록)"""
+        betting_round = job["round"]
+        event = betting_round.event
+        tag = f"[{betting_round.id}] "
+        try:
+            # 당첨자 처리 (배팅액 * 배당률을 열 단위로 계산해 한 번에 지급)
+            self.report_settlement_progress(5, tag + "당첨금 계산 중")
+            started = time.perf_counter()
+            with self.points_lock, self.users.lock:
+                settlement = BettingSettlement.from_round(betting_round, self.users)
+                job["paid_points"] = settlement.settle(
+                    self.users, job["selected_idx"], job["odds"]
+                )
+                # 스냅샷 순번과 어긋나지 않도록 지급과 같은 잠금 안에서 원장에 기록
+                ledger_seq = self.point_ledger.append_many(
+                    settlement.winner_ids,
+                    settlement.payout_list(),
+                    "bet_win",
+                    betting_round.ledger_ref,
+                )
+                # 정산 저장 전에 자동 저장이 먼저 돌아도 당첨자가 빠지지 않도록 표시
+                self.persistence.mark_dirty("users", settlement.winner_ids)
+            user_bets = betting_round.copy_bets()
+            job["applied"] = True
+            job["elapsed"] = time.perf_counter() - started
+            job["settlement"] = settlement
+
+            result = {
+                "end_time": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                "winning_option": job["selected_option"],
+                "winning_option_idx": job["selected_idx"],
+                "total_points": job["total_points"],
+                "odds": job["odds"],
+            }
 
-                # 포인트 지급
-                if user_id not in self.user_points:
-                    self.user_points[user_id] = 0
+            # 결과 적용을 먼저 기록하고 원장을 커밋 (재시작 시 원장 순번으로 지급 여부 확인)
+            self.report_settlement_progress(20, tag + "포인트 원장 기록 중")
+            betting_round.journal.settle(result, ledger_seq)
+            self.point_ledger.commit()
+            winners = settlement.winners()
+            job["winners"] = len(winners)
 
-                self.user_points[user_id] += win_amount
+            self.persist_settlement(settlement.winner_ids, 25, 85, tag)
 
-                winners.append(
-                    {
-                        "user_id": user_id,
-                        "bet_amount": bet_info["amount"],
-                        "win_amount": win_amount,
-                    }
-                )
+            # 배팅 이력에 추가 (결과 한 건만 이어서 기록)
+            self.report_settlement_progress(90, tag + "배팅 이력 기록 중")
+            betting_result = self.build_betting_result(
+                event, user_bets, result, winners
+            )
+            try:
+                job["summary"] = self.append_betting_round(betting_result)
+                job["result"] = betting_result
+                betting_round.journal.archive()
+            except Exception as e:
+                job["history_error"] = e
+            betting_round.journal.finish()
+            self.report_settlement_progress(100, tag + "정산 완료")
+        except Exception as e:
+            job["error"] = e
+
+        self.root.after(0, lambda: self.finish_settlement_job(job))
+
+    def build_betting_result(self, event, user_bets, result, winners):
+        """배팅 이력에 저장할 결과 한 건"""
+        return {
+            "round_id": event.get("round_id"),
+            "topic": event["topic"],
+            "options": event["options"],
+            "start_time": event["start_time"],
+            "end_time": result["end_time"],
+            "winning_option": result["winning_option"],
+            "winning_option_idx": result["winning_option_idx"],
+            "total_points": result["total_points"],
+            "odds": result["odds"],
+            "winners": winners,
+            "user_bets": user_bets,
+        }
 
-                self.log(
-                    f"{user_id}님 배팅 당첨: {bet_info['amount']}포인트 배팅, {win_amount}포인트 획득"
+    def persist_settlement(self, user_ids, start, end, tag=""):
+        """정산으로 바뀐 포인트 저장 (SQLite는 나눠 기록하며 진행률 표시)
+
+        원장 순번은 모든 당첨자를 기록한 같은 트랜잭션에서만 올라가므로, 저장 중에
+        종료되어도 다음 실행 때 당첨금 기록이 빠짐없이 다시 적용됩니다.
+        """
+        self.report_settlement_progress(start, tag + "포인트 저장 중")
+        if not self.storage:
+            self.store_user_snapshot()
+        else:
+
+            def progress(done, total):
+                self.report_settlement_progress(
+                    start + (end - start) * done / total,
+                    tag + f"포인트 저장 중 ({done}/{total})",
                 )
 
-        # 배팅 결과 저장
-        betting_result = {
-            "topic": self.betting_event["topic"],
-            "options": self.betting_event["options"],
-            "start_time": self.betting_event["start_time"],
-            "end_time": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-            "winning_option": selected_option,
-            "winning_option_idx": selected_idx,
-            "total_points": total_points,
-            "odds": odds,
-            "winners": winners,
-            "user_bets": self.user_bets,
-        }
+            self.store_user_snapshot(user_ids, progress=progress)
+        self.report_settlement_progress(end, tag + "포인트 저장 완료")
+
+    def finish_settlement_job(self, job):
+        """정산이 끝난 뒤 UI 스레드에서 결과 발표와 라운드 정리"""
+        betting_round = job["round"]
+        round_id = betting_round.id
+
+        if not job["applied"]:
+            # 포인트 지급 전에 실패했으면 다시 시도할 수 있게 둠
+            betting_round.settling = False
+            self.refresh_betting_rounds()
+            self.log(f"배팅 [{round_id}] 정산 오류: {str(job['error'])}")
+            self.settlement_progress.config(value=0)
+            self.settlement_status_label.config(text=f"[{round_id}] 정산 실패")
+            messagebox.showerror(
+                "배팅 정산 오류", f"배팅 결과 정산에 실패했습니다: {str(job['error'])}"
+            )
+            return
+
+        settlement = job["settlement"]
+        selected_idx = job["selected_idx"]
+        odds = job["odds"]
+        winner_count = len(settlement.winner_ids)
+
+        # 당첨자 개별 정보는 한 줄 요약과 상위 당첨자만 로그에 기록
+        self.log(
+            f"배팅 [{round_id}] 정산: 참여 {len(settlement)}명, 당첨 {winner_count}명, 지급 {job['paid_points']}포인트 ({job['elapsed'] * 1000:.1f}ms)"
+        )
+        top_winners = settlement.top_winners(SETTLEMENT_TOP_WINNERS)
+        if top_winners:
+            self.log(
+                f"배팅 [{round_id}] 당첨 상위 {len(top_winners)}명: "
+                + ", ".join(
+                    f"{user_id}({bet_amount}→{win_amount})"
+                    for user_id, bet_amount, win_amount in top_winners
+                )
+            )
 
-        # 배팅 이력에 추가
-        self.betting_history.append(betting_result)
-        self.save_betting_history()
+        if job.get("summary"):
+            self.betting_history.append(job["summary"])
+            self.recent_betting_rounds.append(job["result"])
+        if job.get("history_error"):
+            self.log(f"배팅 이력 저장 오류: {str(job['history_error'])}")
+        if job["error"]:
+            self.log(f"배팅 정산 저장 오류: {str(job['error'])}")
 
         # 채팅에 결과 발표
         if self.show_betting_messages:
-            self.send_chat_message("🎉 배팅 결과가 발표되었습니다! 🎉")
-            time.sleep(0.3)
             self.send_chat_message(
-                f"📢 당첨 선택지: [{selected_idx+1}] {selected_option}"
+                f"🎉 [{round_id}] 배팅 결과가 발표되었습니다! 🎉",
+                priority=CHAT_PRIORITY_TRANSACTION,
+            )
+            self.send_chat_message(
+                f"📢 당첨 선택지: [{selected_idx+1}] {job['selected_option']}",
+                priority=CHAT_PRIORITY_TRANSACTION,
+            )
+            self.send_chat_message(
+                f"💰 배당률: {odds:.2f}배", priority=CHAT_PRIORITY_TRANSACTION
             )
-            time.sleep(0.3)
-            self.send_chat_message(f"💰 배당률: {odds:.2f}배")
-            time.sleep(0.3)
 
             # 당첨자 수만 발표 (개별 당첨자 정보는 표시하지 않음)
-            if winners:
-                self.send_chat_message(f"🏆 당첨자: {len(winners)}명")
-                # 당첨자 개별 정보는 로그에만 기록
-                for winner in sorted(
-                    winners, key=lambda x: x["win_amount"], reverse=True
-                ):
-                    user_id = winner["user_id"]
-                    bet_amount = winner["bet_amount"]
-                    win_amount = winner["win_amount"]
-                    self.log(
-                        f"배팅 당첨자: {user_id} - {bet_amount}포인트 -> {win_amount}포인트 획득"
-                    )
+            if winner_count:
+                self.send_chat_message(
+                    f"🏆 당첨자: {winner_count}명", priority=CHAT_PRIORITY_TRANSACTION
+                )
             else:
-                self.send_chat_message("😢 당첨자가 없습니다.")
+                self.send_chat_message(
+                    "😢 당첨자가 없습니다.", priority=CHAT_PRIORITY_TRANSACTION
+                )
 
-        # 배팅 상태 초기화
-        self.betting_event = None
-        self.is_betting_active = False
-        self.user_bets = {}
-        self.betting_end_time = None
+        # 정산이 끝난 라운드 정리
+        self.betting_rounds.remove(round_id)
 
         # UI 초기화
-        self.current_betting_label.config(text="현재 진행 중인 배팅이 없습니다.")
-        self.betting_time_left_label.config(text="")
-        self.result_combo.config(state=tk.DISABLED)
-        self.apply_result_button.config(state=tk.DISABLED)
+        self.select_betting_round(self.selected_round_id)
+        self.settlement_status_label.config(
+            text=(
+                f"[{round_id}] 정산 완료"
+                if not job["error"]
+                else f"[{round_id}] 저장 일부 실패"
+            )
+        )
 
         # 배팅 이력 새로고침
         self.refresh_betting_history()
 
-        # 유저 포인트 저장
-        self.save_user_data()
+        # 유저 목록 갱신
         self.refresh_users()
+        self.update_stats()
+
+        if job["error"]:
+            messagebox.showerror(
+                "배팅 정산 오류",
+                f"포인트는 지급되었지만 저장 중 오류가 발생했습니다: {str(job['error'])}\n자동 저장에서 다시 시도합니다.",
+            )
+            self.persistence.mark_dirty("users", settlement.winner_ids)
+            return
 
-        self.log("배팅 결과 적용 완료")
-        messagebox.showinfo("알림", "배팅 결과가 성공적으로 적용되었습니다.")
+        self.log(f"배팅 [{round_id}] 결과 적용 완료")
+        messagebox.showinfo(
+            "알림", f"[{round_id}] 배팅 결과가 성공적으로 적용되었습니다."
+        )
 
-    def save_betting_history(self):
-        """배팅 이력 저장"""
+    def restore_betting_rounds(self):
+        """비정상 종료로 남은 배팅 라운드들을 복원하거나 환불"""
+        paths = sorted(
+            os.path.join(self.data_dir, name)
+            for name in os.listdir(self.data_dir)
+            if name.startswith("chzzk_betting_round") and name.endswith(".ndjson")
+        )
+        # 복구 중 환불 기록이 추가되기 전에 원장에 남아 있는 마지막 순번을 확인
+        durable_seq = self.point_ledger.last_seq
+        restored = False
+        for path in paths:
+            restored = self.restore_betting_round(path, durable_seq) or restored
+        if restored:
+            self.select_betting_round(self.selected_round_id)
+        return restored
+
+    def restore_betting_round(self, path, durable_seq):
+        """라운드 기록 파일 하나를 복원하거나 환불 (정산이 반영된 라운드는 정리만 함)"""
+        journal = BettingJournal(path)
         try:
-            self.log(f"배팅 이력 저장 중: {self.betting_results_file}")
+            round_state = journal.load()
+        except Exception as e:
+            self.log(f"배팅 라운드 기록 로드 오류: {str(e)}")
+            return False
+
+        if not round_state:
+            return False
+
+        event = round_state["event"]
+        bets = round_state["bets"]
+
+        settled = round_state["settled"]
+        if settled and settled["ledger_seq"] <= durable_seq:
+            # 당첨금 기록이 원장이나 스냅샷에 남아 있으므로 다시 정산하거나 환불하지 않음
+            if not round_state["archived"]:
+                self.archive_settled_round(event, bets, settled["result"])
+            journal.finish()
+            self.log(f"배팅 '{event['topic']}'은 정산이 완료되어 기록만 정리했습니다.")
+            return False
+        if settled:
+            self.log(
+                f"배팅 '{event['topic']}' 당첨금 기록이 저장되지 않아 결과 적용 대기로 복구합니다."
+            )
 
-            with open(self.betting_results_file, "w", encoding="utf-8") as f:
-                json.dump(self.betting_history, f, ensure_ascii=False, indent=4)
+        # 차감 기록이 원장에 남지 않은 배팅은 포인트가 빠진 적이 없으므로 복구도 환불도 하지 않음
+        # (순번이 없는 이전 형식의 기록은 차감이 저장된 것으로 봄)
+        lost = [
+            user_id
+            for user_id, seq in round_state["bet_seqs"].items()
+            if seq is not None and seq > durable_seq
+        ]
+        for user_id in lost:
+            del bets[user_id]
+        if lost:
+            self.log(
+                f"배팅 '{event['topic']}' 포인트 차감이 저장되지 않은 배팅 {len(lost)}건 제외"
+            )
+        total_points = sum(bet["amount"] for bet in bets.values())
+        self.log(
+            f"종료되지 않은 배팅 발견: {event['topic']} (참여 {len(bets)}명, {total_points}포인트)"
+        )
 
-            self.log("배팅 이력이 성공적으로 저장되었습니다.")
+        if not messagebox.askyesno(
+            "배팅 복구",
+            f"종료되지 않은 배팅 '{event['topic']}'이 있습니다.\n"
+            f"(참여 {len(bets)}명, 총 {total_points}포인트)\n\n"
+            "배팅을 복구하시겠습니까?\n'아니오'를 선택하면 배팅 포인트를 환불합니다.",
+        ):
+            for user_id, bet in bets.items():
+                self.change_points(
+                    user_id, bet["amount"], "bet_refund", betting_ledger_ref(event)
+                )
+            journal.finish()
+            self.refresh_users()
+            self.log(f"배팅 '{event['topic']}' 환불 완료: {len(bets)}명")
             return True
+
+        # 라운드 ID가 없는 이전 기록이나 겹치는 ID는 빈 ID를 새로 배정
+        round_id = event.get("round_id")
+        if not round_id or self.betting_rounds.get(round_id):
+            round_id = self.betting_rounds.next_id()
+            if round_id is None:
+                self.log(f"배팅 '{event['topic']}' 복구 실패: 라운드 수 초과")
+                return False
+            event["round_id"] = round_id
+
+        betting_round = BettingRound(round_id, event, round_state["end_time"], journal)
+        with self.points_lock, self.users.lock:
+            betting_round.load(bets, self.users)
+        self.betting_rounds.add(betting_round)
+
+        if round_state["closed"] or betting_round.end_time <= datetime.now():
+            # 마감된 라운드는 결과 적용 대기 상태로 복원
+            if not round_state["closed"]:
+                journal.close_round()
+            betting_round.active = False
+            self.log(f"배팅 [{round_id}] '{event['topic']}' 복구됨 (결과 적용 대기)")
+        else:
+            self.schedule_betting_round(betting_round)
+            self.log(f"배팅 [{round_id}] '{event['topic']}' 복구됨 (진행 중)")
+        self.selected_round_id = round_id
+        return True
+
+    def archive_settled_round(self, event, bets, result):
+        """정산 후 이력 저장 전에 종료된 라운드의 이력을 배팅 기록으로 다시 만들어 저장"""
+        odds = result["odds"]
+        winners = [
+            {
+                "user_id": user_id,
+                "bet_amount": bet["amount"],
+                "win_amount": int(bet["amount"] * odds),
+            }
+            for user_id, bet in bets.items()
+            if bet["option"] == result["winning_option_idx"]
+        ]
+        entry = self.build_betting_result(event, bets, result, winners)
+        try:
+            self.betting_history.append(self.append_betting_round(entry))
+            self.recent_betting_rounds.append(entry)
+            self.refresh_betting_history()
         except Exception as e:
             self.log(f"배팅 이력 저장 오류: {str(e)}")
-            return False
 
-    def load_betting_history(self):
-        """배팅 이력 로드"""
-        try:
-            self.log(f"배팅 이력 로드 중: {self.betting_results_file}")
+    def append_betting_round(self, entry):
+        """배팅 결과 한 건 저장 후 요약 반환"""
+        if self.storage:
+            return self.storage.append_betting_round(entry)
+        return self.betting_archive.append(entry)
+
+    def load_betting_round(self, summary):
+        """배팅 상세 정보 (유저별 배팅 포함) 읽기"""
+        if self.storage:
+            return self.storage.load_betting_round(summary["id"])
+        return self.betting_archive.load_round(summary)
+
+    def migrate_betting_history_json(self):
+        """기존 단일 JSON 배팅 이력을 세그먼트 보관소로 옮기고 옮긴 개수 반환 (UI는 건드리지 않음)"""
+        with open(self.betting_results_file, "r", encoding="utf-8") as f:
+            history = json.load(f)
+
+        self.betting_archive.import_entries(history)
+        os.replace(self.betting_results_file, self.betting_results_file + ".migrated")
+        return len(history)
+
+    def read_betting_history(self):
+        """배팅 이력 요약과 최근 이력 읽기 (UI는 건드리지 않음)"""
+        migrated = None
+        if self.storage:
+            summaries = self.storage.load_betting_summaries()
+        else:
+            self.betting_archive.load_index()
+            if not self.betting_archive.exists() and os.path.exists(
+                self.betting_results_file
+            ):
+                migrated = self.migrate_betting_history_json()
+            summaries = list(self.betting_archive.summaries)
 
-            if os.path.exists(self.betting_results_file):
-                with open(self.betting_results_file, "r", encoding="utf-8") as f:
-                    self.betting_history = json.load(f)
+        recent = [
+            self.load_betting_round(summary)
+            for summary in summaries[-self.recent_betting_rounds.maxlen :]
+        ]
+        return {"summaries": summaries, "recent": recent, "migrated": migrated}
 
-                self.log(f"배팅 이력 로드 완료: {len(self.betting_history)}개 이벤트")
-                return True
+    def load_betting_history(self, read=None):
+        """배팅 이력 로드 (요약과 최근 이력만 읽음)"""
+        try:
+            if self.storage:
+                self.log("배팅 이력 로드 중 (SQLite)")
             else:
-                self.log("배팅 이력 파일이 없습니다. 새로 시작합니다.")
-                self.betting_history = []
-                return False
+                self.log(f"배팅 이력 로드 중: {self.betting_archive.directory}")
+
+            history = (read or self.read_betting_history)()
+            if history["migrated"] is not None:
+                self.log(
+                    f"기존 배팅 이력 {history['migrated']}개를 보관소로 옮겼습니다: {self.betting_results_file}"
+                )
+            self.betting_history = history["summaries"]
+            self.recent_betting_rounds.clear()
+            self.recent_betting_rounds.extend(history["recent"])
+
+            self.log(f"배팅 이력 로드 완료: {len(self.betting_history)}개 이벤트")
+            return True
         except Exception as e:
             self.log(f"배팅 이력 로드 오류: {str(e)}")
             self.betting_history = []
@@ -3595,7 +7721,8 @@ h2 {
             self.history_tree.delete(item)
 
         # 최근 이력부터 표시
-        for event in reversed(self.betting_history):
+        for index in range(len(self.betting_history) - 1, -1, -1):
+            event = self.betting_history[index]
             date = event.get("end_time", "알 수 없음")
             topic = event.get("topic", "알 수 없음")
             options_count = len(event.get("options", []))
@@ -3603,11 +7730,86 @@ h2 {
             winner = event.get("winning_option", "알 수 없음")
 
             self.history_tree.insert(
-                "", "end", values=(date, topic, options_count, total_points, winner)
+                "",
+                "end",
+                iid=str(index),
+                values=(date, topic, options_count, total_points, winner),
             )
 
         self.update_stats()
 
+    def view_betting_round(self):
+        """선택한 배팅 이력의 유저별 배팅 내역 보기 (필요할 때만 읽음)"""
+        selected_item = self.history_tree.selection()
+        if not selected_item:
+            messagebox.showwarning("경고", "상세 내역을 볼 배팅을 선택해주세요.")
+            return
+
+        summary = self.betting_history[int(selected_item[0])]
+        try:
+            event = self.load_betting_round(summary)
+        except Exception as e:
+            self.log(f"배팅 상세 정보 로드 오류: {str(e)}")
+            event = None
+
+        if not event:
+            messagebox.showerror("오류", "배팅 상세 정보를 불러올 수 없습니다.")
+            return
+
+        detail_window = tk.Toplevel(self.root)
+        detail_window.title(f"배팅 상세: {event.get('topic', '')}")
+        detail_window.geometry("500x400")
+        detail_window.transient(self.root)
+        detail_window.grab_set()
+
+        detail_frame = ttk.Frame(detail_window)
+        detail_frame.pack(fill="both", expand=True, padx=10, pady=10)
+
+        ttk.Label(
+            detail_frame,
+            text=f"당첨 선택지: {event.get('winning_option', '')} (배당률 {event.get('odds', 1.0):.2f}배)",
+        ).pack(anchor="w", pady=5)
+
+        columns = ("user", "option", "amount", "win_amount")
+        detail_tree = ttk.Treeview(detail_frame, columns=columns, show="headings")
+
+        detail_tree.heading("user", text="유저")
+        detail_tree.heading("option", text="선택지")
+        detail_tree.heading("amount", text="배팅 포인트")
+        detail_tree.heading("win_amount", text="획득 포인트")
+
+        detail_tree.column("user", width=150)
+        detail_tree.column("option", width=150)
+        detail_tree.column("amount", width=80)
+        detail_tree.column("win_amount", width=80)
+
+        scrollbar = ttk.Scrollbar(
+            detail_frame, orient="vertical", command=detail_tree.yview
+        )
+        detail_tree.configure(yscrollcommand=scrollbar.set)
+
+        detail_tree.pack(side="left", fill="both", expand=True)
+        scrollbar.pack(side="right", fill="y")
+
+        options = event.get("options", [])
+        win_amounts = {
+            winner["user_id"]: winner["win_amount"]
+            for winner in event.get("winners", [])
+        }
+        for user_id, bet_info in event.get("user_bets", {}).items():
+            option_idx = bet_info.get("option", -1)
+            option_name = options[option_idx] if 0 <= option_idx < len(options) else ""
+            detail_tree.insert(
+                "",
+                "end",
+                values=(
+                    user_id,
+                    option_name,
+                    bet_info.get("amount", 0),
+                    win_amounts.get(user_id, 0),
+                ),
+            )
+
     def toggle_betting_messages(self):
         """배팅 메시지 표시 설정 변경 (대시보드에서 변경시)"""
         self.show_betting_messages = self.show_betting_messages_var.get()
@@ -3640,10 +7842,12 @@ h2 {
             # 테스트 모드 중지
             self.is_running = False
 
-            # 배팅 타이머 중지
-            if self.betting_timer:
-                self.root.after_cancel(self.betting_timer)
-                self.betting_timer = None
+            # 배팅 마감 등 예약 작업 중지 후 아직 보내지 않은 포인트 획득 요약 전송
+            self.scheduler.stop()
+            digest = self.send_point_digest()
+            if digest is not None:
+                # 전송 스레드를 멈추면 대기 중인 메시지는 버려지므로 전송될 때까지 잠시 대기
+                digest.wait(2.0)
 
             # 연결 종료
             if self.is_connected:
@@ -3655,6 +7859,20 @@ h2 {
                     except Exception as e:
                         self.log(f"Socket.IO 연결 종료 중 오류: {str(e)}")
 
+            self.stop_chat_workers()
+            self.chat_sender.stop()
+            self.api_client.close()
+
+            # 남은 변경 사항 저장
+            try:
+                self.log("대기 중인 변경 사항 저장 중...")
+                self.point_ledger.stop()
+                for betting_round in self.betting_rounds.all():
+                    betting_round.journal.shutdown()
+                self.persistence.stop()
+            except Exception as e:
+                self.log(f"대기 중인 변경 사항 저장 중 오류: {str(e)}")
+
             # 데이터 저장
             try:
                 self.log("설정 저장 중...")
@@ -3680,12 +7898,8 @@ h2 {
             except Exception as e:
                 self.log(f"유저 인벤토리 저장 중 오류: {str(e)}")
 
-            # 배팅 이력 저장
-            try:
-                self.log("배팅 이력 저장 중...")
-                self.save_betting_history()
-            except Exception as e:
-                self.log(f"배팅 이력 저장 중 오류: {str(e)}")
+            if self.storage:
+                self.storage.close()
 
             self.log("프로그램이 안전하게 종료됩니다.")
         except Exception as e:
@@ -3711,12 +7925,6 @@ def run_app():
     # 종료 이벤트 처리
     root.protocol("WM_DELETE_WINDOW", app.exit_handler)
 
-    # 시작 시 데이터 로드
-    app.load_user_data()
-    app.load_shop_items()
-    app.load_user_inventory()
-    app.load_betting_history()
-
     # 창 중앙에 표시
     root.update_idletasks()
     width = root.winfo_width()
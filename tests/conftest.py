@@ -0,0 +1,197 @@
+"""테스트 공용 설정
+
+ChzzkPointBot.py는 임포트하면 바로 Tk 창을 띄우므로, 실행 부분 앞까지만 읽어 모듈로 등록합니다.
+봇 객체는 __init__을 거치지 않고 만든 뒤 위젯과 Tk 루트를 가짜 객체로 채웁니다.
+"""
+
+import collections
+import os
+import sys
+import threading
+import types
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+
+def load_bot_module():
+    path = os.path.join(ROOT, "ChzzkPointBot.py")
+    with open(path, encoding="utf-8") as f:
+        source = f.read()
+    source = source[: source.index('if __name__ == "__main__":')]
+    module = types.ModuleType("ChzzkPointBot")
+    module.__file__ = path
+    sys.modules["ChzzkPointBot"] = module
+    exec(compile(source, path, "exec"), module.__dict__)
+    return module
+
+
+bot_module = load_bot_module()
+
+
+class FakeWidget:
+    def __init__(self):
+        self.options = {}
+        self.rows = []
+
+    def config(self, **options):
+        self.options.update(options)
+
+    configure = config
+
+    def __setitem__(self, key, value):
+        self.options[key] = value
+
+    def get_children(self):
+        return list(range(len(self.rows)))
+
+    def delete(self, *items):
+        self.rows = []
+
+    def insert(self, *args, **kwargs):
+        self.rows.append(kwargs.get("values"))
+
+
+class FakeVar:
+    def __init__(self, value=""):
+        self.value = value
+
+    def get(self):
+        return self.value
+
+    def set(self, value):
+        self.value = value
+
+
+class FakeRoot:
+    """root.after로 넘긴 콜백을 모아 두었다가 run_pending으로 실행"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.callbacks = []
+
+    def after(self, ms, callback):
+        with self.lock:
+            self.callbacks.append(callback)
+            return len(self.callbacks)
+
+    def after_cancel(self, timer_id):
+        pass
+
+    def run_pending(self):
+        with self.lock:
+            callbacks, self.callbacks = self.callbacks, []
+        for callback in callbacks:
+            callback()
+
+
+WIDGETS = (
+    "apply_result_button",
+    "start_betting_button",
+    "end_betting_button",
+    "result_combo",
+    "round_combo",
+    "settlement_progress",
+    "settlement_status_label",
+    "current_betting_label",
+    "betting_time_left_label",
+    "betting_tree",
+    "shop_tree",
+    "history_tree",
+    "user_tree",
+    "total_users_label",
+    "total_points_label",
+    "total_items_label",
+    "total_bets_label",
+)
+
+
+def make_bot(data_dir, backend="json"):
+    """data_dir을 쓰는 봇 객체 (같은 폴더로 다시 만들면 재시작과 같음)"""
+    m = bot_module
+    bot = m.ChzzkPointsBot.__new__(m.ChzzkPointsBot)
+    bot.root = FakeRoot()
+    bot.logs = []
+    bot.log = bot.logs.append
+    bot.chat = []
+    bot.send_chat_message = lambda message, priority=None: bot.chat.append(
+        (message, priority)
+    )
+    bot.send_chat_lines = lambda lines, priority=None: bot.chat.extend(
+        (line, priority) for line in lines
+    )
+    for name in WIDGETS:
+        setattr(bot, name, FakeWidget())
+    bot.round_var = FakeVar()
+    bot.result_var = FakeVar()
+
+    bot.data_dir = str(data_dir)
+    bot.user_data_file = os.path.join(bot.data_dir, "chzzk_user_data.json")
+    bot.shop_items_file = os.path.join(bot.data_dir, "chzzk_shop_items.json")
+    bot.user_inventory_file = os.path.join(bot.data_dir, "chzzk_user_inventory.json")
+    bot.sqlite_file = os.path.join(bot.data_dir, "chzzk_bot_data.db")
+    bot.snapshot_file = os.path.join(bot.data_dir, "chzzk_snapshot.bin")
+    bot.betting_results_file = os.path.join(bot.data_dir, "chzzk_betting_history.json")
+
+    bot.storage_backend = backend
+    bot.storage = None
+    bot.snapshot = None
+    if backend == "sqlite":
+        bot.storage = m.SqliteStore(bot.sqlite_file)
+    elif backend == "binary":
+        bot.snapshot = m.BinarySnapshot(bot.snapshot_file)
+
+    bot.users = m.UserTable()
+    bot.user_points = bot.users.points_map
+    bot.user_last_reward = bot.users.last_reward_map
+    bot.user_view_dirty = False
+    bot.user_inventory = bot.users.inventory_map
+    bot.shop_items = {}
+    bot.shop_index = m.ItemNameIndex()
+    bot.inventory_index = m.InventoryNameIndex()
+    bot.reward_clock = m.MonotonicClock()
+    bot.reward_wheel = m.RewardWheel()
+    bot.cooldown_minutes = 10
+    bot.point_digest = m.PointDigest()
+
+    bot.points_lock = threading.RLock()
+    bot.store_lock = threading.Lock()
+    bot.point_ledger = m.PointLedger(
+        os.path.join(bot.data_dir, "chzzk_point_ledger.ndjson"),
+        os.path.join(bot.data_dir, "chzzk_point_ledger_archive.ndjson"),
+    )
+    bot.persistence = m.PersistenceScheduler(bot.flush_collection)
+    bot.scheduler = m.DeadlineScheduler()
+
+    bot.is_connected = True
+    bot.show_betting_messages = True
+    bot.betting_rounds = m.BettingRegistry()
+    bot.selected_round_id = None
+    bot.betting_history = []
+    bot.recent_betting_rounds = collections.deque(maxlen=10)
+    bot.betting_archive = m.BettingHistoryArchive(
+        os.path.join(bot.data_dir, "betting_history")
+    )
+    return bot
+
+
+@pytest.fixture
+def messagebox(monkeypatch):
+    """대화 상자 호출을 기록 (askyesno 응답은 answers로 지정)"""
+    calls = []
+    answers = []
+
+    def ask(*args):
+        calls.append(("askyesno",) + args)
+        return answers.pop(0) if answers else True
+
+    for name in ("showinfo", "showwarning", "showerror"):
+        monkeypatch.setattr(
+            bot_module.messagebox,
+            name,
+            lambda *args, name=name: calls.append((name,) + args),
+        )
+    monkeypatch.setattr(bot_module.messagebox, "askyesno", ask)
+    return types.SimpleNamespace(calls=calls, answers=answers)
@@ -0,0 +1,90 @@
+import threading
+
+from conftest import bot_module as m
+from conftest import make_bot
+from test_betting_settlement import START_TIME, give_points, open_round
+
+
+def test_bet_after_close_is_rejected_and_refunded(tmp_path, messagebox):
+    bot = make_bot(tmp_path)
+    give_points(bot, 2)
+    betting_round = open_round(bot, [("u0", 0, 50)])
+
+    bot.end_betting("A")
+    bot.handle_betting_command(betting_round, "u1", "유저1", "!A1 50")
+
+    assert bot.user_points["u1"] == 100
+    assert not betting_round.has_bet("u1")
+    assert "마감" in bot.chat[-1][0]
+    journal = m.BettingJournal(bot.betting_journal_path("A")).load()
+    assert list(journal["bets"]) == ["u0"]
+    assert journal["closed"]
+
+
+def test_close_and_place_race_never_journals_after_close(tmp_path, messagebox):
+    bot = make_bot(tmp_path)
+    betting_round = open_round(bot, [])
+    barrier = threading.Barrier(9)
+    results = {}
+
+    def place(idx):
+        barrier.wait()
+        bet = {"option": 0, "amount": 10, "timestamp": START_TIME}
+        results[idx] = betting_round.place(f"u{idx}", bet, idx)
+
+    threads = [threading.Thread(target=place, args=(idx,)) for idx in range(8)]
+    for thread in threads:
+        thread.start()
+    barrier.wait()
+    betting_round.close()
+    for thread in threads:
+        thread.join()
+
+    # 마감 기록 뒤에 배팅 기록이 남지 않고, 접수된 배팅만 기록에 있어야 함
+    journal = m.BettingJournal(bot.betting_journal_path("A")).load()
+    accepted = {
+        f"u{idx}" for idx, result in results.items() if result == m.BET_ACCEPTED
+    }
+    assert set(journal["bets"]) == accepted == set(betting_round.bets)
+    assert all(result in (m.BET_ACCEPTED, m.BET_CLOSED) for result in results.values())
+    assert not betting_round.close()
+
+
+def test_ledger_records_reference_round_id(tmp_path, messagebox):
+    bot = make_bot(tmp_path)
+    give_points(bot, 1)
+    open_round(bot, [("u0", 0, 50)])
+    bot.point_ledger.commit()
+
+    records = [
+        record for record in bot.point_ledger.read_after(0) if record["reason"] == "bet"
+    ]
+    assert [record["ref"] for record in records] == [f"A@{START_TIME}"]
+    assert m.betting_ledger_ref({"start_time": START_TIME}) == START_TIME
+
+
+def test_journal_failure_rolls_back_bet_and_refunds(tmp_path, messagebox):
+    bot = make_bot(tmp_path)
+    give_points(bot, 2)
+    betting_round = open_round(bot, [("u0", 0, 50)])
+
+    def fail(*args):
+        raise OSError("disk full")
+
+    betting_round.journal.record_bet = fail
+    bot.handle_betting_command(betting_round, "u1", "유저1", "!A2 30")
+
+    assert bot.user_points["u1"] == 100
+    assert not betting_round.has_bet("u1")
+    assert betting_round.snapshot()["total_points"] == 50
+    assert betting_round.option_participants == [1, 0]
+    assert list(betting_round.stakes) == [50]
+
+
+def test_parse_bet_keyword():
+    assert m.parse_bet_keyword("1") == (None, 1)
+    assert m.parse_bet_keyword("12") == (None, 12)
+    assert m.parse_bet_keyword("a2") == ("A", 2)
+    assert m.parse_bet_keyword("B10") == ("B", 10)
+    for keyword in ("", "A", "AB1", "1a", "가1", "²", "A-1"):
+        assert m.parse_bet_keyword(keyword) is None
@@ -0,0 +1,218 @@
+import threading
+import time
+from datetime import datetime, timedelta
+
+import pytest
+
+from conftest import bot_module as m
+from conftest import make_bot
+
+START_TIME = "2024-01-01 12:00:00"
+
+
+def open_round(bot, bets, round_id="A", options=("레드", "블루")):
+    """bets: (유저 ID, 선택지 번호, 배팅액) 목록으로 배팅을 받은 라운드"""
+    event = {
+        "round_id": round_id,
+        "topic": "누가 이길까요?",
+        "options": list(options),
+        "start_time": START_TIME,
+    }
+    end_time = datetime.now() + timedelta(minutes=5)
+    journal = m.BettingJournal(bot.betting_journal_path(round_id))
+    journal.begin(event, end_time)
+    betting_round = m.BettingRound(round_id, event, end_time, journal)
+    bot.betting_rounds.add(betting_round)
+    for user_id, option, amount in bets:
+        place_bet(bot, betting_round, user_id, option, amount)
+    return betting_round
+
+
+def place_bet(bot, betting_round, user_id, option, amount):
+    """채팅 배팅과 같은 순서로 포인트 차감 후 차감 순번과 함께 배팅 기록"""
+    bet = {"option": option, "amount": amount, "timestamp": START_TIME}
+    _, seq = bot.change_points_with_seq(
+        user_id, -amount, "bet", betting_round.ledger_ref
+    )
+    placed = betting_round.place(user_id, bet, bot.users.ensure_row(user_id), seq)
+    assert placed == m.BET_ACCEPTED
+
+
+def give_points(bot, count, points=100):
+    for idx in range(count):
+        bot.change_points(f"u{idx}", points, "chat")
+    bot.point_ledger.commit()
+    bot.store_user_snapshot()
+
+
+def settle(bot, betting_round, option_idx):
+    """배팅을 마감하고 결과 적용 후 정산 스레드가 끝날 때까지 대기"""
+    bot.end_betting(betting_round.id)
+    bot.select_betting_round(betting_round.id)
+    bot.result_var.set(betting_round.event["options"][option_idx])
+    bot.apply_betting_result()
+    deadline = time.monotonic() + 30
+    while any(
+        thread.name.startswith("betting-settlement") for thread in threading.enumerate()
+    ):
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+    bot.root.run_pending()
+
+
+def restart(data_dir, backend):
+    bot = make_bot(data_dir, backend)
+    assert bot.load_user_data()
+    return bot
+
+
+@pytest.mark.parametrize("backend", ["json", "sqlite", "binary"])
+def test_settlement_pays_winners_and_survives_restart(tmp_path, messagebox, backend):
+    bot = make_bot(tmp_path, backend)
+    give_points(bot, 4)
+    betting_round = open_round(
+        bot, [("u0", 0, 100), ("u1", 1, 50), ("u2", 0, 50), ("u3", 1, 50)]
+    )
+
+    settle(bot, betting_round, 0)
+
+    # 배당률 250 / 150, 당첨금은 소수점 버림
+    assert bot.user_points["u0"] == 166
+    assert bot.user_points["u2"] == 133
+    assert bot.user_points["u1"] == 50
+    assert bot.betting_rounds.get("A") is None
+    assert len(bot.betting_history) == 1
+
+    bot = restart(tmp_path, backend)
+    assert bot.user_points["u0"] == 166
+    assert bot.user_points["u2"] == 133
+
+
+def test_sqlite_crash_between_chunks_keeps_ledger_watermark(tmp_path, messagebox):
+    bot = make_bot(tmp_path, "sqlite")
+    count = m.SETTLEMENT_CHUNK_SIZE * 2 + 1000
+    give_points(bot, count)
+    betting_round = open_round(bot, [(f"u{idx}", 0, 50) for idx in range(count)])
+    seq_before = int(bot.storage.get_meta("ledger_seq"))
+
+    # 첫 묶음을 기록한 직후 종료된 것처럼 저장을 중단
+    def crash(percent, text):
+        if "포인트 저장 중 (" in text:
+            raise RuntimeError("crash")
+
+    bot.report_settlement_progress = crash
+    settle(bot, betting_round, 0)
+    assert any(call[0] == "showerror" for call in messagebox.calls)
+
+    # 같은 트랜잭션이 취소되었으므로 원장 순번도 그대로여야 함
+    assert int(bot.storage.get_meta("ledger_seq")) == seq_before
+    bot.point_ledger.stop()
+
+    bot = restart(tmp_path, "sqlite")
+    assert bot.user_points["u0"] == 100
+    assert bot.user_points[f"u{count - 1}"] == 100
+
+
+def test_autosave_before_settlement_store_includes_winners(tmp_path, messagebox):
+    bot = make_bot(tmp_path, "sqlite")
+    give_points(bot, 3)
+    betting_round = open_round(bot, [("u0", 0, 50), ("u1", 1, 50), ("u2", 1, 50)])
+    bot.persistence.flush()
+
+    # 정산 저장 전에 다른 유저의 변경으로 자동 저장이 한 번 돌고 종료되었다고 가정
+    def autosave_then_crash(*args, **kwargs):
+        bot.change_points("u9", 10, "chat")
+        bot.persistence.flush()
+
+    bot.persist_settlement = autosave_then_crash
+    settle(bot, betting_round, 0)
+    bot.point_ledger.stop()
+
+    bot = restart(tmp_path, "sqlite")
+    assert bot.user_points["u0"] == 200
+    assert bot.user_points["u1"] == 50
+
+
+def test_restart_after_payout_commit_finishes_round_without_refund(
+    tmp_path, messagebox
+):
+    bot = make_bot(tmp_path, "json")
+    give_points(bot, 4)
+    betting_round = open_round(
+        bot, [("u0", 0, 100), ("u1", 1, 50), ("u2", 0, 50), ("u3", 1, 50)]
+    )
+
+    # 당첨금 원장 커밋 직후, 이력 저장과 기록 파일 정리 전에 종료되었다고 가정
+    def crash(*args, **kwargs):
+        raise RuntimeError("crash")
+
+    bot.persist_settlement = crash
+    settle(bot, betting_round, 0)
+    bot.point_ledger.stop()
+    assert (tmp_path / "chzzk_betting_round_A.ndjson").exists()
+
+    bot = restart(tmp_path, "json")
+    messagebox.calls.clear()
+    bot.restore_betting_rounds()
+
+    assert not any(call[0] == "askyesno" for call in messagebox.calls)
+    assert bot.betting_rounds.get("A") is None
+    assert not (tmp_path / "chzzk_betting_round_A.ndjson").exists()
+    assert bot.user_points["u0"] == 166
+    assert bot.user_points["u2"] == 133
+    assert bot.user_points["u1"] == 50
+    assert len(bot.betting_history) == 1
+    assert bot.betting_history[0]["winning_option_idx"] == 0
+
+
+def test_restart_before_payout_commit_restores_round_awaiting_result(
+    tmp_path, messagebox
+):
+    bot = make_bot(tmp_path, "json")
+    give_points(bot, 2)
+    betting_round = open_round(bot, [("u0", 0, 100), ("u1", 1, 50)])
+    bot.point_ledger.commit()
+
+    # 결과 적용은 기록했지만 당첨금 원장을 커밋하기 전에 종료되었다고 가정
+    def crash():
+        raise RuntimeError("crash")
+
+    bot.point_ledger.commit = crash
+    settle(bot, betting_round, 0)
+    bot.point_ledger.stop = lambda: None
+
+    bot = restart(tmp_path, "json")
+    messagebox.calls.clear()
+    assert bot.restore_betting_rounds()
+
+    restored = bot.betting_rounds.get("A")
+    assert restored is not None and not restored.active
+    assert bot.user_points["u0"] == 0
+    assert bot.user_points["u1"] == 50
+    assert not bot.betting_history
+
+
+def test_refund_on_restart_skips_bets_whose_deduction_was_not_saved(
+    tmp_path, messagebox
+):
+    bot = make_bot(tmp_path, "json")
+    give_points(bot, 2)
+    betting_round = open_round(bot, [("u0", 0, 100)])
+    bot.point_ledger.commit()
+
+    # u1의 배팅은 기록됐지만 포인트 차감 원장을 커밋하기 전에 종료되었다고 가정
+    def crash():
+        raise RuntimeError("crash")
+
+    bot.point_ledger.commit = crash
+    bot.point_ledger.stop = lambda: None
+    place_bet(bot, betting_round, "u1", 1, 50)
+
+    bot = restart(tmp_path, "json")
+    messagebox.answers.append(False)
+    assert bot.restore_betting_rounds()
+
+    # 차감이 저장된 u0만 환불되고, 차감이 사라진 u1은 포인트가 그대로여야 함
+    assert bot.user_points["u0"] == 100
+    assert bot.user_points["u1"] == 100
+    assert not (tmp_path / "chzzk_betting_round_A.ndjson").exists()
@@ -0,0 +1,44 @@
+import pytest
+
+from conftest import bot_module as m
+from conftest import make_bot
+
+
+def reward_bot(tmp_path, jackpot_chance, digest=False):
+    bot = make_bot(tmp_path)
+    bot.min_points = bot.max_points = 50
+    bot.jackpot_points = 500
+    bot.jackpot_chance = jackpot_chance
+    bot.point_multiplier = 1.0
+    bot.show_point_messages = True
+    bot.point_digest_enabled = digest
+    bot.point_digest_jackpot_immediate = True
+    return bot
+
+
+@pytest.mark.parametrize("digest", [False, True])
+def test_jackpot_announcement_is_not_cosmetic(tmp_path, digest):
+    bot = reward_bot(tmp_path, jackpot_chance=100, digest=digest)
+    bot.handle_chat_message("u0", "유저")
+
+    assert bot.user_points["u0"] == 500
+    assert [priority for _, priority in bot.chat] == [m.CHAT_PRIORITY_INFO]
+
+
+def test_regular_reward_message_stays_cosmetic(tmp_path):
+    bot = reward_bot(tmp_path, jackpot_chance=0)
+    bot.handle_chat_message("u0", "유저")
+
+    assert bot.user_points["u0"] == 50
+    assert [priority for _, priority in bot.chat] == [m.CHAT_PRIORITY_COSMETIC]
+
+
+def test_rewards_only_mark_user_view_dirty(tmp_path):
+    bot = reward_bot(tmp_path, jackpot_chance=0)
+    for idx in range(5):
+        bot.handle_chat_message(f"u{idx}", f"유저{idx}")
+
+    # 채팅 처리 스레드에서는 유저 목록 위젯을 건드리지 않음
+    assert bot.user_view_dirty
+    assert bot.user_tree.rows == []
+    assert bot.total_users_label.options == {}
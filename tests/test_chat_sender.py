@@ -0,0 +1,64 @@
+import time
+
+from conftest import bot_module as m
+
+
+def test_retry_waits_in_queue_without_blocking_other_messages():
+    sent = []
+
+    def send(message):
+        sent.append((message, time.monotonic()))
+        if message == "첫 메시지" and len(sent) == 1:
+            raise m.ChzzkApiError("잠시 후 다시 시도", retry_after=0.3)
+        return True
+
+    sender = m.ChatSender(send, rate=100, burst=10)
+    sender.start()
+    try:
+        first = sender.send("첫 메시지", m.CHAT_PRIORITY_TRANSACTION)
+        time.sleep(0.05)
+        started = time.monotonic()
+        second = sender.send("두 번째 메시지", m.CHAT_PRIORITY_TRANSACTION)
+
+        # 첫 메시지가 재시도를 기다리는 동안에도 다음 메시지는 바로 전송
+        assert second.wait(1.0) is True
+        assert time.monotonic() - started < 0.2
+        assert sender.pending() == 1
+        assert first.wait(2.0) is True
+    finally:
+        sender.stop()
+
+    assert [message for message, _ in sent] == [
+        "첫 메시지",
+        "두 번째 메시지",
+        "첫 메시지",
+    ]
+    assert sent[2][1] - sent[0][1] >= 0.3
+    assert sender.retried == 1
+
+
+def test_ready_retry_goes_before_lower_priority_messages():
+    sender = m.ChatSender(lambda message: True)
+    retry = [m.ChatSendHandle("재시도", m.CHAT_PRIORITY_TRANSACTION)]
+    sender.delayed.append((time.monotonic() - 1, m.CHAT_PRIORITY_TRANSACTION, 1, retry))
+    sender.lanes[m.CHAT_PRIORITY_INFO].append(m.ChatSendHandle("안내"))
+
+    assert sender._next_batch() == (retry, 1)
+    batch, attempt = sender._next_batch()
+    assert [handle.message for handle in batch] == ["안내"] and attempt == 0
+    assert sender._next_batch() is None
+
+
+def test_set_rate_updates_bucket_in_place():
+    sender = m.ChatSender(lambda message: True, rate=2.0, burst=3)
+    bucket = sender.bucket
+    bucket.tokens = 1.0
+
+    sender.set_rate(5.0)
+    assert sender.bucket is bucket
+    assert bucket.rate == 5.0 and bucket.burst == 3.0
+    assert bucket.tokens >= 1.0
+
+    sender.set_rate(1.0, burst=1)
+    assert bucket.rate == 1.0 and bucket.burst == 1.0
+    assert bucket.tokens <= 1.0
@@ -0,0 +1,146 @@
+import io
+import json
+import sqlite3
+from datetime import datetime
+
+import pytest
+
+import ChzzkDataTool as tool
+from conftest import make_bot
+
+REWARD_TIME = "2024-01-01 12:00:00"
+ROUND = {
+    "topic": "누가 이길까요?",
+    "options": ["레드", "블루"],
+    "start_time": "2024-01-01 12:00:00",
+    "end_time": "2024-01-01 12:05:00",
+    "winning_option": "레드",
+    "winning_option_idx": 0,
+    "total_points": 150,
+    "odds": 1.5,
+    "winners": [{"user_id": "u0", "bet_amount": 100, "win_amount": 150}],
+    "user_bets": {
+        "u0": {"option": 0, "amount": 100},
+        "u1": {"option": 1, "amount": 50},
+    },
+}
+
+
+def write_bot_data(data_dir, backend, points=(100, 50)):
+    """봇이 직접 저장한 데이터 폴더 (스냅샷 이후 원장 기록 하나 포함)"""
+    with open(data_dir / tool.SETTINGS_FILE, "w", encoding="utf-8") as f:
+        json.dump({"storage_backend": backend}, f)
+
+    bot = make_bot(data_dir, backend)
+    for idx, amount in enumerate(points):
+        bot.change_points(f"u{idx}", amount, "chat")
+    bot.user_last_reward["u0"] = datetime.strptime(REWARD_TIME, tool.TIME_FORMAT)
+    bot.users.get("u0").inventory = {
+        "item_1": {"quantity": 2, "purchase_date": REWARD_TIME}
+    }
+    bot.shop_items = {"item_1": {"name": "물", "price": 10, "description": ""}}
+    bot.save_shop_items()
+    bot.append_betting_round(dict(ROUND))
+    bot.point_ledger.commit()
+    bot.store_user_snapshot()
+    bot.flush_collection("inventory")
+
+    bot.change_points("u1", 7, "chat")
+    bot.point_ledger.commit()
+    bot.point_ledger.stop()
+    if bot.storage:
+        bot.storage.close()
+
+
+def load_scratch(data_dir):
+    scratch = tool.Scratch()
+    scratch.load(str(data_dir))
+    try:
+        return (
+            {user_id: (points, reward) for user_id, points, reward in scratch.users()},
+            list(scratch.inventory()),
+            scratch.ledger_seq,
+        )
+    finally:
+        scratch.close()
+
+
+@pytest.mark.parametrize("backend", ["json", "sqlite", "binary"])
+def test_reads_each_storage_backend(tmp_path, backend, capsys):
+    write_bot_data(tmp_path, backend)
+    assert tool.detect_backend(str(tmp_path)) == backend
+
+    users, inventory, ledger_seq = load_scratch(tmp_path)
+    assert users == {"u0": (100, REWARD_TIME), "u1": (57, None)}
+    assert inventory == [("u0", "item_1", 2, REWARD_TIME)]
+    assert ledger_seq == 3
+    assert tool.load_shop_items(str(tmp_path))["item_1"]["name"] == "물"
+    assert [entry["topic"] for entry in tool.iter_betting_rounds(str(tmp_path))] == [
+        ROUND["topic"]
+    ]
+
+    assert tool.validate(str(tmp_path))
+    assert f"저장 방식 {backend}" in capsys.readouterr().out
+
+
+def test_sqlite_store_is_opened_read_only(tmp_path):
+    write_bot_data(tmp_path, "sqlite")
+    rows = tool.iter_sqlite(str(tmp_path), "DELETE FROM users")
+    with pytest.raises(sqlite3.OperationalError):
+        next(rows)
+
+
+def test_missing_backend_file_falls_back_to_json(tmp_path):
+    write_bot_data(tmp_path, "json")
+    with open(tmp_path / tool.SETTINGS_FILE, "w", encoding="utf-8") as f:
+        json.dump({"storage_backend": "sqlite"}, f)
+    assert tool.detect_backend(str(tmp_path)) == "json"
+
+
+def test_json_stream_parses_across_small_chunks():
+    data = {
+        "points": {"u0": 1234567890123, '유저 "따옴표"': -5, "u2": 0},
+        "last_reward": {"u0": REWARD_TIME},
+        "ledger_seq": 42,
+    }
+    text = json.dumps(data, ensure_ascii=False, indent=4)
+    for chunk_size in (1, 2, 3, 7, 64):
+        stream = tool.JsonStream(io.StringIO(text), chunk_size=chunk_size)
+        parsed = {}
+        for section in stream.iter_object():
+            if section == "ledger_seq":
+                parsed[section] = stream.read_value()
+            else:
+                parsed[section] = {
+                    key: stream.read_value() for key in stream.iter_object()
+                }
+        assert parsed == data
+
+    stream = tool.JsonStream(io.StringIO("[1, [2, 3], {}, 45]"), chunk_size=2)
+    assert [stream.read_value() for _ in stream.iter_array()] == [1, [2, 3], {}, 45]
+
+    stream = tool.JsonStream(io.StringIO('{"a" 1}'), chunk_size=2)
+    with pytest.raises(ValueError):
+        list(stream.iter_object())
+
+
+@pytest.mark.parametrize("mode, u0, u1", [("sum", 300, 64), ("max", 200, 57)])
+def test_merge_combines_users_inventory_and_history(tmp_path, mode, u0, u1, capsys):
+    dir_a = tmp_path / "a"
+    dir_b = tmp_path / "b"
+    out = tmp_path / "out"
+    dir_a.mkdir()
+    dir_b.mkdir()
+    write_bot_data(dir_a, "sqlite", points=(100,))
+    write_bot_data(dir_b, "binary", points=(200, 50))
+
+    assert tool.main(["merge", str(dir_a), str(dir_b), str(out), "--points", mode]) == 0
+
+    users, inventory, ledger_seq = load_scratch(out)
+    # A의 u1은 원장 기록 7점만, B의 u1은 50 + 7점
+    assert users["u0"][0] == u0
+    assert users["u1"][0] == u1
+    assert users["u0"][1] == REWARD_TIME
+    assert inventory == [("u0", "item_1", 4, REWARD_TIME)]
+    assert ledger_seq == 0
+    assert len(list(tool.iter_betting_rounds(str(out)))) == 2
@@ -0,0 +1,115 @@
+import threading
+import time
+from datetime import datetime, timedelta
+
+import pytest
+
+from conftest import bot_module as m
+from conftest import make_bot
+from test_betting_settlement import give_points, open_round
+
+
+@pytest.fixture
+def scheduler():
+    errors = []
+    scheduler = m.DeadlineScheduler(on_error=errors.append)
+    scheduler.errors = errors
+    scheduler.start()
+    yield scheduler
+    scheduler.stop()
+
+
+def wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline
+        time.sleep(0.005)
+
+
+def test_events_fire_in_deadline_order(scheduler):
+    fired = []
+    now = time.monotonic()
+    for delay, name in ((0.06, "c"), (0.02, "a"), (0.04, "b")):
+        scheduler.call_at(now + delay, lambda name=name: fired.append(name))
+
+    wait_for(lambda: len(fired) == 3)
+    assert fired == ["a", "b", "c"]
+    assert scheduler.pending() == 0
+    assert scheduler.fired == 3
+
+
+def test_cancelled_event_does_not_fire(scheduler):
+    fired = []
+    event_id = scheduler.call_later(0.02, lambda: fired.append("cancelled"))
+    scheduler.call_later(0.04, lambda: fired.append("kept"))
+    scheduler.cancel(event_id)
+    scheduler.cancel(event_id)
+
+    wait_for(lambda: fired)
+    time.sleep(0.03)
+    assert fired == ["kept"]
+
+
+def test_earlier_event_wakes_sleeping_thread(scheduler):
+    fired = threading.Event()
+    scheduler.call_later(60, lambda: None)
+    time.sleep(0.02)
+
+    started = time.monotonic()
+    scheduler.call_later(0.01, fired.set)
+    assert fired.wait(2)
+    assert time.monotonic() - started < 1
+    assert scheduler.pending() == 1
+
+
+def test_callback_error_is_reported_and_thread_keeps_running(scheduler):
+    fired = threading.Event()
+
+    def fail():
+        raise RuntimeError("boom")
+
+    scheduler.call_later(0, fail)
+    scheduler.call_later(0.01, fired.set)
+
+    assert fired.wait(2)
+    assert [str(e) for e in scheduler.errors] == ["boom"]
+
+
+def test_stop_drops_pending_events():
+    fired = []
+    scheduler = m.DeadlineScheduler()
+    scheduler.start()
+    scheduler.call_later(0.05, lambda: fired.append(1))
+    scheduler.stop()
+
+    time.sleep(0.08)
+    assert fired == []
+    assert scheduler.pending() == 0
+    assert scheduler.thread is None
+
+
+def test_betting_round_closes_at_deadline(tmp_path, messagebox):
+    bot = make_bot(tmp_path)
+    bot.scheduler.start()
+    try:
+        give_points(bot, 1)
+        betting_round = open_round(bot, [])
+        betting_round.end_time = datetime.now() + timedelta(seconds=0.05)
+        bot.schedule_betting_round(betting_round)
+        # 남은 시간이 짧으면 마감 전 알림은 예약하지 않음
+        assert len(betting_round.events) == 1
+
+        # UI 스레드가 콜백을 처리하지 않아도 스케줄러 스레드에서 바로 마감
+        wait_for(lambda: not betting_round.active)
+        bot.handle_betting_command(betting_round, "u0", "유저0", "!A1 10")
+        assert not betting_round.has_bet("u0")
+        assert bot.user_points["u0"] == 100
+        assert "마감" in bot.chat[-1][0]
+        assert bot.scheduler.pending() == 0
+        assert m.BettingJournal(bot.betting_journal_path("A")).load()["closed"]
+
+        wait_for(lambda: bot.root.callbacks)
+        bot.root.run_pending()
+        assert any("종료됨" in line for line in bot.logs)
+    finally:
+        bot.scheduler.stop()
@@ -0,0 +1,107 @@
+from conftest import bot_module as m
+
+
+def make_index(names):
+    index = m.ItemNameIndex()
+    index.rebuild({item_id: {"name": name} for item_id, name in names.items()})
+    return index
+
+
+def test_find_prefers_exact_then_prefix_then_substring():
+    index = make_index(
+        {"item_1": "체력 물약", "item_2": "체력 물약 (대)", "item_3": "마나 물약"}
+    )
+
+    # 정확히 일치하는 이름이 있으면 그 이름만
+    assert index.find("체력 물약") == ["item_1"]
+    # 대소문자/전각/연속 공백 차이는 무시
+    assert index.find("  체력   물약 ") == ["item_1"]
+    # 접두어가 여러 아이템과 맞으면 모두 반환 (애매한 검색어)
+    assert index.find("체력") == ["item_1", "item_2"]
+    assert index.find("마") == ["item_3"]
+    # 접두어가 없으면 부분 문자열
+    assert index.find("물약") == ["item_1", "item_2", "item_3"]
+    assert index.find("(대)") == ["item_2"]
+    assert index.find("약") == ["item_1", "item_2", "item_3"]
+    assert index.find("없는 아이템") == []
+    assert index.find("  ") == []
+
+
+def test_normalize_folds_case_and_width():
+    index = make_index({"item_1": "Golden Ticket"})
+
+    assert index.find("ＧＯＬＤＥＮ") == ["item_1"]
+    assert index.find("ticket") == ["item_1"]
+
+
+def test_remove_prunes_trie_nodes_only_used_by_removed_item():
+    index = make_index({"item_1": "체력 물약", "item_2": "체력"})
+
+    index.remove("item_1")
+
+    assert index.find("체력 물") == []
+    assert index.find("물약") == []
+    # 남은 아이템이 쓰는 경로는 그대로 두고, 지운 아이템만 쓰던 가지는 잘라냄
+    assert list(index.trie) == ["체"]
+    assert set(index.trie["체"]["력"]) == {""}
+    assert index.trie["체"]["력"][""] == {"item_2"}
+    assert "물" not in index.grams
+    assert index.find("체") == ["item_2"]
+
+    index.remove("item_2")
+    index.remove("item_2")
+    assert index.trie == {}
+    assert index.exact == {} and index.grams == {} and index.names == {}
+
+
+def test_add_replaces_previous_name():
+    index = make_index({"item_1": "체력 물약"})
+
+    index.add("item_1", "마나 물약")
+
+    assert index.find("체력") == []
+    assert index.find("마나") == ["item_1"]
+    assert list(index.trie) == ["마"]
+
+
+def test_inventory_rename_updates_every_holder_in_place():
+    shop_items = {"item_1": {"name": "체력 물약"}, "item_2": {"name": "마나 물약"}}
+    inventory = {
+        "u0": {"item_1": {}, "item_2": {}},
+        "u1": {"item_1": {}},
+        "u2": {"item_2": {}},
+    }
+    index = m.InventoryNameIndex()
+    index.rebuild(inventory, shop_items)
+    entry = index.users["u0"]
+
+    index.rename("item_1", "회복 물약")
+
+    # 보유 유저의 기존 색인 항목을 그대로 고침
+    assert index.users["u0"] is entry
+    assert index.find("u0", "회복") == ["item_1"]
+    assert index.find("u1", "회복 물약") == ["item_1"]
+    assert index.find("u0", "체력") == []
+    assert "체" not in entry["prefixes"]
+    # 다른 아이템과 보유하지 않은 유저는 그대로
+    assert index.find("u0", "마나") == ["item_2"]
+    assert index.find("u2", "회복") == []
+    assert index.holders["item_1"] == {"u0", "u1"}
+
+
+def test_inventory_find_order_and_removal():
+    index = m.InventoryNameIndex()
+    index.add("u0", "item_1", "체력 물약")
+    index.add("u0", "item_2", "체력 물약 (대)")
+
+    assert index.find("u0", "체력 물약") == ["item_1"]
+    assert index.find("u0", "체력") == ["item_1", "item_2"]
+    assert index.find("u0", "(대)") == ["item_2"]
+    assert index.find("u1", "체력") == []
+
+    index.remove_item("item_1")
+    assert index.find("u0", "체력") == ["item_2"]
+    assert "item_1" not in index.holders
+
+    index.drop_user("u0")
+    assert index.users == {} and index.holders == {}
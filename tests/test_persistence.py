@@ -0,0 +1,109 @@
+import pytest
+
+from conftest import bot_module as m
+from conftest import make_bot
+
+
+def restart_inventory(data_dir, backend):
+    """다시 시작해 유저 데이터와 인벤토리를 읽은 봇"""
+    bot = make_bot(data_dir, backend)
+    assert bot.load_user_data()
+    assert bot.load_user_inventory()
+    return bot
+
+
+@pytest.mark.parametrize("backend", ["json", "sqlite", "binary"])
+def test_restart_replays_ledger_after_snapshot_watermark(tmp_path, backend):
+    bot = make_bot(tmp_path, backend)
+    for idx in range(3):
+        bot.change_points(f"u{idx}", 100, "chat")
+    bot.point_ledger.commit()
+    bot.store_user_snapshot()
+
+    # 스냅샷 이후의 변경은 원장에만 남은 채로 종료
+    bot.change_points("u0", -30, "purchase", "item")
+    bot.change_points("u3", 20, "chat")
+    bot.point_ledger.commit()
+
+    bot = make_bot(tmp_path, backend)
+    user_data = bot.read_user_data()
+    # 이미 스냅샷에 반영된 기록은 다시 적용하지 않음
+    assert user_data["replayed"] == 2
+    assert bot.load_user_data(lambda: user_data)
+    assert bot.user_points["u0"] == 70
+    assert bot.user_points["u1"] == 100
+    assert bot.user_points["u3"] == 20
+
+
+def test_restart_restores_ledger_seq_from_binary_snapshot(tmp_path):
+    bot = make_bot(tmp_path, "binary")
+    bot.change_points("u0", 100, "chat")
+    bot.point_ledger.commit()
+    bot.store_user_snapshot()
+    seq = bot.snapshot.read()["ledger_seq"]
+
+    bot = make_bot(tmp_path, "binary")
+    assert bot.load_user_data()
+    assert bot.point_ledger.last_seq == seq
+    bot.change_points("u0", 5, "chat")
+    assert bot.point_ledger.last_seq == seq + 1
+
+
+def test_binary_snapshot_round_trip(tmp_path):
+    snapshot = m.BinarySnapshot(str(tmp_path / "snapshot.bin"))
+    points = {"u0": 10, "유저": -5, "u2": 0}
+    last_rewards = {"u0": 1_700_000_000}
+    inventory = {
+        "유저": {"item_1": {"quantity": 2, "purchase_date": "2024-01-01 12:00:00"}},
+        "u9": {"item_2": {"quantity": 1, "purchase_date": None}},
+    }
+    snapshot.write(points, last_rewards, inventory, ledger_seq=42)
+
+    data = snapshot.read()
+    assert data["user_ids"] == ["u0", "유저", "u2"]
+    assert list(data["points"]) == [10, -5, 0]
+    no_time = m.BinarySnapshot.NO_TIME
+    assert list(data["last_reward"]) == [1_700_000_000, no_time, no_time]
+    assert data["ledger_seq"] == 42
+    assert snapshot.read_inventory() == inventory
+
+
+def test_binary_snapshot_table_uses_read_columns(tmp_path):
+    bot = make_bot(tmp_path, "binary")
+    bot.change_points("u0", 100, "chat")
+    bot.point_ledger.commit()
+    bot.store_user_snapshot()
+
+    bot = make_bot(tmp_path, "binary")
+    assert bot.load_user_data()
+    # 스냅샷에서 읽은 배열을 복사하지 않고 테이블 열로 사용
+    assert bot.users.points is bot.snapshot.read()["points"]
+
+
+def test_ledger_compaction_moves_snapshotted_records_to_archive(tmp_path):
+    bot = make_bot(tmp_path)
+    bot.point_ledger.compact_threshold = 3
+    for idx in range(3):
+        bot.change_points(f"u{idx}", 10, "chat")
+    bot.point_ledger.commit()
+    bot.store_user_snapshot()
+
+    assert bot.point_ledger.records_in_file == 0
+    archive = tmp_path / "chzzk_point_ledger_archive.ndjson"
+    assert len(archive.read_text(encoding="utf-8").splitlines()) == 3
+
+    bot.change_points("u0", 5, "chat")
+    bot.point_ledger.commit()
+    bot = make_bot(tmp_path)
+    assert bot.point_ledger.last_seq == 4
+    assert bot.load_user_data()
+    assert bot.user_points["u0"] == 15
+
+
+def test_ledger_apply_handles_reset_and_delete():
+    points = {"u0": 10, "u1": 20}
+    m.PointLedger.apply(points, {"user": "u0", "delta": -3, "reason": "bet"})
+    m.PointLedger.apply(points, {"user": "u1", "reason": "delete_user"})
+    assert points == {"u0": 7}
+    m.PointLedger.apply(points, {"reason": "reset"})
+    assert points == {}
@@ -0,0 +1,40 @@
+import pytest
+
+from conftest import make_bot
+from test_persistence import restart_inventory
+
+
+def shop_bot(tmp_path, backend):
+    bot = make_bot(tmp_path, backend)
+    bot.shop_items = {"item_1": {"name": "물", "price": 30, "description": ""}}
+    bot.shop_index.rebuild(bot.shop_items)
+    bot.change_points("u0", 100, "chat")
+    bot.point_ledger.commit()
+    bot.store_user_snapshot()
+    return bot
+
+
+@pytest.mark.parametrize("backend", ["json", "sqlite", "binary"])
+def test_purchase_survives_crash_before_autosave(tmp_path, backend):
+    bot = shop_bot(tmp_path, backend)
+    bot.handle_item_purchase("u0", "유저", "물")
+    bot.handle_item_purchase("u0", "유저", "물")
+    # 자동 저장 전에 종료
+
+    bot = restart_inventory(tmp_path, backend)
+    assert bot.user_points["u0"] == 40
+    assert bot.user_inventory["u0"]["item_1"]["quantity"] == 2
+
+
+def test_failed_inventory_save_cancels_purchase(tmp_path):
+    bot = shop_bot(tmp_path, "json")
+
+    def fail(name, user_ids=None):
+        raise OSError("disk full")
+
+    bot.persistence.write_now = fail
+    bot.handle_item_purchase("u0", "유저", "물")
+
+    assert bot.user_points["u0"] == 100
+    assert bot.users.get("u0").inventory is None
+    assert "구매를 처리하지 못했습니다" in bot.chat[-1][0]
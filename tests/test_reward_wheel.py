@@ -0,0 +1,64 @@
+from conftest import bot_module as m
+
+
+def make_wheel(now=0):
+    wheel = m.RewardWheel(tick_seconds=60)
+    wheel.advance(now)
+    return wheel
+
+
+def test_advance_releases_users_tick_by_tick():
+    wheel = make_wheel()
+    wheel.schedule("u0", 60)
+    wheel.schedule("u1", 90)
+    wheel.schedule("u2", 150)
+
+    assert wheel.advance(59) == 0
+    assert wheel.advance(60) == 2
+    assert wheel.pending() == 1
+    assert wheel.advance(119) == 0
+    assert wheel.advance(120) == 1
+    assert wheel.pending() == 0
+    assert wheel.buckets == {}
+
+
+def test_advance_over_long_gap_only_visits_filled_ticks():
+    wheel = make_wheel()
+    wheel.schedule("u0", 60)
+    wheel.schedule("u1", 600)
+    wheel.schedule("u2", 60 * 100_000)
+
+    # 비어 있는 칸을 하나씩 돌지 않고 채워진 칸만 확인
+    assert wheel.advance(60 * 50_000) == 2
+    assert wheel.pending() == 1
+    assert list(wheel.buckets) == [100_000]
+    assert wheel.current_tick == 50_000
+
+    # 시간이 되돌아가도 다시 풀지 않음
+    assert wheel.advance(60) == 0
+    assert wheel.advance(60 * 100_000) == 1
+    assert wheel.pending() == 0
+
+
+def test_schedule_in_past_tick_is_ignored_and_reschedule_moves_user():
+    wheel = make_wheel(600)
+    wheel.schedule("u0", 300)
+    assert wheel.pending() == 0
+
+    wheel.schedule("u1", 720)
+    wheel.schedule("u1", 900)
+    assert wheel.user_ticks == {"u1": 15}
+    assert wheel.due_within(600, 240) == 0
+    assert wheel.due_within(600, 300) == 1
+
+    wheel.discard("u1")
+    assert wheel.pending() == 0 and wheel.buckets == {}
+
+
+def test_rebuild_skips_users_already_eligible():
+    wheel = m.RewardWheel(tick_seconds=60)
+    wheel.rebuild({"u0": 0, "u1": 500, "u2": 1000}, cooldown_seconds=600, now=1000)
+
+    assert wheel.user_ticks == {"u1": 18, "u2": 26}
+    assert wheel.advance(1080) == 1
+    assert wheel.pending() == 1
@@ -0,0 +1,124 @@
+import json
+import queue
+import threading
+
+import pytest
+
+from conftest import bot_module as m
+from conftest import make_bot
+
+
+def main_thread_log(bot):
+    """Tk처럼 UI 스레드가 아닌 곳에서 호출하면 오류를 내는 로그"""
+
+    def log(message):
+        if threading.current_thread() is not threading.main_thread():
+            raise RuntimeError("main thread is not in main loop")
+        bot.logs.append(message)
+
+    bot.log = log
+
+
+def test_startup_load_migrates_legacy_betting_history_without_ui_calls(
+    tmp_path, messagebox
+):
+    history = [
+        {
+            "topic": f"배팅 {idx}",
+            "options": ["레드", "블루"],
+            "start_time": "2024-01-01 12:00:00",
+            "end_time": "2024-01-01 12:05:00",
+            "winning_option": "레드",
+            "winning_option_idx": 0,
+            "total_points": 100,
+            "odds": 2.0,
+            "winners": [],
+            "user_bets": {},
+        }
+        for idx in range(3)
+    ]
+    with open(tmp_path / "chzzk_betting_history.json", "w", encoding="utf-8") as f:
+        json.dump(history, f, ensure_ascii=False)
+
+    bot = make_bot(tmp_path)
+    main_thread_log(bot)
+    bot.startup_timings = []
+    bot.startup_load()
+
+    assert len(bot.betting_history) == 3
+    assert [event["topic"] for event in bot.recent_betting_rounds] == [
+        "배팅 0",
+        "배팅 1",
+        "배팅 2",
+    ]
+    assert (tmp_path / "chzzk_betting_history.json.migrated").exists()
+    assert any("3개를 보관소로 옮겼습니다" in line for line in bot.logs)
+
+
+def test_interrupted_migration_restarts_from_scratch(tmp_path, messagebox, monkeypatch):
+    history = [
+        {"topic": f"배팅 {idx}", "end_time": "2024-01-01 12:05:00", "user_bets": {}}
+        for idx in range(3)
+    ]
+    with open(tmp_path / "chzzk_betting_history.json", "w", encoding="utf-8") as f:
+        json.dump(history, f, ensure_ascii=False)
+
+    # 두 번째 이력을 옮기던 중 종료되었다고 가정
+    append = m.BettingHistoryArchive.append
+    calls = []
+
+    def crash(self, entry):
+        calls.append(entry)
+        if len(calls) == 2:
+            raise RuntimeError("crash")
+        return append(self, entry)
+
+    monkeypatch.setattr(m.BettingHistoryArchive, "append", crash)
+    bot = make_bot(tmp_path)
+    with pytest.raises(RuntimeError):
+        bot.read_betting_history()
+    monkeypatch.setattr(m.BettingHistoryArchive, "append", append)
+    assert not (tmp_path / "betting_history" / "index.ndjson").exists()
+
+    bot = make_bot(tmp_path)
+    read = bot.read_betting_history()
+
+    assert read["migrated"] == 3
+    assert [summary["id"] for summary in read["summaries"]] == [1, 2, 3]
+    assert [event["topic"] for event in read["recent"]] == [
+        "배팅 0",
+        "배팅 1",
+        "배팅 2",
+    ]
+    assert not (tmp_path / "betting_history.migrating").exists()
+
+
+class FakeLogText:
+    def __init__(self):
+        self.inserts = []
+
+    def config(self, **options):
+        if threading.current_thread() is not threading.main_thread():
+            raise RuntimeError("main thread is not in main loop")
+
+    def insert(self, index, text):
+        self.inserts.append(text)
+
+    def see(self, index):
+        pass
+
+
+def test_log_from_worker_thread_waits_for_ui_thread(tmp_path):
+    bot = make_bot(tmp_path)
+    bot.log_queue = queue.SimpleQueue()
+    bot.log_text = FakeLogText()
+
+    worker = threading.Thread(target=m.ChzzkPointsBot.log, args=(bot, "작업 스레드"))
+    worker.start()
+    worker.join()
+    assert bot.log_text.inserts == []
+
+    m.ChzzkPointsBot.log(bot, "UI 스레드")
+    assert len(bot.log_text.inserts) == 1
+    lines = bot.log_text.inserts[0].splitlines()
+    assert [line.split("] ", 1)[1] for line in lines] == ["작업 스레드", "UI 스레드"]
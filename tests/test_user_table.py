@@ -0,0 +1,71 @@
+from array import array
+
+import pytest
+
+from conftest import bot_module as m
+
+
+def test_removed_rows_are_reused():
+    table = m.UserTable()
+    table.points_map["u0"] = 10
+    table.points_map["u1"] = 20
+    row = table.rows["u0"]
+
+    assert table.remove("u0")
+    assert not table.remove("u0")
+    assert "u0" not in table.points_map
+
+    user = table.ensure("u2")
+    assert user.row == row
+    assert user.points == 0
+    assert table.last_rewards[row] == m.UserTable.NO_TIME
+    assert dict(table.points_map.items()) == {"u1": 20, "u2": 0}
+
+
+def test_reset_points_keeps_only_users_with_inventory():
+    table = m.UserTable()
+    table.points_map["u0"] = 10
+    table.points_map["u1"] = 20
+    table.ensure("u1").inventory = {"item": {"quantity": 1, "purchase_date": None}}
+    table.last_reward_map["u1"] = 1_700_000_000
+
+    table.reset_points()
+
+    assert list(table.rows) == ["u1"]
+    assert table.points_map["u1"] == 0
+    assert "u1" not in table.last_reward_map
+    assert table.inventory_map["u1"] == {"item": {"quantity": 1, "purchase_date": None}}
+
+
+def test_adopt_replaces_columns_and_keeps_inventory():
+    table = m.UserTable()
+    table.points_map["u0"] = 10
+    table.ensure("u0").inventory = {"item": {"quantity": 2, "purchase_date": None}}
+
+    loaded = m.UserTable()
+    loaded.load_columns(["u1", "u0"], array("q", [5, 7]), array("q", [0, 0]))
+    table.adopt(loaded)
+
+    assert dict(table.points_map.items()) == {"u1": 5, "u0": 7}
+    assert table.get("u0").inventory["item"]["quantity"] == 2
+    assert table.get("u1").inventory is None
+
+
+def test_total_points_skips_removed_rows():
+    table = m.UserTable()
+    table.points_map["u0"] = 10
+    table.points_map["u1"] = 20
+    table.points_map["u2"] = -5
+    table.remove("u1")
+
+    assert len(table) == 2
+    assert table.total_points() == 5
+
+
+def test_column_view_requires_row_accessors():
+    class PartialView(m.UserColumnView):
+        def _get(self, row):
+            return None
+
+    with pytest.raises(TypeError):
+        PartialView(m.UserTable())